@@ -0,0 +1,101 @@
+"""add user scores
+
+Revision ID: a3f8c2d1e9b4
+Revises: f4b1c9d8e2a7
+Create Date: 2026-02-02
+
+Materialized per-user achievement / recommendation / caret totals used by
+the leaderboards, backfilled here with every user's real totals.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+
+# revision identifiers, used by Alembic.
+revision = "a3f8c2d1e9b4"
+down_revision = "f4b1c9d8e2a7"
+branch_labels = None
+depends_on = None
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def _backfill(user_scores: sa.Table) -> None:
+    # column queries only, so later model columns don't break this revision
+    from app.scoring.recommendation_score import points_for_recommendation
+    from app.services.scores import get_achievement_totals
+
+    db = Session(bind=op.get_bind())
+    users = sa.table("users", sa.column("id"))
+    posts = sa.table("posts", sa.column("id"), sa.column("user_id"))
+    post_carets = sa.table("post_carets", sa.column("id"), sa.column("post_id"))
+    recommendations = sa.table(
+        "recommendations",
+        sa.column("requester_id"),
+        sa.column("recommender_id"),
+        sa.column("rec_type"),
+        sa.column("status"),
+    )
+
+    user_ids = db.scalars(sa.select(users.c.id).order_by(users.c.id)).all()
+    chunks = [user_ids[i:i + BACKFILL_CHUNK_SIZE] for i in range(0, len(user_ids), BACKFILL_CHUNK_SIZE)]
+    achievement: dict[int, int] = {}
+    for chunk in chunks:
+        achievement.update(get_achievement_totals(db, chunk))
+
+    recommendation = dict.fromkeys(user_ids, 0)
+    approved = db.execute(
+        sa.select(recommendations.c.requester_id, recommendations.c.recommender_id, recommendations.c.rec_type)
+        .where(recommendations.c.status == "APPROVED")
+    )
+    for requester_id, recommender_id, rec_type in approved:
+        points = points_for_recommendation(rec_type, achievement.get(recommender_id, 0))["points"]
+        recommendation[requester_id] += points
+
+    carets = dict(
+        db.execute(
+            sa.select(posts.c.user_id, sa.func.count(post_carets.c.id))
+            .join(post_carets, post_carets.c.post_id == posts.c.id)
+            .group_by(posts.c.user_id)
+        ).all()
+    )
+
+    for chunk in chunks:
+        op.bulk_insert(
+            user_scores,
+            [
+                {
+                    "user_id": user_id,
+                    "achievement_total": achievement[user_id],
+                    "recommendation_total": recommendation[user_id],
+                    "caret_total": carets.get(user_id, 0),
+                }
+                for user_id in chunk
+            ],
+        )
+
+
+def upgrade() -> None:
+    user_scores = op.create_table(
+        "user_scores",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("achievement_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("recommendation_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("caret_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_computed_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_user_scores_achievement_total", "user_scores", ["achievement_total"])
+    op.create_index("ix_user_scores_recommendation_total", "user_scores", ["recommendation_total"])
+    op.create_index("ix_user_scores_caret_total", "user_scores", ["caret_total"])
+
+    _backfill(user_scores)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_scores_caret_total", table_name="user_scores")
+    op.drop_index("ix_user_scores_recommendation_total", table_name="user_scores")
+    op.drop_index("ix_user_scores_achievement_total", table_name="user_scores")
+    op.drop_table("user_scores")
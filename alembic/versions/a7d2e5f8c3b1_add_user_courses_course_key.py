@@ -0,0 +1,59 @@
+"""add user_courses.course_key
+
+Revision ID: a7d2e5f8c3b1
+Revises: f1c4d7e9a2b8
+Create Date: 2026-02-19
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a7d2e5f8c3b1"
+down_revision = "f1c4d7e9a2b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+
+    op.add_column("user_courses", sa.Column("course_key", sa.String(length=50), nullable=True))
+    # same normalization as app.services.course_key.normalize_course_number
+    if is_postgres:
+        op.execute("UPDATE user_courses SET course_key = upper(regexp_replace(course_number, '\\s+', '', 'g'))")
+    else:
+        op.execute("UPDATE user_courses SET course_key = upper(replace(course_number, ' ', ''))")
+    op.alter_column("user_courses", "course_key", existing_type=sa.String(length=50), nullable=False)
+
+    op.create_index(
+        "ix_user_courses_key_created_at_id",
+        "user_courses",
+        ["course_key", "created_at", "id"],
+    )
+    if is_postgres:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_user_courses_course_key_trgm",
+            "user_courses",
+            ["course_key"],
+            postgresql_using="gin",
+            postgresql_ops={"course_key": "gin_trgm_ops"},
+        )
+        op.create_index(
+            "ix_user_courses_course_name_trgm",
+            "user_courses",
+            ["course_name"],
+            postgresql_using="gin",
+            postgresql_ops={"course_name": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_user_courses_course_name_trgm", table_name="user_courses")
+        op.drop_index("ix_user_courses_course_key_trgm", table_name="user_courses")
+    op.drop_index("ix_user_courses_key_created_at_id", table_name="user_courses")
+    op.drop_column("user_courses", "course_key")
@@ -0,0 +1,42 @@
+"""add score histograms
+
+Revision ID: b6e2d4f7a1c3
+Revises: a3f8c2d1e9b4
+Create Date: 2026-02-04
+
+Per-metric count of users at each score, used to answer leaderboard
+percent ranks without sorting user_scores.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b6e2d4f7a1c3"
+down_revision = "a3f8c2d1e9b4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "score_histograms",
+        sa.Column("metric", sa.String(length=32), primary_key=True),
+        sa.Column("score", sa.Integer(), primary_key=True),
+        sa.Column("user_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    op.execute(
+        "INSERT INTO score_histograms (metric, score, user_count) "
+        "SELECT 'achievement', achievement_total, count(*) FROM user_scores GROUP BY achievement_total"
+    )
+    op.execute(
+        "INSERT INTO score_histograms (metric, score, user_count) "
+        "SELECT 'recommendation', recommendation_total, count(*) FROM user_scores GROUP BY recommendation_total"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("score_histograms")
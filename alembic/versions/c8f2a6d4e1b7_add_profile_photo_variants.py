@@ -0,0 +1,25 @@
+"""add user_profiles.profile_photo_variants
+
+Revision ID: c8f2a6d4e1b7
+Revises: b3e9d1f7c4a2
+Create Date: 2026-02-23
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c8f2a6d4e1b7"
+down_revision = "b3e9d1f7c4a2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("user_profiles", sa.Column("profile_photo_variants", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("user_profiles", "profile_photo_variants")
@@ -0,0 +1,28 @@
+"""add recommendations recommender/status index
+
+Revision ID: c9d3a5e8f2b6
+Revises: b6e2d4f7a1c3
+Create Date: 2026-02-05
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c9d3a5e8f2b6"
+down_revision = "b6e2d4f7a1c3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_recommendations_recommender_status",
+        "recommendations",
+        ["recommender_id", "status"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recommendations_recommender_status", table_name="recommendations")
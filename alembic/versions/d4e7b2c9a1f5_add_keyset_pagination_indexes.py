@@ -0,0 +1,38 @@
+"""add keyset pagination indexes
+
+Revision ID: d4e7b2c9a1f5
+Revises: c9d3a5e8f2b6
+Create Date: 2026-02-09
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d4e7b2c9a1f5"
+down_revision = "c9d3a5e8f2b6"
+branch_labels = None
+depends_on = None
+
+
+# caret notifications filter on the post's owner, so they are driven from
+# ix_posts_user_created_at_id and ix_post_carets_post_id; a post_carets
+# (created_at, id) index can't apply the filter and is deliberately absent
+INDEXES = [
+    ("ix_posts_created_at_id", "posts", ["created_at", "id"]),
+    ("ix_posts_user_created_at_id", "posts", ["user_id", "created_at", "id"]),
+    ("ix_reflections_created_at_id", "reflections", ["created_at", "id"]),
+    ("ix_inbox_items_user_created_at_id", "inbox_items", ["user_id", "created_at", "id"]),
+    ("ix_recommendations_status_created_at_id", "recommendations", ["status", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,54 @@
+"""add composite indexes for hot filters
+
+Revision ID: e2f6a9c4b8d3
+Revises: c8f2a6d4e1b7
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e2f6a9c4b8d3"
+down_revision = "c8f2a6d4e1b7"
+branch_labels = None
+depends_on = None
+
+
+# inbox_items(user_id, created_at) and post_carets(post_id, user_id) are
+# already served by ix_inbox_items_user_created_at_id and uq_post_caret
+INDEXES = [
+    ("ix_recommendations_requester_status", "recommendations", ["requester_id", "status"]),
+    (
+        "ix_recommendations_recommender_status_created_at",
+        "recommendations",
+        ["recommender_id", "status", "created_at"],
+    ),
+    ("ix_verification_requests_status_created_at", "verification_requests", ["status", "created_at"]),
+    ("ix_education_entries_user_status", "education_entries", ["user_id", "verification_status"]),
+    ("ix_work_experiences_user_status", "work_experiences", ["user_id", "verification_status"]),
+    ("ix_contact_requests_requester_created_at", "contact_requests", ["requester_id", "created_at"]),
+]
+
+# indexes that are now a prefix of one of the above
+SUPERSEDED = [
+    ("ix_recommendations_recommender_status", "recommendations", ["recommender_id", "status"]),
+    # created by metadata.create_all (index=True), hence if_exists
+    ("ix_education_entries_user_id", "education_entries", ["user_id"]),
+    ("ix_work_experiences_user_id", "work_experiences", ["user_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _columns in SUPERSEDED:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, columns in SUPERSEDED:
+        op.create_index(name, table, columns, if_not_exists=True)
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,36 @@
+"""add posts.caret_count
+
+Revision ID: e8a1f3c6b2d9
+Revises: d4e7b2c9a1f5
+Create Date: 2026-02-12
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e8a1f3c6b2d9"
+down_revision = "d4e7b2c9a1f5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "posts",
+        sa.Column("caret_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "UPDATE posts SET caret_count = "
+        "(SELECT count(*) FROM post_carets WHERE post_carets.post_id = posts.id)"
+    )
+    op.execute(
+        "UPDATE user_scores SET caret_total = "
+        "(SELECT coalesce(sum(posts.caret_count), 0) FROM posts WHERE posts.user_id = user_scores.user_id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "caret_count")
@@ -0,0 +1,56 @@
+"""add user search indexes
+
+Revision ID: f1c4d7e9a2b8
+Revises: e8a1f3c6b2d9
+Create Date: 2026-02-16
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f1c4d7e9a2b8"
+down_revision = "e8a1f3c6b2d9"
+branch_labels = None
+depends_on = None
+
+
+TRIGRAM_INDEXES = [
+    ("ix_users_full_name_trgm", "users", "full_name"),
+    ("ix_users_username_trgm", "users", "username"),
+    ("ix_user_profiles_headline_trgm", "user_profiles", "headline"),
+    ("ix_user_profiles_location_trgm", "user_profiles", "location"),
+]
+
+
+def upgrade() -> None:
+    # pg_trgm is Postgres-only; other backends search in memory (app.services.user_search)
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+    # '^name' lookups: username LIKE 'name%'
+    op.create_index(
+        "ix_users_username_prefix",
+        "users",
+        ["username"],
+        postgresql_ops={"username": "varchar_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_users_username_prefix", table_name="users")
+    for name, table, _column in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table)
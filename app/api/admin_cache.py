@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+
+from app.api.admin_deps import admin_required
+from app.core.jwt import token_cache_stats
+from app.core.shared_cache import shared_cache
+from app.services.principals import principal_cache_stats
+
+router = APIRouter(prefix="/admin/cache", tags=["Admin Cache"])
+
+
+@router.get("/stats")
+def cache_stats(_admin=Depends(admin_required)):
+    return {
+        **shared_cache.stats(),
+        "tokens": token_cache_stats(),
+        "principals": principal_cache_stats(),
+    }
@@ -6,10 +6,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.api.feed import FEED_TAG
+from app.core.shared_cache import invalidate_tags_on_commit
 from app.db.deps import get_db
 from app.db.verification_request import VerificationRequest
 from app.db.education import EducationEntry
 from app.db.work_experience import WorkExperience
+from app.services.job_handlers import enqueue_achievement_refresh
 
 from app.api.admin_auth import get_current_admin
 from app.api.admin_deps import admin_required
@@ -112,6 +115,9 @@ def approve_verification(
         if admin_email:
             req.admin_notes = f"[admin:{admin_email}] " + (req.admin_notes or "")
 
+    enqueue_achievement_refresh(db, req.owner_user_id, f"verification:{req.id}:{APPROVED}")
+    invalidate_tags_on_commit(db, FEED_TAG)
+
     db.commit()
     db.refresh(req)
     return req
@@ -148,6 +154,8 @@ def reject_verification(
         if admin_email:
             req.admin_notes = f"[admin:{admin_email}] " + (req.admin_notes or "")
 
+    enqueue_achievement_refresh(db, req.owner_user_id, f"verification:{req.id}:{REJECTED}")
+
     db.commit()
     db.refresh(req)
     return req
@@ -14,7 +14,9 @@ from app.core.jwt import create_access_token
 from app.core.approval import is_auto_approved_email
 from app.db.deps import get_db
 from app.db.models import User
+from app.services.principals import principal_claims
 from app.services.username import normalize_username
+from app.services.user_scores import ensure_user_score
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -47,7 +49,7 @@ def login(
     if not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    access_token = create_access_token(subject=str(user.id))
+    access_token = create_access_token(subject=str(user.id), claims=principal_claims(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -132,9 +134,11 @@ def google_auth(payload: GoogleAuthCode, db: Session = Depends(get_db)):
             user.status = "APPROVED"
             user.approved_at = datetime.utcnow()
         db.add(user)
+        db.flush()
+        ensure_user_score(db, user.id)
 
     db.commit()
     db.refresh(user)
 
-    recach_token = create_access_token(subject=str(user.id))
+    recach_token = create_access_token(subject=str(user.id), claims=principal_claims(user))
     return {"access_token": recach_token, "token_type": "bearer"}
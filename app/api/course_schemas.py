@@ -51,6 +51,10 @@ class CoursePersonOut(BaseModel):
 
 
 class CourseSearchGroup(BaseModel):
+    course_key: str
     course_number: str
     course_name: str
+    people_count: int
     people: List[CoursePersonOut]
+    # pass to /api/courses/groups/{course_key}/people for the rest of the group
+    next_cursor: Optional[str] = None
@@ -1,7 +1,8 @@
+import uuid
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
 from app.api.course_schemas import (
@@ -12,16 +13,22 @@ from app.api.course_schemas import (
     PROGRAM_LEVELS,
     VISIBILITY_LEVELS,
 )
-from app.api.deps_auth import get_current_user, get_optional_user
-from app.db.deps import get_db
+from app.api.deps_auth import get_current_user, get_optional_principal
+from app.db.deps import get_db, get_read_db
 from app.db.models import User
 from app.db.user_course import UserCourse
 from app.db.contact_request import ContactRequest
 from app.db.user_profile import UserProfile
 from app.db.education import EducationEntry
+from app.services.course_key import normalize_course_number
+from app.services.like_pattern import LIKE_ESCAPE, like_escape
+from app.services.pagination import before, decode_cursor, encode_cursor, take_page
+from app.services.principals import Principal
 
 router = APIRouter(prefix="/api/courses", tags=["Courses"])
 
+PEOPLE_PER_GROUP = 10
+
 
 def _validate_course_input(payload: CourseCreate):
     if payload.program_level not in PROGRAM_LEVELS:
@@ -52,6 +59,7 @@ def create_course(
         user_id=current_user.id,
         course_name=payload.course_name.strip(),
         course_number=payload.course_number.strip(),
+        course_key=normalize_course_number(payload.course_number),
         professor=payload.professor.strip() if payload.professor else None,
         grade=payload.grade.strip(),
         program_level=payload.program_level,
@@ -93,25 +101,17 @@ def delete_course(
     return {"status": "deleted"}
 
 
-@router.get("/search", response_model=list[CourseSearchGroup])
-def search_courses(
-    q: str = Query(..., min_length=1),
-    db: Session = Depends(get_db),
-    current_user: User | None = Depends(get_optional_user),
-):
-    query = (
-        db.query(UserCourse, User)
-        .join(User, User.id == UserCourse.user_id)
-        .filter(
-            or_(
-                UserCourse.course_name.ilike(f"%{q}%"),
-                UserCourse.course_number.ilike(f"%{q}%"),
-            )
-        )
-    )
+def _visible_to(current_user: Principal | None):
+    # Treat CIRCLE as PRIVATE until circle feature exists.
+    if current_user:
+        return or_(UserCourse.visibility == "PUBLIC", UserCourse.user_id == current_user.id)
+    return UserCourse.visibility == "PUBLIC"
 
-    courses = query.all()
-    user_ids = {course.user_id for (course, _) in courses}
+
+def _people_out(
+    db: Session, rows: list[tuple[UserCourse, User]], current_user: Principal | None
+) -> list[CoursePersonOut]:
+    user_ids = {course.user_id for (course, _) in rows}
     profiles = (
         db.query(UserProfile).filter(UserProfile.user_id.in_(user_ids)).all()
         if user_ids
@@ -133,21 +133,10 @@ def search_courses(
         if user_id not in edu_map:
             edu_map[user_id] = university_name
 
-    visible = []
-    for course, user in courses:
-        if course.visibility == "PUBLIC":
-            visible.append((course, user))
-        elif current_user and course.user_id == current_user.id:
-            visible.append((course, user))
-        else:
-            # Treat CIRCLE as PRIVATE until circle feature exists.
-            continue
-
     request_map = {}
-    if current_user and visible:
-        pairs = {(c.user_id, c.id) for (c, _) in visible}
-        targets = {pair[0] for pair in pairs}
-        course_ids = {pair[1] for pair in pairs}
+    if current_user and rows:
+        targets = {c.user_id for (c, _) in rows}
+        course_ids = {c.id for (c, _) in rows}
         existing = (
             db.query(ContactRequest)
             .filter(
@@ -160,8 +149,8 @@ def search_courses(
         for req in existing:
             request_map[(req.target_id, req.course_id)] = req
 
-    grouped: dict[tuple[str, str], list[CoursePersonOut]] = {}
-    for course, user in visible:
+    people = []
+    for course, user in rows:
         request = request_map.get((user.id, course.id))
         profile = profile_map.get(user.id)
         university = None
@@ -177,8 +166,7 @@ def search_courses(
             and course.visibility == "PUBLIC"
             and (request is None or request.status == "IGNORED")
         )
-        key = (course.course_number, course.course_name)
-        grouped.setdefault(key, []).append(
+        people.append(
             CoursePersonOut(
                 user_id=user.id,
                 name=user.full_name,
@@ -194,14 +182,131 @@ def search_courses(
                 request_id=request.id if request else None,
             )
         )
+    return people
 
-    response = []
-    for (course_number, course_name), people in grouped.items():
-        response.append(
-            CourseSearchGroup(
-                course_number=course_number,
-                course_name=course_name,
-                people=people,
-            )
+
+def _person_cursor(course: UserCourse) -> str:
+    return encode_cursor(course.created_at, course.id)
+
+
+@router.get("/search", response_model=list[CourseSearchGroup])
+def search_courses(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+    current_user: Principal | None = Depends(get_optional_principal),
+):
+    """
+    Courses matching `q` grouped by catalog key, most-taken first. Each group
+    carries its first PEOPLE_PER_GROUP people and a cursor for the rest.
+    """
+    visible = _visible_to(current_user)
+    key_like = f"%{like_escape(normalize_course_number(q))}%"
+    name_like = f"%{like_escape(q.strip())}%"
+    matched_keys = (
+        select(UserCourse.course_key)
+        .where(
+            visible,
+            or_(
+                UserCourse.course_key.like(key_like, escape=LIKE_ESCAPE),
+                UserCourse.course_name.ilike(name_like, escape=LIKE_ESCAPE),
+            ),
+        )
+        .distinct()
+    )
+
+    people_count = func.count(UserCourse.id)
+    groups = (
+        db.query(
+            UserCourse.course_key,
+            func.min(UserCourse.course_number),
+            func.min(UserCourse.course_name),
+            people_count,
         )
-    return response
+        .filter(visible, UserCourse.course_key.in_(matched_keys))
+        .group_by(UserCourse.course_key)
+        .order_by(people_count.desc(), UserCourse.course_key.asc())
+        .limit(limit)
+        .all()
+    )
+    if not groups:
+        return []
+
+    # top PEOPLE_PER_GROUP (+1 to know whether a next page exists) per group
+    position = (
+        func.row_number()
+        .over(
+            partition_by=UserCourse.course_key,
+            order_by=(UserCourse.created_at.desc(), UserCourse.id.desc()),
+        )
+        .label("position")
+    )
+    ranked = (
+        select(UserCourse.id, position)
+        .where(visible, UserCourse.course_key.in_([key for key, *_ in groups]))
+        .subquery()
+    )
+    rows = (
+        db.query(UserCourse, User)
+        .join(ranked, ranked.c.id == UserCourse.id)
+        .join(User, User.id == UserCourse.user_id)
+        .filter(ranked.c.position <= PEOPLE_PER_GROUP + 1)
+        .order_by(ranked.c.position.asc())
+        .all()
+    )
+
+    members: dict[str, list[tuple[UserCourse, User]]] = {key: [] for key, *_ in groups}
+    for course, user in rows:
+        members[course.course_key].append((course, user))
+
+    next_cursors = {}
+    for course_key, group in members.items():
+        if len(group) > PEOPLE_PER_GROUP:
+            members[course_key] = group[:PEOPLE_PER_GROUP]
+            next_cursors[course_key] = _person_cursor(group[PEOPLE_PER_GROUP - 1][0])
+
+    # enrich every group's people in one pass
+    page_rows = [row for group in members.values() for row in group]
+    people = dict(zip((course.id for course, _ in page_rows), _people_out(db, page_rows, current_user)))
+
+    return [
+        CourseSearchGroup(
+            course_key=course_key,
+            course_number=course_number,
+            course_name=course_name,
+            people_count=count,
+            people=[people[course.id] for course, _ in members[course_key]],
+            next_cursor=next_cursors.get(course_key),
+        )
+        for course_key, course_number, course_name, count in groups
+    ]
+
+
+@router.get("/groups/{course_key}/people", response_model=list[CoursePersonOut])
+def list_course_group_people(
+    course_key: str,
+    response: Response,
+    limit: int = Query(PEOPLE_PER_GROUP, ge=1, le=100),
+    cursor: str | None = Query(None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal | None = Depends(get_optional_principal),
+):
+    query = (
+        db.query(UserCourse, User)
+        .join(User, User.id == UserCourse.user_id)
+        .filter(
+            UserCourse.course_key == normalize_course_number(course_key),
+            _visible_to(current_user),
+        )
+    )
+    if cursor:
+        created_at, course_id = decode_cursor(cursor, uuid.UUID)
+        query = query.filter(before((UserCourse.created_at, UserCourse.id), (created_at, course_id)))
+    rows = (
+        query
+        .order_by(UserCourse.created_at.desc(), UserCourse.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    rows = take_page(rows, limit, response, lambda row: _person_cursor(row[0]))
+    return _people_out(db, rows, current_user)
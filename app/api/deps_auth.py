@@ -1,12 +1,31 @@
 from fastapi import Depends, HTTPException, status
 from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.security import oauth2_scheme
 from fastapi.security import OAuth2PasswordBearer
-from app.core.jwt import decode_access_token
-from app.db.deps import get_db
+from app.core.jwt import verify_access_token
+from app.db.deps import get_async_db, get_db
 from app.db.models import User
+from app.services.principals import Principal, resolve_principal, resolve_principal_async
+
+
+def _claims_from_token(token: str) -> tuple[int, dict]:
+    """(user_id, claims). Raises JWTError / TypeError / ValueError for unusable tokens."""
+    payload = verify_access_token(token)
+    sub = payload.get("sub")
+    if sub is None:
+        raise ValueError("Missing sub")
+    return int(sub), payload
+
+
+def _user_id_from_token(token: str) -> int:
+    return _claims_from_token(token)[0]
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
 
 
 def get_current_user(
@@ -14,11 +33,7 @@ def get_current_user(
     db: Session = Depends(get_db),
 ) -> User:
     try:
-        payload = decode_access_token(token)
-        sub = payload.get("sub")
-        if sub is None:
-            raise ValueError("Missing sub")
-        user_id = int(sub)
+        user_id = _user_id_from_token(token)
     except (JWTError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,12 +60,111 @@ def get_optional_user(
     if not token:
         return None
     try:
-        payload = decode_access_token(token)
-        sub = payload.get("sub")
-        if sub is None:
-            return None
-        user_id = int(sub)
+        user_id = _user_id_from_token(token)
     except (JWTError, TypeError, ValueError):
         return None
 
     return db.query(User).filter(User.id == user_id).first()
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    try:
+        user_id = _user_id_from_token(token)
+    except (JWTError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+
+    return user
+
+
+async def get_optional_user_async(
+    token: str | None = Depends(oauth2_scheme_optional),
+    db: AsyncSession = Depends(get_async_db),
+) -> User | None:
+    if not token:
+        return None
+    try:
+        user_id = _user_id_from_token(token)
+    except (JWTError, TypeError, ValueError):
+        return None
+
+    return await db.get(User, user_id)
+
+
+# Principal dependencies: for endpoints that only need who the caller is.
+# They skip the users query when the token carries the claims or the
+# principal is cached; see app.services.principals.
+
+
+def _load_principal(token: str, db: Session) -> Principal:
+    try:
+        user_id, claims = _claims_from_token(token)
+    except (JWTError, TypeError, ValueError):
+        raise _unauthorized("Invalid or expired token")
+
+    principal = resolve_principal(db, user_id, claims)
+    if principal is None:
+        raise _unauthorized("User not found")
+    return principal
+
+
+async def _load_principal_async(token: str, db: AsyncSession) -> Principal:
+    try:
+        user_id, claims = _claims_from_token(token)
+    except (JWTError, TypeError, ValueError):
+        raise _unauthorized("Invalid or expired token")
+
+    principal = await resolve_principal_async(db, user_id, claims)
+    if principal is None:
+        raise _unauthorized("User not found")
+    return principal
+
+
+def get_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    return _load_principal(token, db)
+
+
+def get_optional_principal(
+    token: str | None = Depends(oauth2_scheme_optional),
+    db: Session = Depends(get_db),
+) -> Principal | None:
+    if not token:
+        return None
+    try:
+        return _load_principal(token, db)
+    except HTTPException:
+        return None
+
+
+async def get_principal_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    return await _load_principal_async(token, db)
+
+
+async def get_optional_principal_async(
+    token: str | None = Depends(oauth2_scheme_optional),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal | None:
+    if not token:
+        return None
+    try:
+        return await _load_principal_async(token, db)
+    except HTTPException:
+        return None
@@ -1,92 +1,134 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+import os
 
-from app.db.deps import get_db
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, literal, null, select, union_all
+
+from app.core.shared_cache import shared_cache
+from app.db.deps import get_async_read_db
 from app.db.verification_request import VerificationRequest
 from app.db.recommendations import Recommendation
 from app.db.models import User  # <-- change this import to the actual file where User is defined
+from app.services.pagination import NEXT_CURSOR_HEADER, before, decode_cursor, encode_cursor, split_page
 
 router = APIRouter(prefix="/feed", tags=["Feed"])
 
+FEED_CACHE_TTL = float(os.getenv("FEED_CACHE_TTL", "15"))
+# invalidated when a verification or recommendation is approved
+FEED_TAG = "feed"
 
-@router.get("")
-def get_feed(
-    limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
-):
-    # Verifications (approved)
+
+def _feed_events(limit: int, cursor: list | None = None):
+    """
+    Approved verifications and recommendations as one event stream, newest
+    first, so the database does the merge and the cut. Pages are keyed on
+    (timestamp, type, id).
+    """
     verifications = (
-        db.query(VerificationRequest)
-        .filter(VerificationRequest.status == "APPROVED")
-        .order_by(desc(VerificationRequest.decided_at), desc(VerificationRequest.created_at))
-        .limit(limit)
-        .all()
+        select(
+            literal("verification").label("type"),
+            VerificationRequest.id.label("id"),
+            func.coalesce(VerificationRequest.decided_at, VerificationRequest.created_at).label("ts"),
+            VerificationRequest.owner_user_id.label("user_id"),
+            null().label("actor_id"),
+            VerificationRequest.subject_type.label("kind"),
+            VerificationRequest.subject_id.label("subject_id"),
+            VerificationRequest.status.label("status"),
+        )
+        .where(VerificationRequest.status == "APPROVED")
     )
-
-    # Recommendations (approved)
-    recs = (
-        db.query(Recommendation)
-        .filter(Recommendation.status == "APPROVED")
-        .order_by(desc(getattr(Recommendation, "created_at", Recommendation.recommender_id)))
-        .limit(limit)
-        .all()
+    recommendations = (
+        select(
+            literal("recommendation").label("type"),
+            Recommendation.id.label("id"),
+            Recommendation.created_at.label("ts"),
+            Recommendation.requester_id.label("user_id"),
+            Recommendation.recommender_id.label("actor_id"),
+            Recommendation.rec_type.label("kind"),
+            null().label("subject_id"),
+            Recommendation.status.label("status"),
+        )
+        .where(Recommendation.status == "APPROVED")
     )
+    events = union_all(verifications, recommendations).subquery("events")
+    query = select(events)
+    if cursor:
+        query = query.where(before((events.c.ts, events.c.type, events.c.id), cursor))
+    return query.order_by(desc(events.c.ts), desc(events.c.type), desc(events.c.id)).limit(limit)
 
-    items = []
-
-    # Verification events
-    for vr in verifications:
-        user = db.query(User).filter(User.id == vr.owner_user_id).first()
-        ts = vr.decided_at or vr.created_at
 
-        items.append(
-            {
-                "type": "verification",
-                "timestamp": ts,
-                "user": {
-                    "id": vr.owner_user_id,
-                    "full_name": user.full_name if user else None,
-                },
-                "payload": {
-                    "verification_request_id": vr.id,
-                    "subject_type": vr.subject_type,   # "education" | "work"
-                    "subject_id": vr.subject_id,
-                    "status": vr.status,               # "APPROVED"
-                },
-                "message": f"{(user.full_name if user else 'A user')}'s {vr.subject_type} was VERIFIED",
-            }
-        )
+@router.get("")
+async def get_feed(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    after = decode_cursor(cursor, str, int) if cursor else None
+    page = await shared_cache.get_or_compute(
+        f"feed:{limit}:{cursor or ''}",
+        lambda: _build_feed(db, limit, after),
+        ttl=FEED_CACHE_TTL,
+        tags=[FEED_TAG],
+    )
+    if page["next_cursor"]:
+        response.headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+    return page["items"]
 
-    # Recommendation events
-    for r in recs:
-        receiver = db.query(User).filter(User.id == r.requester_id).first()
-        recommender = db.query(User).filter(User.id == r.recommender_id).first()
 
-        ts = getattr(r, "created_at", None)  # if your model doesn't have it, this becomes None
+async def _build_feed(db: AsyncSession, limit: int, after: list | None) -> dict:
+    events = (await db.execute(_feed_events(limit + 1, after))).all()
+    events, next_cursor = split_page(events, limit, lambda e: encode_cursor(e.ts, e.type, e.id))
 
-        items.append(
-            {
-                "type": "recommendation",
-                "timestamp": ts,
-                "user": {
-                    "id": r.requester_id,
-                    "full_name": receiver.full_name if receiver else None,
-                },
-                "payload": {
-                    "receiver_id": r.requester_id,
-                    "recommender_id": r.recommender_id,
-                    "rec_type": getattr(r, "rec_type", None),
-                    "status": r.status,  # "APPROVED"
-                },
-                "message": f"{(recommender.full_name if recommender else 'Someone')} recommended {(receiver.full_name if receiver else 'a user')}",
-            }
-        )
+    # every user the page mentions, resolved in one query
+    user_ids = {e.user_id for e in events} | {e.actor_id for e in events if e.actor_id is not None}
+    users = (
+        (await db.execute(select(User).where(User.id.in_(user_ids)))).scalars().all()
+        if user_ids else []
+    )
+    user_map = {user.id: user for user in users}
 
-    # sort newest first (None timestamps go last)
-    def sort_key(x):
-        ts = x["timestamp"]
-        return (ts is not None, ts)
+    items = []
+    for e in events:
+        if e.type == "verification":
+            user = user_map.get(e.user_id)
+            items.append(
+                {
+                    "type": "verification",
+                    "timestamp": e.ts,
+                    "user": {
+                        "id": e.user_id,
+                        "full_name": user.full_name if user else None,
+                    },
+                    "payload": {
+                        "verification_request_id": e.id,
+                        "subject_type": e.kind,   # "education" | "work"
+                        "subject_id": e.subject_id,
+                        "status": e.status,       # "APPROVED"
+                    },
+                    "message": f"{(user.full_name if user else 'A user')}'s {e.kind} was VERIFIED",
+                }
+            )
+        else:
+            receiver = user_map.get(e.user_id)
+            recommender = user_map.get(e.actor_id)
+            items.append(
+                {
+                    "type": "recommendation",
+                    "timestamp": e.ts,
+                    "user": {
+                        "id": e.user_id,
+                        "full_name": receiver.full_name if receiver else None,
+                    },
+                    "payload": {
+                        "receiver_id": e.user_id,
+                        "recommender_id": e.actor_id,
+                        "rec_type": e.kind,
+                        "status": e.status,  # "APPROVED"
+                    },
+                    "message": f"{(recommender.full_name if recommender else 'Someone')} recommended {(receiver.full_name if receiver else 'a user')}",
+                }
+            )
 
-    items.sort(key=sort_key, reverse=True)
-    return items[:limit]
+    return {"items": jsonable_encoder(items), "next_cursor": next_cursor}
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends
+import uuid
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps_auth import get_current_user
+from app.api.deps_auth import get_principal, get_principal_async
 from app.api.inbox_schemas import InboxItemOut
 from app.api.post_reply_schemas import InboxPostCardOut, InboxPostReplyOut
-from app.db.deps import get_db
+from app.db.deps import get_async_db, get_db
 from app.db.inbox_item import InboxItem
 from app.db.models import User
 from app.db.post import Post
@@ -12,36 +16,54 @@ from app.db.post_reply import PostReply
 from app.db.post_reply_caret import PostReplyCaret
 from app.db.post_reply_owner_reaction import PostReplyOwnerReaction
 from app.db.user_profile import UserProfile
+from app.services.pagination import before, decode_cursor, encode_cursor, take_page
+from app.services.photos import avatar_url
+from app.services.principals import Principal
 
 router = APIRouter(prefix="/api/inbox", tags=["Inbox"])
 posts_router = APIRouter(prefix="/inbox", tags=["Inbox"])
 
 
 @router.get("", response_model=list[InboxItemOut])
-def list_inbox(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_inbox(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_principal_async),
 ):
+    query = select(InboxItem).where(InboxItem.user_id == current_user.id)
+    if cursor:
+        created_at, item_id = decode_cursor(cursor, uuid.UUID)
+        query = query.where(before((InboxItem.created_at, InboxItem.id), (created_at, item_id)))
     items = (
-        db.query(InboxItem)
-        .filter(InboxItem.user_id == current_user.id)
-        .order_by(InboxItem.created_at.desc())
-        .all()
-    )
-    return items
+        await db.execute(
+            query
+            .order_by(InboxItem.created_at.desc(), InboxItem.id.desc())
+            .limit(limit + 1)
+        )
+    ).scalars().all()
+    return take_page(items, limit, response, lambda item: encode_cursor(item.created_at, item.id))
 
 
 @posts_router.get("/posts", response_model=list[InboxPostCardOut])
 def list_inbox_posts(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_principal),
 ):
+    query = db.query(Post).filter(Post.user_id == current_user.id)
+    if cursor:
+        query = query.filter(before((Post.created_at, Post.id), decode_cursor(cursor, int)))
     posts = (
-        db.query(Post)
-        .filter(Post.user_id == current_user.id)
-        .order_by(Post.created_at.desc())
+        query
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(limit + 1)
         .all()
     )
+    posts = take_page(posts, limit, response, lambda p: encode_cursor(p.created_at, p.id))
     post_ids = [post.id for post in posts]
     replies_map: dict[int, list[InboxPostReplyOut]] = {post.id: [] for post in posts}
 
@@ -67,9 +89,7 @@ def list_inbox_posts(
                         "id": sender.id,
                         "username": sender.username,
                         "full_name": sender.full_name,
-                        "profile_photo_url": sender_profile.profile_photo_url
-                        if sender_profile
-                        else None,
+                        "profile_photo_url": avatar_url(sender_profile),
                     },
                     caret_given=bool(caret.is_given) if caret else False,
                     owner_reaction=reaction.reaction if reaction else None,
@@ -1,128 +1,114 @@
+import os
+
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.deps import get_db
+from app.api.deps_auth import get_principal_async
+from app.core.shared_cache import shared_cache
+from app.db.deps import get_async_read_db
 from app.db.models import User
-from app.services.scores import get_achievement_total, get_recommendation_total
+from app.db.user_score import UserScore
+from app.services.principals import Principal
+from app.services.score_ranks import top_combined, user_rank
+from app.services.user_scores import compute_user_score
 
 router = APIRouter(prefix="/leaderboard", tags=["Leaderboards"])
 
-def _percent_rank(values: list[int]) -> dict[int, float]:
-    if not values:
-        return {}
-
-    n = len(values)
-    if n == 1:
-        return {values[0]: 1.0}
+# boards change with every score update, so they expire rather than being invalidated
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "30"))
 
-    sorted_vals = sorted(values, reverse=True)
-    score_to_rank: dict[int, int] = {}
-    for idx, score in enumerate(sorted_vals, start=1):
-        if score not in score_to_rank:
-            score_to_rank[score] = idx
 
-    score_to_percent: dict[int, float] = {}
-    for score, rank in score_to_rank.items():
-        score_to_percent[score] = (n - rank) / (n - 1)
-
-    return score_to_percent
+def _user_out(user: User) -> dict:
+    return {"id": user.id, "full_name": user.full_name, "username": user.username}
 
 
 @router.get("/combined")
-def combined_leaderboard(
+async def combined_leaderboard(
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    users = db.query(User).all()
-
-    rows = []
-    achievement_scores: list[int] = []
-    recommendation_scores: list[int] = []
-
-    for u in users:
-        achievement_score = get_achievement_total(db, u.id)
-        recommendation_score = get_recommendation_total(db, u.id)
-        achievement_scores.append(achievement_score)
-        recommendation_scores.append(recommendation_score)
-        rows.append(
-            {
-                "user": {"id": u.id, "full_name": u.full_name, "username": u.username},
-                "achievement_score": achievement_score,
-                "recommendation_score": recommendation_score,
-            }
-        )
-
-    pA_map = _percent_rank(achievement_scores)
-    pR_map = _percent_rank(recommendation_scores)
-
-    for row in rows:
-        pA = pA_map.get(row["achievement_score"], 0.0)
-        pR = pR_map.get(row["recommendation_score"], 0.0)
-        row["pA"] = pA
-        row["pR"] = pR
-        row["combined_score"] = (0.6 * pA) + (0.4 * pR)
-
-    rows.sort(
-        key=lambda r: (
-            r["combined_score"],
-            r["pA"],
-            r["pR"],
-            r["achievement_score"],
-        ),
-        reverse=True,
+    return await shared_cache.get_or_compute(
+        f"leaderboard:combined:{limit}",
+        lambda: _combined_leaderboard(db, limit),
+        ttl=LEADERBOARD_CACHE_TTL,
     )
 
-    for i, r in enumerate(rows[:limit], start=1):
-        r["rank"] = i
 
-    return rows[:limit]
+async def _combined_leaderboard(db: AsyncSession, limit: int) -> list[dict]:
+    top = await db.run_sync(top_combined, limit)
 
+    user_ids = [row["user_id"] for row in top]
+    users = (
+        (await db.execute(select(User).where(User.id.in_(user_ids)))).scalars().all()
+        if user_ids else []
+    )
+    user_map = {user.id: user for user in users}
 
-@router.get("/achievements")
-def achievement_leaderboard(
-    limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
-):
-    users = db.query(User).all()
-
-    rows = []
-    for u in users:
-        score = get_achievement_total(db, u.id)
-        rows.append(
+    # a user deleted since top_combined read the scores drops out without leaving a gap
+    ranked = [row for row in top if row["user_id"] in user_map]
+    out = []
+    for i, row in enumerate(ranked, start=1):
+        out.append(
             {
-                "user": {"id": u.id, "full_name": u.full_name, "username": u.username},
-                "score": score,
+                "user": _user_out(user_map[row["user_id"]]),
+                "achievement_score": row["achievement_score"],
+                "recommendation_score": row["recommendation_score"],
+                "pA": row["pA"],
+                "pR": row["pR"],
+                "combined_score": row["combined_score"],
+                "rank": i,
             }
         )
+    return out
 
-    rows.sort(key=lambda r: r["score"], reverse=True)
-
-    for i, r in enumerate(rows[:limit], start=1):
-        r["rank"] = i
 
-    return rows[:limit]
+@router.get("/me")
+async def my_leaderboard_rank(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_principal_async),
+):
+    # read-only: a user without a stored row is ranked on live totals, nothing is written
+    score = await db.get(UserScore, current_user.id)
+    if score is None:
+        score = await db.run_sync(compute_user_score, current_user.id)
+    return await db.run_sync(user_rank, score)
+
+
+async def _single_score_leaderboard(db: AsyncSession, column, limit: int) -> list[dict]:
+    rows = (
+        await db.execute(
+            select(User, column)
+            .join(UserScore, UserScore.user_id == User.id)
+            .order_by(column.desc(), User.id.asc())
+            .limit(limit)
+        )
+    ).all()
+    return [
+        {"user": _user_out(user), "score": score, "rank": i}
+        for i, (user, score) in enumerate(rows, start=1)
+    ]
 
 
-@router.get("/recommendations")
-def recommendation_leaderboard(
+@router.get("/achievements")
+async def achievement_leaderboard(
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    users = db.query(User).all()
-
-    rows = []
-    for u in users:
-        score = get_recommendation_total(db, u.id)
-        rows.append(
-            {
-                "user": {"id": u.id, "full_name": u.full_name, "username": u.username},
-                "score": score,
-            }
-        )
-
-    rows.sort(key=lambda r: r["score"], reverse=True)
+    return await shared_cache.get_or_compute(
+        f"leaderboard:achievements:{limit}",
+        lambda: _single_score_leaderboard(db, UserScore.achievement_total, limit),
+        ttl=LEADERBOARD_CACHE_TTL,
+    )
 
-    for i, r in enumerate(rows[:limit], start=1):
-        r["rank"] = i
 
-    return rows[:limit]
+@router.get("/recommendations")
+async def recommendation_leaderboard(
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await shared_cache.get_or_compute(
+        f"leaderboard:recommendations:{limit}",
+        lambda: _single_score_leaderboard(db, UserScore.recommendation_total, limit),
+        ttl=LEADERBOARD_CACHE_TTL,
+    )
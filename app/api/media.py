@@ -0,0 +1,40 @@
+import re
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import etag_matches
+from app.core.media_storage import BLOB_URL_PREFIX, media_storage
+
+router = APIRouter(prefix=BLOB_URL_PREFIX, tags=["Media"])
+
+# a key names its bytes forever, so clients and CDNs may keep it indefinitely
+IMMUTABLE = "public, max-age=31536000, immutable"
+CONTENT_TYPES = {"webp": "image/webp", "jpg": "image/jpeg"}
+_KEY_RE = re.compile(r"^([0-9a-f]{64})\.(webp|jpg)$")
+
+
+@router.api_route("/{key}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_blob(key: str, request: Request):
+    match = _KEY_RE.match(key)
+    if not match:
+        raise HTTPException(status_code=404, detail="Not found")
+    digest, ext = match.groups()
+    headers = {"ETag": f'"{digest}"', "Cache-Control": IMMUTABLE}
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    path = media_storage.path(key)
+    if path is not None:
+        if not await run_in_threadpool(media_storage.exists, key):
+            raise HTTPException(status_code=404, detail="Not found")
+        # Range/If-Range handled by FileResponse; sent with http.response.pathsend
+        # (zero-copy) when the server supports it, else streamed in chunks
+        return FileResponse(path, media_type=CONTENT_TYPES[ext], headers=headers)
+
+    data = await run_in_threadpool(media_storage.read, key)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return Response(data, media_type=CONTENT_TYPES[ext], headers=headers)
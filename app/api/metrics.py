@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.jwt import token_cache_stats
+from app.core.metrics import CounterFamily, GaugeFamily, register_collector, render
+from app.core.shared_cache import shared_cache
+from app.db.async_session import async_engine, async_read_engine
+from app.db.deps import get_db
+from app.db.job import Job
+from app.db.session import engine, read_engine
+from app.services.jobs import QUEUED, RUNNING
+from app.services.principals import principal_cache_stats
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+POOLS = {
+    "primary": engine.pool,
+    "read": read_engine.pool,
+    "async_primary": async_engine.sync_engine.pool,
+    "async_read": async_read_engine.sync_engine.pool,
+}
+
+
+@register_collector
+def pool_metrics():
+    size = GaugeFamily("db_pool_size", "Configured pool size.", ("pool",))
+    checked_out = GaugeFamily("db_pool_checked_out", "Connections currently checked out.", ("pool",))
+    overflow = GaugeFamily("db_pool_overflow", "Connections open beyond pool_size (negative: unused slots).", ("pool",))
+    seen = set()
+    for name, pool in POOLS.items():
+        # the read pools are the primary ones when no replica is configured
+        if id(pool) in seen or not hasattr(pool, "checkedout"):
+            continue
+        seen.add(id(pool))
+        size.add(name, value=pool.size())
+        checked_out.add(name, value=pool.checkedout())
+        overflow.add(name, value=pool.overflow())
+    return [size, checked_out, overflow]
+
+
+@register_collector
+def cache_metrics():
+    hits = CounterFamily("cache_hits_total", "Cache hits.", ("cache",))
+    misses = CounterFamily("cache_misses_total", "Cache misses.", ("cache",))
+    ratio = GaugeFamily("cache_hit_ratio", "Hits / (hits + misses) since start.", ("cache",))
+    caches = {
+        "shared": shared_cache.stats(),
+        "verified_tokens": token_cache_stats(),
+        "principals": principal_cache_stats(),
+    }
+    for name, stats in caches.items():
+        lookups = stats["hits"] + stats["misses"]
+        hits.add(name, value=stats["hits"])
+        misses.add(name, value=stats["misses"])
+        ratio.add(name, value=stats["hits"] / lookups if lookups else 0.0)
+    return [hits, misses, ratio]
+
+
+def job_metrics(db: Session) -> list[GaugeFamily]:
+    depth = GaugeFamily("jobs_queue_depth", "Background jobs by status and kind.", ("status", "kind"))
+    rows = (
+        db.query(Job.status, Job.kind, func.count())
+        .filter(Job.status.in_((QUEUED, RUNNING)))
+        .group_by(Job.status, Job.kind)
+        .all()
+    )
+    for status, kind, count in rows:
+        depth.add(status, kind, value=count)
+    return [depth]
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(db: Session = Depends(get_db)):
+    return PlainTextResponse(render(job_metrics(db)), media_type=PROMETHEUS_CONTENT_TYPE)
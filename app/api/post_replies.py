@@ -8,14 +8,15 @@ from app.api.post_reply_schemas import (
     PostReplyOwnerReactionOut,
 )
 from app.db.deps import get_db
-from app.db.inbox_item import InboxItem
 from app.db.models import User
 from app.db.post import Post
 from app.db.post_reply import PostReply
 from app.db.post_reply_caret import PostReplyCaret
 from app.db.post_reply_owner_reaction import PostReplyOwnerReaction
 from app.db.user_profile import UserProfile
+from app.services.job_handlers import enqueue_inbox_item
 from app.services.permissions import ensure_reply_owner
+from app.services.photos import avatar_url
 
 router = APIRouter(prefix="/post-replies", tags=["Post Replies"])
 
@@ -27,7 +28,7 @@ def build_reply_user_out(user: User, profile: UserProfile | None):
         "id": user.id,
         "username": user.username,
         "full_name": user.full_name,
-        "profile_photo_url": profile.profile_photo_url if profile else None,
+        "profile_photo_url": avatar_url(profile),
     }
 
 
@@ -107,10 +108,12 @@ def set_post_reply_owner_reaction(
         sender_profile = (
             db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
         )
-        inbox_item = InboxItem(
+        enqueue_inbox_item(
+            db,
+            f"post-reply-reaction:{reaction.id}",
             user_id=reply.sender_id,
             type="POST_REPLY_REACTION",
-            payload_json={
+            payload={
                 "reply_id": reply.id,
                 "post_id": reply.post_id,
                 "post_type": post.type if post else "",
@@ -120,7 +123,6 @@ def set_post_reply_owner_reaction(
                 "created_at": reaction.created_at.isoformat(),
             },
         )
-        db.add(inbox_item)
         db.commit()
 
     return PostReplyOwnerReactionOut(
@@ -1,12 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import desc, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps_auth import get_current_user, get_optional_user
+from app.api.deps_auth import get_current_user, get_optional_principal, get_optional_principal_async
 from app.api.post_schemas import PostCaretOut, PostCreate, PostOut, PostUserOut
 from app.api.post_reply_schemas import PostReplyCreate, PostReplyOut
-from app.db.deps import get_db
-from app.db.inbox_item import InboxItem
+from app.db.deps import get_async_db, get_db
 from app.db.models import User
 from app.db.post import Post
 from app.db.post_caret import PostCaret
@@ -14,7 +14,12 @@ from app.db.post_reply import PostReply
 from app.db.post_reply_caret import PostReplyCaret
 from app.db.post_reply_owner_reaction import PostReplyOwnerReaction
 from app.db.user_profile import UserProfile
+from app.services.pagination import before, decode_cursor, encode_cursor, take_page
 from app.services.permissions import ensure_post_owner
+from app.services.photos import avatar_url
+from app.services.principals import Principal
+from app.services.carets import remove_post_carets, toggle_caret
+from app.services.job_handlers import enqueue_inbox_item
 
 router = APIRouter(prefix="/posts", tags=["Posts"])
 
@@ -37,7 +42,7 @@ def build_user_out(user: User, profile: UserProfile | None) -> PostUserOut:
         username=user.username,
         full_name=user.full_name,
         university=university,
-        profile_photo_url=profile.profile_photo_url if profile else None
+        profile_photo_url=avatar_url(profile),
     )
 
 
@@ -46,7 +51,7 @@ def build_reply_user_out(user: User, profile: UserProfile | None):
         "id": user.id,
         "username": user.username,
         "full_name": user.full_name,
-        "profile_photo_url": profile.profile_photo_url if profile else None,
+        "profile_photo_url": avatar_url(profile),
     }
 
 
@@ -85,52 +90,48 @@ def create_post(
 
 
 @router.get("", response_model=list[PostOut])
-def list_posts(
+async def list_posts(
+    response: Response,
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
     user_id: int | None = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User | None = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal | None = Depends(get_optional_principal_async),
 ):
-    query = db.query(Post)
+    query = select(Post)
     if user_id is not None:
-        query = query.filter(Post.user_id == user_id)
+        query = query.where(Post.user_id == user_id)
+    if cursor:
+        query = query.where(before((Post.created_at, Post.id), decode_cursor(cursor, int)))
     posts = (
-        query.order_by(desc(Post.created_at))
-        .limit(limit)
-        .all()
-    )
+        await db.execute(query.order_by(desc(Post.created_at), desc(Post.id)).limit(limit + 1))
+    ).scalars().all()
+    posts = take_page(posts, limit, response, lambda p: encode_cursor(p.created_at, p.id))
 
     user_ids = {p.user_id for p in posts}
     post_ids = [p.id for p in posts]
     users = (
-        db.query(User).filter(User.id.in_(user_ids)).all()
+        (await db.execute(select(User).where(User.id.in_(user_ids)))).scalars().all()
         if user_ids else []
     )
     profiles = (
-        db.query(UserProfile).filter(UserProfile.user_id.in_(user_ids)).all()
+        (await db.execute(select(UserProfile).where(UserProfile.user_id.in_(user_ids)))).scalars().all()
         if user_ids else []
     )
-    caret_counts = (
-        db.query(PostCaret.post_id, func.count(PostCaret.id))
-        .filter(PostCaret.post_id.in_(post_ids))
-        .group_by(PostCaret.post_id)
-        .all()
-        if post_ids else []
-    )
     user_carets = set()
     if current_user and post_ids:
-        user_carets = {
-            post_id
-            for (post_id,) in db.query(PostCaret.post_id)
-            .filter(
-                PostCaret.user_id == current_user.id,
-                PostCaret.post_id.in_(post_ids),
-            )
-            .all()
-        }
+        user_carets = set(
+            (
+                await db.execute(
+                    select(PostCaret.post_id).where(
+                        PostCaret.user_id == current_user.id,
+                        PostCaret.post_id.in_(post_ids),
+                    )
+                )
+            ).scalars().all()
+        )
     user_map = {user.id: user for user in users}
     profile_map = {profile.user_id: profile for profile in profiles}
-    caret_map = {post_id: count for post_id, count in caret_counts}
 
     output: list[PostOut] = []
     for post in posts:
@@ -144,7 +145,7 @@ def list_posts(
                 content=post.content,
                 created_at=post.created_at,
                 user=build_user_out(user, profile_map.get(user.id)),
-                caret_count=int(caret_map.get(post.id, 0)),
+                caret_count=post.caret_count,
                 has_caret=post.id in user_carets
             )
         )
@@ -155,7 +156,7 @@ def list_posts(
 def get_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User | None = Depends(get_optional_user),
+    current_user: Principal | None = Depends(get_optional_principal),
 ):
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
@@ -164,12 +165,6 @@ def get_post(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
-    caret_count = (
-        db.query(func.count(PostCaret.id))
-        .filter(PostCaret.post_id == post.id)
-        .scalar()
-        or 0
-    )
     has_caret = False
     if current_user:
         has_caret = (
@@ -187,7 +182,7 @@ def get_post(
         content=post.content,
         created_at=post.created_at,
         user=build_user_out(user, profile),
-        caret_count=int(caret_count),
+        caret_count=post.caret_count,
         has_caret=has_caret
     )
 
@@ -217,19 +212,13 @@ def update_post(
     profile = (
         db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
     )
-    caret_count = (
-        db.query(func.count(PostCaret.id))
-        .filter(PostCaret.post_id == post.id)
-        .scalar()
-        or 0
-    )
     return PostOut(
         id=post.id,
         type=post.type,
         content=post.content,
         created_at=post.created_at,
         user=build_user_out(current_user, profile),
-        caret_count=int(caret_count),
+        caret_count=post.caret_count,
         has_caret=False
     )
 
@@ -246,29 +235,12 @@ def toggle_post_caret(
     if post.user_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot add caret to your own post")
 
-    existing = (
-        db.query(PostCaret)
-        .filter(PostCaret.post_id == post_id, PostCaret.user_id == current_user.id)
-        .first()
-    )
-    if existing:
-        db.delete(existing)
-        db.commit()
-        has_caret = False
-    else:
-        db.add(PostCaret(post_id=post_id, user_id=current_user.id))
-        db.commit()
-        has_caret = True
-
-    caret_count = (
-        db.query(func.count(PostCaret.id))
-        .filter(PostCaret.post_id == post_id)
-        .scalar()
-        or 0
-    )
+    has_caret, caret_count = toggle_caret(db, post, current_user.id)
+    db.commit()
+
     return PostCaretOut(
         post_id=post_id,
-        caret_count=int(caret_count),
+        caret_count=caret_count,
         has_caret=has_caret
     )
 
@@ -307,7 +279,7 @@ def create_post_reply(
         message=message,
     )
     db.add(reply)
-    db.commit()
+    db.flush()
     db.refresh(reply)
 
     sender_profile = (
@@ -317,10 +289,12 @@ def create_post_reply(
     if len(post_snippet) > 160:
         post_snippet = f"{post_snippet[:160]}..."
 
-    inbox_item = InboxItem(
+    enqueue_inbox_item(
+        db,
+        f"post-reply:{reply.id}",
         user_id=recipient_id,
         type="POST_REPLY",
-        payload_json={
+        payload={
             "reply_id": reply.id,
             "post_id": post.id,
             "post_type": post.type,
@@ -331,7 +305,6 @@ def create_post_reply(
             "created_at": reply.created_at.isoformat(),
         },
     )
-    db.add(inbox_item)
     db.commit()
 
     return PostReplyOut(
@@ -405,7 +378,7 @@ def delete_post(
     if post.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed to delete this post")
 
-    db.query(PostCaret).filter(PostCaret.post_id == post_id).delete()
+    remove_post_carets(db, post)
     db.delete(post)
     db.commit()
     return {"status": "deleted"}
@@ -1,6 +1,6 @@
 # app/api/public_profile_schemas.py
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 
 class VerifiedEducation(BaseModel):
@@ -36,6 +36,7 @@ class PublicUserOut(BaseModel):
     recommended_by: List[RecommenderMini] = []
     recommender_count: int = 0
     profile_photo_url: Optional[str] = None
+    profile_photo_variants: Optional[Dict[str, Dict[str, str]]] = None
     achievement_total: Optional[int] = None
     recommendation_total: Optional[int] = None
     caret_score: Optional[int] = None
@@ -1,10 +1,12 @@
 # app/api/public_profiles.py
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.db.deps import get_db
+from app.core.cache import etag_matches
+from app.db.deps import get_async_read_db
 from app.db.models import User
 from app.db.recommendations import Recommendation
 from app.db.user_profile import UserProfile
@@ -15,32 +17,44 @@ from app.api.public_profile_schemas import (
     PublicUserOut,
     RecommenderMini,
 )
-from sqlalchemy import func
-from app.db.post import Post
-from app.db.post_caret import PostCaret
-from app.services.public_user import _totals
+from app.services.profile_cache import cached_profile
+from app.services.user_scores import get_stored_totals
 
 router = APIRouter(prefix="/public/users", tags=["Public Users"])
 
 
 @router.get("/search", response_model=List[PublicUserSearchOut])
-def search_users(
+async def search_users(
     q: str = Query(..., min_length=1),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    return search_public_users(db, q, limit)
+    return await db.run_sync(search_public_users, q, limit)
 
 
 # ✅ username-based public profile
 @router.get("/{username}", response_model=PublicUserOut)
-def public_user_by_username(username: str, db: Session = Depends(get_db)):
+async def public_user_by_username(
+    username: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+):
     # normalize '^satya' -> 'satya'
     try:
         uname = normalize_username(username)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid username")
 
+    entry = await cached_profile(uname, lambda: db.run_sync(_public_profile, uname))
+
+    if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        return Response(status_code=304, headers={"ETag": entry["etag"]})
+    response.headers["ETag"] = entry["etag"]
+    return entry["payload"]
+
+
+def _public_profile(db: Session, uname: str) -> dict:
     user = db.query(User).filter(User.username == uname).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -56,16 +70,12 @@ def public_user_by_username(username: str, db: Session = Depends(get_db)):
 
     profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
     base["profile_photo_url"] = profile.profile_photo_url if profile else None
-    achievement_total, recommendation_total = _totals(db, user.id)
+    base["profile_photo_variants"] = profile.profile_photo_variants if profile else None
+    # one user_scores read for all three totals
+    achievement_total, recommendation_total, caret_score = get_stored_totals(db, [user.id])[user.id]
     base["achievement_total"] = achievement_total
     base["recommendation_total"] = recommendation_total
-    base["caret_score"] = (
-        db.query(func.count(PostCaret.id))
-        .join(Post, Post.id == PostCaret.post_id)
-        .filter(Post.user_id == user.id)
-        .scalar()
-        or 0
-    )
+    base["caret_score"] = caret_score
     base["verified_education"] = _verified_education(db, user.id)
     base["verified_work"] = _verified_work(db, user.id)
 
@@ -4,8 +4,8 @@ from sqlalchemy.orm import Session
 from app.db.deps import get_db
 from app.db.recommendations import Recommendation
 from app.db.models import User
-from app.api.achievement import get_user_achievement  # reuse your function
 from app.scoring.recommendation_score import points_for_recommendation
+from app.services.scores import get_achievement_totals
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -21,13 +21,17 @@ def get_recommendation_score(user_id: int, db: Session = Depends(get_db)):
         .all()
     )
 
+    # recommender achievement totals as /users/{id}/achievement scores them,
+    # for all recommenders at once
+    recommender_totals = get_achievement_totals(
+        db, {r.recommender_id for r in recs}, verified_only=False
+    )
+
     total = 0
     breakdown = []
 
     for r in recs:
-        # compute recommender achievement total (reuse existing endpoint logic)
-        recomm_ach = get_user_achievement(r.recommender_id, db)
-        recomm_total = recomm_ach["achievement_score"]["total"]
+        recomm_total = recommender_totals[r.recommender_id]
 
         scored = points_for_recommendation(r.rec_type, recomm_total)
         total += scored["points"]
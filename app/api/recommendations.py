@@ -4,10 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps_auth import get_current_user
+from app.api.feed import FEED_TAG
+from app.core.shared_cache import invalidate_tags_on_commit
 from app.db.deps import get_db
 from app.db.models import User
 from app.db.recommendations import Recommendation
-from app.db.inbox_item import InboxItem
+from app.services.job_handlers import enqueue_inbox_item, enqueue_recommendation_score
 from app.services.username import normalize_username
 from app.api.recommendation_schemas import (
     RecommendationRequestIn,
@@ -88,10 +90,17 @@ def get_my_pending_requests(
         .all()
     )
 
+    requester_ids = {r.requester_id for r in recs}
+    requesters = (
+        {user.id: user for user in db.query(User).filter(User.id.in_(requester_ids)).all()}
+        if requester_ids
+        else {}
+    )
+
     # return enriched payload (includes requester username/name)
     out = []
     for r in recs:
-        requester = db.query(User).filter(User.id == r.requester_id).first()
+        requester = requesters.get(r.requester_id)
         out.append(
             {
                 "id": r.id,
@@ -136,11 +145,14 @@ def approve_recommendation(
     rec.note_body = payload.note_body
     rec.decided_at = datetime.utcnow()
 
-    inbox_item = InboxItem(
+    # points and the requester's inbox item are written by the job worker
+    enqueue_inbox_item(
+        db,
+        f"recommendation-approved:{rec.id}",
         user_id=rec.requester_id,
         type="RECOMMENDATION_APPROVED",
         status="UNREAD",
-        payload_json={
+        payload={
             "recommendation_id": rec.id,
             "recommender_id": current_user.id,
             "recommender_name": current_user.full_name,
@@ -149,7 +161,8 @@ def approve_recommendation(
             "note_body": rec.note_body,
         },
     )
-    db.add(inbox_item)
+    enqueue_recommendation_score(db, rec.id)
+    invalidate_tags_on_commit(db, FEED_TAG)
 
     db.commit()
     db.refresh(rec)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
@@ -8,6 +8,7 @@ from app.db.deps import get_db
 from app.db.models import User
 from app.db.reflection import Reflection
 from app.db.user_profile import UserProfile
+from app.services.pagination import before, decode_cursor, encode_cursor, take_page
 
 router = APIRouter(prefix="/reflections", tags=["Reflections"])
 
@@ -62,15 +63,21 @@ def create_reflection(
 
 @router.get("", response_model=list[ReflectionOut])
 def list_reflections(
+    response: Response,
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
     db: Session = Depends(get_db),
 ):
+    query = db.query(Reflection)
+    if cursor:
+        query = query.filter(before((Reflection.created_at, Reflection.id), decode_cursor(cursor, int)))
     reflections = (
-        db.query(Reflection)
-        .order_by(desc(Reflection.created_at))
-        .limit(limit)
+        query
+        .order_by(desc(Reflection.created_at), desc(Reflection.id))
+        .limit(limit + 1)
         .all()
     )
+    reflections = take_page(reflections, limit, response, lambda r: encode_cursor(r.created_at, r.id))
 
     user_ids = {r.user_id for r in reflections}
     users = (
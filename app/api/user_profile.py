@@ -1,17 +1,21 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.db.deps import get_db
+from app.core.uploads import read_upload, upload_openapi
+from app.db.deps import get_async_db, get_db
 from app.db.user_profile import UserProfile
 from app.db.models import User
 from app.services.username import normalize_username
 from app.api.user_profile_schemas import UserProfileOut, UserProfileUpdate
-from app.api.deps_auth import get_current_user
+from app.api.deps_auth import get_current_user, get_current_user_async
+from app.services.photos import PROFILE_SIZE, InvalidImage, process_photo_file, variant_urls
+from app.services.profile_cache import invalidate_profile
 
 router = APIRouter(prefix="/me/profile", tags=["User Profile"])
 MAX_PHOTO_BYTES = 2 * 1024 * 1024
-PHOTO_DIR = os.path.join(os.getcwd(), "uploads", "profile_photos")
 
 
 @router.get("", response_model=UserProfileOut)
@@ -55,7 +59,11 @@ def upsert_my_profile(
     else:
         for k, v in data.items():
             setattr(profile, k, v)
+    if "profile_photo_url" in data:
+        # a hand-set URL has no processed variants
+        profile.profile_photo_variants = None
 
+    invalidate_profile(db, current_user.id)
     db.commit()
     db.refresh(profile)
     payload = UserProfileOut.model_validate(profile).model_dump()
@@ -65,49 +73,38 @@ def upsert_my_profile(
     return payload
 
 
-@router.put("/photo", response_model=UserProfileOut)
-async def update_profile_photo(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-):
-    if not file.content_type or not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid file type")
-
-    content = await file.read()
-    if len(content) > MAX_PHOTO_BYTES:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File too large")
-
-    ext_map = {
-        "image/jpeg": ".jpg",
-        "image/png": ".png",
-        "image/webp": ".webp",
-        "image/gif": ".gif",
-    }
-    ext = ext_map.get(file.content_type, ".jpg")
-
-    os.makedirs(PHOTO_DIR, exist_ok=True)
-    filename = f"user_{current_user.id}{ext}"
-    file_path = os.path.join(PHOTO_DIR, filename)
-
-    profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
+def _store_photo(db: Session, user_id: int, variants) -> UserProfile:
+    urls = variant_urls(variants)
+    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
     if profile is None:
-        profile = UserProfile(user_id=current_user.id)
+        profile = UserProfile(user_id=user_id)
         db.add(profile)
+    profile.profile_photo_url = urls[str(PROFILE_SIZE)]["jpeg"]
+    profile.profile_photo_variants = urls
+    invalidate_profile(db, user_id)
+    db.flush()
+    return profile
 
-    if profile.profile_photo_url:
-        old_name = os.path.basename(profile.profile_photo_url)
-        old_path = os.path.join(PHOTO_DIR, old_name)
-        if old_path != file_path and os.path.exists(old_path):
-            try:
-                os.remove(old_path)
-            except OSError:
-                pass
-
-    with open(file_path, "wb") as out_file:
-        out_file.write(content)
 
-    profile.profile_photo_url = f"/media/profile_photos/{filename}"
-    db.commit()
-    db.refresh(profile)
+@router.put("/photo", response_model=UserProfileOut, openapi_extra=upload_openapi())
+async def update_profile_photo(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user_async),
+):
+    # streamed to disk as it arrives; aborts with 413 past MAX_PHOTO_BYTES
+    upload = await read_upload(request, MAX_PHOTO_BYTES)
+    try:
+        if not upload.content_type or not upload.content_type.startswith("image/"):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid file type")
+        try:
+            variants = await run_in_threadpool(process_photo_file, upload.path)
+        except InvalidImage as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    finally:
+        await run_in_threadpool(os.remove, upload.path)
+
+    # replaced variants stay in the media store until collect_unreferenced_blobs
+    profile = await db.run_sync(_store_photo, current_user.id, variants)
+    await db.commit()
     return profile
@@ -52,6 +52,7 @@ class UserProfileOut(UserProfileUpdate):
     id: int
     user_id: int
     visibility: Visibility  # ensure returned even if not provided in update
+    profile_photo_variants: Optional[Dict[str, Dict[str, str]]] = None
     email: Optional[str] = None
     full_name: Optional[str] = None
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.approval import is_auto_approved_email
@@ -10,12 +10,14 @@ from app.db.models import User
 from app.api.schemas import UserCreate, UserOut
 from app.services.username import normalize_username
 from app.services.scores import get_achievement_total, get_recommendation_total
-from sqlalchemy import func
+from app.services.user_scores import ensure_user_score, get_caret_total
 from app.db.post import Post
 from app.db.post_caret import PostCaret
 from app.db.user_profile import UserProfile
 from app.api.post_schemas import CaretNotificationOut, CaretUserOut
 from app.api.deps_auth import get_current_user
+from app.services.pagination import before, decode_cursor, encode_cursor, take_page
+from app.services.photos import avatar_url
 
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -46,44 +48,35 @@ def get_my_reflection_caret_score(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    total = (
-        db.query(func.count(PostCaret.id))
-        .join(Post, Post.id == PostCaret.post_id)
-        .filter(Post.user_id == current_user.id)
-        .scalar()
-        or 0
-    )
-    return {"user_id": current_user.id, "caret_score": int(total)}
+    total = get_caret_total(db, current_user.id)
+    return {"user_id": current_user.id, "caret_score": total}
 
 
 @router.get("/me/caret-notifications", response_model=list[CaretNotificationOut])
 def get_my_caret_notifications(
+    response: Response,
     limit: int = 50,
+    cursor: str | None = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     limit = max(1, min(limit, 200))
-    rows = (
+    query = (
         db.query(PostCaret, Post, User, UserProfile)
         .join(Post, Post.id == PostCaret.post_id)
         .join(User, User.id == PostCaret.user_id)
         .outerjoin(UserProfile, UserProfile.user_id == User.id)
         .filter(Post.user_id == current_user.id)
-        .order_by(PostCaret.created_at.desc())
-        .limit(limit)
+    )
+    if cursor:
+        query = query.filter(before((PostCaret.created_at, PostCaret.id), decode_cursor(cursor, int)))
+    rows = (
+        query
+        .order_by(PostCaret.created_at.desc(), PostCaret.id.desc())
+        .limit(limit + 1)
         .all()
     )
-
-    post_ids = [post.id for (_, post, _, _) in rows]
-    caret_counts = {}
-    if post_ids:
-        counts = (
-            db.query(PostCaret.post_id, func.count(PostCaret.id))
-            .filter(PostCaret.post_id.in_(post_ids))
-            .group_by(PostCaret.post_id)
-            .all()
-        )
-        caret_counts = {post_id: int(count) for post_id, count in counts}
+    rows = take_page(rows, limit, response, lambda row: encode_cursor(row[0].created_at, row[0].id))
 
     notifications = []
     for caret, post, giver, giver_profile in rows:
@@ -93,13 +86,13 @@ def get_my_caret_notifications(
                 post_id=post.id,
                 post_type=post.type,
                 post_content=post.content,
-                caret_count=caret_counts.get(post.id, 0),
+                caret_count=post.caret_count,
                 created_at=caret.created_at,
                 giver=CaretUserOut(
                     id=giver.id,
                     username=giver.username,
                     full_name=giver.full_name,
-                    profile_photo_url=getattr(giver_profile, "profile_photo_url", None),
+                    profile_photo_url=avatar_url(giver_profile),
                 ),
             )
         )
@@ -168,6 +161,8 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db)):
         user.approved_at = datetime.utcnow()
 
     db.add(user)
+    db.flush()
+    ensure_user_score(db, user.id)
     db.commit()
     db.refresh(user)
     return user
@@ -1,14 +1,40 @@
+import time
 from datetime import datetime, timedelta
 from jose import jwt
 
+from app.core.cache import TTLCache
+
 SECRET_KEY = "satyayannamrecachsecretkeyissomasculine"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
-def create_access_token(subject: str, expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES) -> str:
+# verified token -> claims; a hit skips signature verification
+VERIFIED_TOKEN_CACHE_SIZE = 4096
+VERIFIED_TOKEN_CACHE_TTL = 300
+_verified_tokens = TTLCache(maxsize=VERIFIED_TOKEN_CACHE_SIZE, ttl=VERIFIED_TOKEN_CACHE_TTL)
+
+def create_access_token(
+    subject: str,
+    expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES,
+    claims: dict | None = None,
+) -> str:
     expire = datetime.utcnow() + timedelta(minutes=expires_minutes)
-    payload = {"sub": subject, "exp": expire}
+    payload = {**(claims or {}), "sub": subject, "exp": expire}
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 def decode_access_token(token: str) -> dict:
     return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+def verify_access_token(token: str) -> dict:
+    """decode_access_token with an LRU of already verified tokens. Raises JWTError."""
+    claims = _verified_tokens.get(token)
+    if claims is None:
+        claims = decode_access_token(token)
+        # never outlive the token's own expiry
+        ttl = min(VERIFIED_TOKEN_CACHE_TTL, claims.get("exp", 0) - time.time())
+        if ttl > 0:
+            _verified_tokens.set(token, claims, ttl)
+    return claims
+
+def token_cache_stats() -> dict:
+    return _verified_tokens.stats()
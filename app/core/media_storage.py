@@ -0,0 +1,120 @@
+"""
+Content-addressed blob storage for uploaded media.
+
+Blobs are keyed by "<sha256 of the bytes>.<ext>", so a key always names the
+same content and can be cached forever. MEDIA_STORAGE_URL picks the backend:
+  file:///abs/path   local filesystem (default: ./uploads/blobs)
+
+Backends implement MediaStorage; one that cannot hand out a local path
+(e.g. an S3-compatible bucket) returns None from `path` and serves bytes
+through `read` instead.
+"""
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterator
+from urllib.parse import unquote, urlparse
+
+
+BLOB_URL_PREFIX = "/media/blobs"
+
+
+def content_key(data: bytes, ext: str) -> str:
+    return f"{hashlib.sha256(data).hexdigest()}.{ext}"
+
+
+def blob_url(key: str) -> str:
+    return f"{BLOB_URL_PREFIX}/{key}"
+
+
+def blob_key_from_url(url: str | None) -> str | None:
+    if url and url.startswith(f"{BLOB_URL_PREFIX}/"):
+        return url[len(BLOB_URL_PREFIX) + 1:]
+    return None
+
+
+class MediaStorage(ABC):
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def path(self, key: str) -> str | None:
+        """Local file for `key`, letting the server send it without copying; None if not local."""
+        return None
+
+    @abstractmethod
+    def read(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_keys(self) -> Iterator[tuple[str, datetime]]:
+        """(key, stored_at) for every blob; used by garbage collection."""
+        raise NotImplementedError
+
+
+class LocalMediaStorage(MediaStorage):
+    """Files under `root`, fanned out by the first two hex digits of the key."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def put(self, key, data):
+        path = self.path(key)
+        if os.path.exists(path):
+            os.utime(path)  # same key, same bytes; fresh mtime keeps it out of GC
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as out_file:
+            out_file.write(data)
+        os.replace(tmp_path, path)
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def read(self, key):
+        try:
+            with open(self.path(key), "rb") as in_file:
+                return in_file.read()
+        except FileNotFoundError:
+            return None
+
+    def iter_keys(self):
+        if not os.path.isdir(self.root):
+            return
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    yield entry.name, datetime.utcfromtimestamp(entry.stat().st_mtime)
+
+
+def create_media_storage(url: str) -> MediaStorage:
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        return LocalMediaStorage(unquote(parsed.path))
+    raise ValueError(f"Unsupported MEDIA_STORAGE_URL: {url}")
+
+
+media_storage = create_media_storage(
+    os.getenv("MEDIA_STORAGE_URL", f"file://{os.path.join(os.getcwd(), 'uploads', 'blobs')}")
+)
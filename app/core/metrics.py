@@ -0,0 +1,244 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A deliberately small stand-in for prometheus_client: counters, gauges and
+histograms with labels, kept per process and rendered by `render()`. Values
+computed at scrape time (pool usage, cache stats, queue depth) come from
+collectors registered with `register_collector`.
+
+Each worker process keeps its own numbers, so scrape workers individually
+(or run a single worker per target) rather than through a load balancer.
+
+MetricsMiddleware records, per route template (e.g. "/posts/{post_id}"):
+  http_requests_total               counter   method, route, status
+  http_request_duration_seconds     histogram method, route
+  http_requests_in_flight           gauge     method, route
+  http_request_db_queries           histogram route (needs QUERY_PROFILER)
+"""
+import threading
+import time
+from typing import Callable, Iterable
+
+from starlette.routing import Match
+
+from app.core.query_profiler import current_profile
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+# unmatched paths share one label so 404 probes cannot blow up cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in values]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # labels -> [per-bucket counts..., sum, count]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, *labels, value: float) -> None:
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, *labels) -> int:
+        state = self._values.get(labels)
+        return state[-1] if state else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        names = self.label_names + ("le",)
+        for labels, state in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(names, labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            plain = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{plain} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{plain} {state[-1]}")
+        return lines
+
+
+class GaugeFamily(_Metric):
+    """Gauge values built at scrape time by a collector."""
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self._samples: list[str] = []
+
+    def add(self, *labels, value: float) -> "GaugeFamily":
+        self._samples.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return self
+
+    def samples(self) -> list[str]:
+        return self._samples
+
+
+class CounterFamily(GaugeFamily):
+    """Cumulative totals read at scrape time (e.g. cache hit counts)."""
+
+    type = "counter"
+
+
+_registry: list[_Metric] = []
+_collectors: list[Callable[[], Iterable[GaugeFamily]]] = []  # incl. CounterFamily
+
+
+def register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def register_collector(collector: Callable[[], Iterable[GaugeFamily]]):
+    _collectors.append(collector)
+    return collector
+
+
+def render(extra: Iterable[_Metric] = ()) -> str:
+    """All registered metrics and collectors, plus `extra` families, as exposition text."""
+    families = list(_registry) + list(extra)
+    for collector in _collectors:
+        families.extend(collector())
+    lines = []
+    for family in families:
+        lines.extend(family.header())
+        lines.extend(family.samples())
+    return "\n".join(lines) + "\n"
+
+
+REQUESTS = register(Counter("http_requests_total", "HTTP requests handled.", ("method", "route", "status")))
+LATENCY = register(
+    Histogram("http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route"))
+)
+IN_FLIGHT = register(Gauge("http_requests_in_flight", "HTTP requests being handled.", ("method", "route")))
+DB_QUERIES = register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL statements per HTTP request (only with QUERY_PROFILER).",
+        ("route",),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+
+
+def route_template(scope) -> str:
+    """Path template of the route `scope` will be dispatched to."""
+    app = scope.get("app")
+    partial = None
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path  # right path, wrong method (405)
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding the http_* metrics. Add it inside QueryProfilerMiddleware."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.dec(method, route)
+            LATENCY.observe(method, route, value=time.perf_counter() - started)
+            REQUESTS.inc(method, route, str(status))
+            profile = current_profile()
+            if profile is not None:
+                DB_QUERIES.observe(route, value=profile.queries)
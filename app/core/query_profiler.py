@@ -0,0 +1,163 @@
+"""
+Per-request SQL statement counting and a slow-request log.
+
+QueryProfilerMiddleware starts a RequestProfile for every HTTP request and
+keeps it in a context variable; cursor-execute listeners on every Engine
+(sync engines and the sync_engine behind each AsyncEngine) add each
+statement's count, time and normalized shape to it. Responses then carry
+
+    Server-Timing: db;dur=12.4;desc="7 queries", app;dur=31.0
+
+and requests over SLOW_REQUEST_MS or SLOW_REQUEST_QUERIES are logged on the
+"app.query_profiler" logger together with their most repeated statement
+shapes, which is what an N+1 loop looks like.
+
+Enabled with QUERY_PROFILER=1; off by default so the listeners cost nothing.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "30"))
+TOP_SHAPES = 5
+
+_current_profile: ContextVar["RequestProfile | None"] = ContextVar("query_profile", default=None)
+
+# bound parameters in any paramstyle: ?, %s, %(name)s, :name, $1
+_PARAM = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_PARAM_LIST_RE = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """`statement` with literals and expanded IN lists folded, so repeats of one query compare equal."""
+    shape = _SPACE_RE.sub(" ", statement).strip()
+    shape = _LITERAL_RE.sub("?", shape)
+    return _PARAM_LIST_RE.sub("(?)", shape)
+
+
+@dataclass
+class RequestProfile:
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def repeated_shapes(self, limit: int = TOP_SHAPES) -> list[tuple[str, int]]:
+        return [(shape, count) for shape, count in self.shapes.most_common(limit) if count > 1]
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f"app;dur={self.elapsed() * 1000:.1f}"
+        )
+
+
+def current_profile() -> RequestProfile | None:
+    return _current_profile.get()
+
+
+def profiler_enabled() -> bool:
+    return os.getenv("QUERY_PROFILER", "").lower() in {"1", "true", "yes"}
+
+
+_QUERY_STARTS = "query_profiler_starts"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault(_QUERY_STARTS, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    starts = conn.info.get(_QUERY_STARTS)
+    if profile is not None and starts:
+        profile.record(statement, time.perf_counter() - starts.pop())
+
+
+def install_query_listeners() -> None:
+    """Listen on every Engine; idempotent."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def log_if_slow(method: str, path: str, status: int, profile: RequestProfile) -> None:
+    elapsed_ms = profile.elapsed() * 1000
+    if elapsed_ms < SLOW_REQUEST_MS and profile.queries < SLOW_REQUEST_QUERIES:
+        return
+    repeated = "; ".join(f"{count}x {shape}" for shape, count in profile.repeated_shapes())
+    logger.warning(
+        "slow request %s %s -> %s: %.0fms, %d queries, %.0fms in db%s",
+        method,
+        path,
+        status,
+        elapsed_ms,
+        profile.queries,
+        profile.db_seconds * 1000,
+        f"; repeated: {repeated}" if repeated else "",
+        extra={
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": round(elapsed_ms, 1),
+            "queries": profile.queries,
+            "db_ms": round(profile.db_seconds * 1000, 1),
+            "repeated_statements": profile.repeated_shapes(),
+        },
+    )
+
+
+class QueryProfilerMiddleware:
+    """
+    ASGI middleware (not BaseHTTPMiddleware, so streaming responses and the
+    context variable behave) that profiles each HTTP request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        install_query_listeners()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            log_if_slow(scope["method"], scope["path"], status, profile)
@@ -0,0 +1,105 @@
+import socket
+import threading
+from urllib.parse import unquote, urlparse
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisClient:
+    """
+    Minimal blocking RESP2 client: one socket per thread, commands sent as
+    arrays of bulk strings. Enough for caching (GET/SET/DEL/sets) against
+    Redis or anything that speaks its protocol.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        conn = (sock, sock.makefile("rb"))
+        self._local.conn = conn
+        if self.password:
+            self._roundtrip(conn, [("AUTH", self.password)])
+        if self.db:
+            self._roundtrip(conn, [("SELECT", self.db)])
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn:
+            sock, reader = conn
+            reader.close()
+            sock.close()
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            elif not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(out)
+
+    def _read(self, reader):
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            data = reader.read(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            size = int(rest)
+            if size < 0:
+                return None
+            return [self._read(reader) for _ in range(size)]
+        raise RedisError(f"Unexpected reply {line!r}")
+
+    def _roundtrip(self, conn, commands):
+        sock, reader = conn
+        sock.sendall(b"".join(self._encode(args) for args in commands))
+        replies = []
+        error = None
+        for _ in commands:
+            try:
+                replies.append(self._read(reader))
+            except RedisError as exc:
+                # keep reading so the connection stays in sync
+                error = error or exc
+                replies.append(None)
+        if error:
+            raise error
+        return replies
+
+    def pipeline(self, *commands):
+        """Send several commands in one write and read all replies."""
+        conn = getattr(self._local, "conn", None) or self._connect()
+        try:
+            return self._roundtrip(conn, commands)
+        except (OSError, ConnectionError):
+            self.close()
+            raise
+
+    def execute(self, *args):
+        return self.pipeline(args)[0]
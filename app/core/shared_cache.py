@@ -0,0 +1,314 @@
+"""
+Cache shared by every worker process.
+
+CACHE_URL picks the backend:
+  memory://            per-process (default; single worker, tests)
+  redis://host:6379/0  anything speaking the Redis protocol
+
+SharedCache adds JSON values, tag-based invalidation and single-flight
+get_or_compute on top of a backend. Backend failures are logged and treated
+as misses so the cache can never take an endpoint down.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.redis_client import RedisClient, RedisError
+
+logger = logging.getLogger(__name__)
+
+# how long a tag remembers its keys; longer than any entry TTL
+TAG_TTL = 24 * 60 * 60
+
+
+class CacheBackend(ABC):
+    """Byte-level store. Implementations must make `add` atomic."""
+
+    # True when calls do network I/O and must stay off the event loop
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate_tags(self, *tags: str) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    def __init__(self, maxsize: int = 4096):
+        self.entries = TTLCache(maxsize=maxsize)
+        self.tags = TTLCache(maxsize=maxsize, ttl=TAG_TTL)
+        # tag sets are read-modify-written; TTLCache only guards single calls
+        self._tags_lock = threading.Lock()
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value, ttl, tags=()):
+        self.entries.set(key, value, ttl)
+        with self._tags_lock:
+            for tag in tags:
+                keys = self.tags.get(tag) or set()
+                keys.add(key)
+                self.tags.set(tag, keys)
+
+    def add(self, key, value, ttl):
+        return self.entries.add(key, value, ttl)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.entries.delete(key)
+
+    def invalidate_tags(self, *tags):
+        for tag in tags:
+            with self._tags_lock:
+                keys = self.tags.get(tag) or ()
+                self.tags.delete(tag)
+            self.delete(*keys)
+
+    def stats(self):
+        stats = self.entries.stats()
+        return {name: stats[name] for name in ("size", "maxsize", "evictions", "expirations")}
+
+
+class RedisBackend(CacheBackend):
+    blocking = True
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        self.client = RedisClient(url, timeout=timeout)
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"tag:{tag}"
+
+    def get(self, key):
+        return self.client.execute("GET", key)
+
+    def set(self, key, value, ttl, tags=()):
+        commands = [("SET", key, value, "PX", int(ttl * 1000))]
+        for tag in tags:
+            commands.append(("SADD", self._tag_key(tag), key))
+            commands.append(("PEXPIRE", self._tag_key(tag), TAG_TTL * 1000))
+        self.client.pipeline(*commands)
+
+    def add(self, key, value, ttl):
+        return self.client.execute("SET", key, value, "PX", int(ttl * 1000), "NX") is not None
+
+    def delete(self, *keys):
+        if keys:
+            self.client.execute("DEL", *keys)
+
+    def invalidate_tags(self, *tags):
+        for tag in tags:
+            # RENAME takes the whole set in one step: keys tagged meanwhile go
+            # into a fresh set rather than being deleted from it unseen
+            claimed = f"{self._tag_key(tag)}:invalidating:{uuid.uuid4().hex}"
+            try:
+                _, members = self.client.pipeline(
+                    ("RENAME", self._tag_key(tag), claimed),
+                    ("SMEMBERS", claimed),
+                )
+            except RedisError as exc:
+                if "no such key" in str(exc).lower():
+                    continue
+                raise
+            self.client.execute("DEL", claimed, *(members or []))
+
+
+def create_cache_backend(url: str) -> CacheBackend:
+    if url.startswith("memory://"):
+        return MemoryBackend(maxsize=int(os.getenv("CACHE_MEMORY_SIZE", "4096")))
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+
+class SharedCache:
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str = "recach",
+        lock_ttl: float = 30.0,
+        wait_timeout: float = 5.0,
+        poll_interval: float = 0.05,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.computes = 0
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _safe(self, fn, *args, default=None):
+        try:
+            return fn(*args)
+        except (OSError, RedisError) as exc:
+            self.errors += 1
+            logger.warning("cache backend error: %s", exc)
+            return default
+
+    async def _call(self, fn, *args, default=None):
+        if self.backend.blocking:
+            return await run_in_threadpool(self._safe, fn, *args, default=default)
+        return self._safe(fn, *args, default=default)
+
+    async def get(self, key: str) -> Any:
+        raw = await self._call(self.backend.get, self._key(key))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        raw = json.dumps(value, separators=(",", ":")).encode()
+        await self._call(self.backend.set, self._key(key), raw, ttl, [self._key(t) for t in tags])
+
+    async def delete(self, *keys: str) -> None:
+        await self._call(self.backend.delete, *(self._key(k) for k in keys))
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Drop every entry stored under any of `tags`. Blocks; use from sync code."""
+        self._safe(self.backend.invalidate_tags, *(self._key(t) for t in tags))
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        tags: Iterable[str] | Callable[[Any], Iterable[str]] = (),
+    ) -> Any:
+        """
+        Cached value for `key`, or compute() it once: concurrent callers in
+        this process share one in-flight computation, and across processes
+        a lock key lets one worker compute while the others wait for its
+        result. `compute` must return JSON-serializable data; `tags` may be
+        a function of the computed value.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._compute_once(key, compute, ttl, tags)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters get it; don't warn when there are none
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _compute_once(self, key, compute, ttl, tags):
+        lock_key = self._key(f"{key}:lock")
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            if await self._call(self.backend.add, lock_key, uuid.uuid4().bytes, self.lock_ttl, default=True):
+                try:
+                    self.computes += 1
+                    value = await compute()
+                    await self.set(key, value, ttl, tags(value) if callable(tags) else tags)
+                    return value
+                finally:
+                    await self._call(self.backend.delete, lock_key)
+
+            # another worker is computing it
+            await asyncio.sleep(self.poll_interval)
+            raw = await self._call(self.backend.get, self._key(key))
+            if raw is not None:
+                self.hits += 1
+                return json.loads(raw)
+            if time.monotonic() >= deadline:
+                self.computes += 1
+                return await compute()
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "computes": self.computes,
+            "errors": self.errors,
+            **self.backend.stats(),
+        }
+
+
+shared_cache = SharedCache(create_cache_backend(os.getenv("CACHE_URL", "memory://")))
+
+
+_PENDING_TAGS = "shared_cache_pending_tags"
+
+
+def invalidate_tags_on_commit(db: Session, *tags: str) -> None:
+    """
+    Invalidate `tags` once `db` commits (dropped on rollback). Invalidating
+    before the commit would let a concurrent read re-cache the old rows.
+    """
+    db.info.setdefault(_PENDING_TAGS, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_tags(session: Session) -> None:
+    tags = session.info.pop(_PENDING_TAGS, None)
+    if not tags:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None and shared_cache.backend.blocking:
+        # an AsyncSession committed on the event loop: do the network I/O in a
+        # thread rather than stall every other request until it returns
+        loop.run_in_executor(None, shared_cache.invalidate_tags, *tags)
+    else:
+        shared_cache.invalidate_tags(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_tags(session: Session) -> None:
+    session.info.pop(_PENDING_TAGS, None)
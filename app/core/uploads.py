@@ -0,0 +1,163 @@
+"""
+Streaming multipart uploads.
+
+FastAPI's File() parameters make Starlette read and spool the whole request
+body before the endpoint runs. read_upload() instead parses request.stream()
+as it arrives and writes the wanted file part straight to a temporary file,
+giving up with 413 as soon as the part grows past the caller's limit (or
+before reading anything when Content-Length already exceeds it). Disk
+writes go through the threadpool so the event loop never blocks on them.
+"""
+import os
+import tempfile
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request, status
+from python_multipart import MultipartParser
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+# room for boundaries, part headers and small form fields around the file
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+@dataclass
+class Upload:
+    path: str  # temporary file; the caller moves or deletes it
+    filename: str | None
+    content_type: str | None
+    size: int
+
+
+def upload_openapi(field: str = "file") -> dict:
+    """openapi_extra for endpoints that call read_upload, so docs still show the file field."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": [field],
+                        "properties": {field: {"type": "string", "format": "binary"}},
+                    }
+                }
+            },
+        }
+    }
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"File too large (max {max_bytes // 1024} KB)",
+    )
+
+
+class _PartCollector:
+    """MultipartParser callbacks that keep the bytes of one named file part."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.header_name = b""
+        self.header_value = b""
+        self.headers: dict[bytes, bytes] = {}
+        self.capturing = False
+        self.found: tuple[str | None, str | None] | None = None
+        self.pending: list[bytes] = []
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": lambda data, start, end: self._add(data[start:end], value=False),
+            "on_header_value": lambda data, start, end: self._add(data[start:end], value=True),
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def _add(self, chunk: bytes, value: bool) -> None:
+        if value:
+            self.header_value += chunk
+        else:
+            self.header_name += chunk
+
+    def on_part_begin(self) -> None:
+        self.headers = {}
+
+    def on_header_end(self) -> None:
+        self.headers[self.header_name.lower()] = self.header_value
+        self.header_name = self.header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self.headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        self.capturing = self.found is None and name == self.field and b"filename" in options
+        if self.capturing:
+            filename = options[b"filename"].decode("utf-8", "replace")
+            content_type = self.headers.get(b"content-type", b"").decode("latin-1") or None
+            self.found = (filename, content_type)
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self.capturing:
+            self.pending.append(data[start:end])
+
+    def on_part_end(self) -> None:
+        self.capturing = False
+
+
+async def read_upload(request: Request, max_bytes: int, field: str = "file", directory: str | None = None) -> Upload:
+    """
+    Stream the `field` file part of a multipart request to a temporary file
+    in `directory` (same filesystem as the final location keeps os.replace
+    atomic). Raises 413 past `max_bytes` and 400 for malformed bodies.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected multipart/form-data")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD:
+        raise _too_large(max_bytes)
+
+    if directory:
+        await run_in_threadpool(os.makedirs, directory, exist_ok=True)
+    fd, path = await run_in_threadpool(tempfile.mkstemp, ".upload", None, directory)
+    out_file = os.fdopen(fd, "wb")
+    collector = _PartCollector(field)
+    parser = MultipartParser(params[b"boundary"], collector.callbacks())
+    size = 0
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if collector.pending:
+                data = b"".join(collector.pending)
+                collector.pending.clear()
+                size += len(data)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                await run_in_threadpool(out_file.write, data)
+        parser.finalize()
+        await run_in_threadpool(out_file.close)
+    except MultipartParseError:
+        await run_in_threadpool(_discard, out_file, path)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed multipart body")
+    except BaseException:
+        await run_in_threadpool(_discard, out_file, path)
+        raise
+
+    if collector.found is None:
+        await run_in_threadpool(_discard, out_file, path)
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=f"Missing file field '{field}'")
+    filename, part_type = collector.found
+    return Upload(path=path, filename=filename, content_type=part_type, size=size)
+
+
+def _discard(out_file, path: str) -> None:
+    out_file.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
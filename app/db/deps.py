@@ -1,4 +1,5 @@
-from .session import SessionLocal
+from .async_session import AsyncReadSessionLocal, AsyncSessionLocal
+from .session import ReadSessionLocal, SessionLocal
 
 def get_db():
     db = SessionLocal()
@@ -6,3 +7,23 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Session on the read replica (or the primary when none is configured)."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """AsyncSession on the read replica (or the primary when none is configured)."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
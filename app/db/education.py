@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Float, Date, ForeignKey
+from sqlalchemy import String, Integer, Float, Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -9,9 +9,14 @@ from sqlalchemy import Column, String, DateTime
 
 class EducationEntry(Base):
     __tablename__ = "education_entries"
+    __table_args__ = (
+        # a user's entries, or the verified entries of a set of users
+        # (scores, people lists)
+        Index("ix_education_entries_user_status", "user_id", "verification_status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     degree_type: Mapped[str] = mapped_column(String(20), nullable=False)  # bachelor/master/phd
     university_name: Mapped[str] = mapped_column(String(255), nullable=False)
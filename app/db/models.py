@@ -17,6 +17,9 @@ from app.db.user_course import UserCourse  # noqa: F401
 from app.db.contact_method import ContactMethod  # noqa: F401
 from app.db.contact_request import ContactRequest  # noqa: F401
 from app.db.inbox_item import InboxItem  # noqa: F401
+from app.db.user_score import UserScore  # noqa: F401
+from app.db.score_histogram import ScoreHistogram  # noqa: F401
+from app.db.job import Job  # noqa: F401
 from sqlalchemy import String
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -7,6 +7,11 @@ from app.db.base import Base
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # keyset pagination: global timeline and per-author timelines
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_user_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
@@ -15,3 +20,7 @@ class Post(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), nullable=False, index=True
     )
+    # maintained by app.services.carets; reconcile_caret_counts repairs drift
+    caret_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
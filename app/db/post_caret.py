@@ -7,7 +7,9 @@ from app.db.base import Base
 
 class PostCaret(Base):
     __tablename__ = "post_carets"
-    __table_args__ = (UniqueConstraint("post_id", "user_id", name="uq_post_caret"),)
+    __table_args__ = (
+        UniqueConstraint("post_id", "user_id", name="uq_post_caret"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     post_id: Mapped[int] = mapped_column(ForeignKey("posts.id"), index=True, nullable=False)
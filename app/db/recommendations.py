@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Text
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 
@@ -7,6 +7,15 @@ from app.db.base import Base
 
 class Recommendation(Base):
     __tablename__ = "recommendations"
+    __table_args__ = (
+        # recommender -> requesters dependency lookups (score propagation)
+        # and the recommender's pending queue, newest first
+        Index("ix_recommendations_recommender_status_created_at", "recommender_id", "status", "created_at"),
+        # approved recommendations received (scores, public profiles)
+        Index("ix_recommendations_requester_status", "requester_id", "status"),
+        # activity feed: approved recommendations, newest first
+        Index("ix_recommendations_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
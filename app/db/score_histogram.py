@@ -0,0 +1,13 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ScoreHistogram(Base):
+    __tablename__ = "score_histograms"
+
+    # "achievement" | "recommendation"
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    score: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
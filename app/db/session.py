@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import os
@@ -6,11 +7,67 @@ import os
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional read replica for GET-heavy routers; falls back to the primary.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
 
-engine = create_engine(DATABASE_URL, echo=True)
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    return int(raw) if raw not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def engine_options(url: str) -> dict:
+    """
+    Engine keyword arguments read from the environment:
+      DB_ECHO (default off), DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+      DB_POOL_RECYCLE (seconds), DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = parsed.get_driver_name()
+    kwargs = {
+        "echo": _env_bool("DB_ECHO", False),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+
+    if backend != "sqlite":
+        kwargs["pool_size"] = _env_int("DB_POOL_SIZE", 5)
+        kwargs["max_overflow"] = _env_int("DB_MAX_OVERFLOW", 10)
+        kwargs["pool_timeout"] = _env_int("DB_POOL_TIMEOUT", 30)
+        kwargs["pool_recycle"] = _env_int("DB_POOL_RECYCLE", 1800)
+
+    statement_timeout_ms = _env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+    if backend == "postgresql" and statement_timeout_ms > 0:
+        if driver == "asyncpg":
+            kwargs["connect_args"] = {"server_settings": {"statement_timeout": str(statement_timeout_ms)}}
+        else:
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={statement_timeout_ms}"}
+
+    return kwargs
+
+
+def create_db_engine(url: str) -> Engine:
+    return create_engine(url, **engine_options(url))
+
+
+engine = create_db_engine(DATABASE_URL)
+read_engine = create_db_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
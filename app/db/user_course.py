@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -9,6 +9,10 @@ from app.db.base import Base
 
 class UserCourse(Base):
     __tablename__ = "user_courses"
+    __table_args__ = (
+        # course search: one group per catalog key, newest takers first
+        Index("ix_user_courses_key_created_at_id", "course_key", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -16,6 +20,8 @@ class UserCourse(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
     course_name: Mapped[str] = mapped_column(Text, nullable=False)
     course_number: Mapped[str] = mapped_column(String(50), nullable=False)
+    # normalize_course_number(course_number); the grouping key for search
+    course_key: Mapped[str] = mapped_column(String(50), nullable=False)
     professor: Mapped[str | None] = mapped_column(Text, nullable=True)
     grade: Mapped[str] = mapped_column(String(20), nullable=False)
     program_level: Mapped[str] = mapped_column(String(20), nullable=False)
@@ -1,9 +1,13 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from app.db.base import Base
 
 class VerificationRequest(Base):
     __tablename__ = "verification_requests"
+    __table_args__ = (
+        # admin review queue: one status, newest first
+        Index("ix_verification_requests_status_created_at", "status", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Date, Boolean, ForeignKey
+from sqlalchemy import String, Integer, Date, Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 from sqlalchemy import Column, String, DateTime
@@ -6,9 +6,14 @@ from datetime import datetime
 
 class WorkExperience(Base):
     __tablename__ = "work_experiences"
+    __table_args__ = (
+        # a user's entries, or the verified entries of a set of users
+        # (scores, public profiles)
+        Index("ix_work_experiences_user_status", "user_id", "verification_status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
     company_name: Mapped[str] = mapped_column(String(255), nullable=False)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
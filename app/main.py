@@ -17,6 +17,8 @@ from app.api.auth import router as auth_router
 from app.api.public_profiles import router as public_profiles_router
 from app.api.admin_verifications import router as admin_verifications_router
 from app.api.admin_auth import router as admin_auth_router
+from app.api.admin_cache import router as admin_cache_router
+from app.api.media import router as media_router
 from app.api.feed import router as feed_router
 from app.api.leaderboard import router as leaderboard_router
 from app.api.reflections import router as reflections_router
@@ -26,6 +28,9 @@ from app.api.contact_methods import router as contact_methods_router
 from app.api.contact_requests import router as contact_requests_router
 from app.api.inbox import router as inbox_router, posts_router as inbox_posts_router
 from app.api.post_replies import router as post_replies_router
+from app.api.metrics import router as metrics_router
+from app.core.metrics import MetricsMiddleware
+from app.core.query_profiler import QueryProfilerMiddleware, profiler_enabled
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
@@ -54,6 +59,7 @@ app.include_router(auth_router)
 app.include_router(public_profiles_router)
 app.include_router(admin_verifications_router)
 app.include_router(admin_auth_router)
+app.include_router(admin_cache_router)
 app.include_router(feed_router)
 app.include_router(leaderboard_router)
 app.include_router(reflections_router)
@@ -64,6 +70,13 @@ app.include_router(contact_requests_router)
 app.include_router(inbox_router)
 app.include_router(inbox_posts_router)
 app.include_router(post_replies_router)
+# before the /media mount so blob URLs get immutable caching
+app.include_router(media_router)
+app.include_router(metrics_router)
+# inside the profiler so it can read each request's query count
+app.add_middleware(MetricsMiddleware)
+if profiler_enabled():
+    app.add_middleware(QueryProfilerMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -75,6 +88,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
 media_dir = os.path.join(os.getcwd(), "uploads")
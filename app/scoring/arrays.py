@@ -0,0 +1,29 @@
+import numpy as np
+
+
+def normalize_labels(values) -> np.ndarray:
+    """Same normalization the scalar scorers apply: (v or "").strip().lower()."""
+    return np.array([(v or "").strip().lower() for v in values], dtype=object)
+
+
+def lookup(labels: np.ndarray, table: dict, default: int) -> np.ndarray:
+    """Map each label through `table`, resolving every distinct label only once."""
+    if labels.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    uniq, inverse = np.unique(labels.astype(str), return_inverse=True)
+    mapped = np.array([table.get(u, default) for u in uniq], dtype=np.int64)
+    return mapped[inverse]
+
+
+def to_months(values) -> np.ndarray:
+    """Dates (None allowed) -> datetime64[M]; None becomes NaT."""
+    return np.array(values, dtype="datetime64[D]").astype("datetime64[M]")
+
+
+def sum_by_user(user_ids, points: np.ndarray) -> dict[int, int]:
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    if user_ids.size == 0:
+        return {}
+    uniq, inverse = np.unique(user_ids, return_inverse=True)
+    sums = np.bincount(inverse, weights=points, minlength=uniq.size)
+    return {int(u): int(s) for u, s in zip(uniq, sums)}
@@ -1,3 +1,8 @@
+import numpy as np
+
+from app.scoring.arrays import lookup, normalize_labels, sum_by_user
+
+
 def university_base_score(tier: int) -> int:
     return {1: 60, 2: 50, 3: 40, 4: 30, 5: 20}.get(tier, 0)
 
@@ -42,3 +47,35 @@ def score_education_entry(university_tier: int, degree_type: str, is_completed:
             "gpa_bonus": gpa_pts,
         },
     }
+
+
+# ---- Columnar (batch) scoring ----
+# Same rules as above expressed as lookup tables, for rescoring many rows at once.
+
+UNIVERSITY_BASE_BY_TIER = np.array([0, 60, 50, 40, 30, 20], dtype=np.int64)  # index = tier
+DEGREE_BONUS = {"bachelor": 0, "master": 10, "phd": 20}
+PHD_INCOMPLETE_BONUS = 10
+GPA_THRESHOLDS = np.array([3.0, 3.3, 3.5, 3.7, 3.9])
+GPA_POINTS = np.array([0, 2, 4, 6, 8, 10], dtype=np.int64)
+
+
+def score_education_batch(user_ids, university_tier, degree_type, is_completed, gpa):
+    """
+    Columnar equivalent of score_education_entry.
+    Returns (per-row points, {user_id: summed points}).
+    """
+    tier = np.asarray(university_tier, dtype=np.int64)
+    valid_tier = (tier >= 1) & (tier < UNIVERSITY_BASE_BY_TIER.size)
+    uni = np.where(valid_tier, UNIVERSITY_BASE_BY_TIER[np.where(valid_tier, tier, 0)], 0)
+
+    degrees = normalize_labels(degree_type)
+    completed = np.asarray(is_completed, dtype=bool)
+    deg = lookup(degrees, DEGREE_BONUS, 0)
+    deg = np.where((degrees == "phd") & ~completed, PHD_INCOMPLETE_BONUS, deg)
+
+    gpa_arr = np.array([np.nan if g is None else g for g in gpa], dtype=np.float64)
+    gpa_idx = np.searchsorted(GPA_THRESHOLDS, np.nan_to_num(gpa_arr, nan=-np.inf), side="right")
+    gpa_pts = np.where(np.isnan(gpa_arr), 0, GPA_POINTS[gpa_idx])
+
+    points = (uni + deg + gpa_pts).astype(np.int64)
+    return points, sum_by_user(user_ids, points)
@@ -1,5 +1,9 @@
 from datetime import date
 
+import numpy as np
+
+from app.scoring.arrays import lookup, normalize_labels, sum_by_user, to_months
+
 
 def months_between(start: date, end: date) -> int:
     # full months approximation: good enough for MVP
@@ -44,3 +48,35 @@ def score_work_entry(employment_type: str, start_date: date, end_date: date):
             "duration_bonus": d,
         },
     }
+
+
+# ---- Columnar (batch) scoring ----
+
+BASE_POINTS = {"internship": 10, "full_time": 20, "part_time": 12, "contract": 14}
+UNKNOWN_TYPE_POINTS = 8
+DURATION_THRESHOLDS = np.array([6, 12, 24, 36])
+DURATION_POINTS = np.array([0, 5, 12, 20, 30], dtype=np.int64)
+
+
+def resolve_end_months(end_date, is_current, today: date | None = None) -> np.ndarray:
+    """End month per row; current or open-ended rows run until today."""
+    end = to_months(end_date)
+    current = np.asarray(is_current, dtype=bool)
+    today_m = np.datetime64(today or date.today(), "M")
+    return np.where(current | np.isnat(end), today_m, end)
+
+
+def score_work_batch(user_ids, employment_type, start_date, end_date, is_current, today: date | None = None):
+    """
+    Columnar equivalent of score_work_entry (with the callers' end-date
+    handling). Returns (per-row points, {user_id: summed points}).
+    """
+    base = lookup(normalize_labels(employment_type), BASE_POINTS, UNKNOWN_TYPE_POINTS)
+
+    start = to_months(start_date)
+    end = resolve_end_months(end_date, is_current, today)
+    months = np.maximum(0, (end - start).astype(np.int64))
+    duration = DURATION_POINTS[np.searchsorted(DURATION_THRESHOLDS, months, side="right")]
+
+    points = (base + duration).astype(np.int64)
+    return points, sum_by_user(user_ids, points)
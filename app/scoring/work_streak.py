@@ -1,6 +1,10 @@
 from datetime import date
 from collections import defaultdict
 
+import numpy as np
+
+from app.scoring.arrays import sum_by_user
+
 
 def months_between(start: date, end: date) -> int:
     """
@@ -65,3 +69,39 @@ def compute_company_streaks(work_entries):
 
     breakdown.sort(key=lambda x: x["streak_bonus"], reverse=True)
     return total, breakdown
+
+
+def compute_company_streaks_batch(user_ids, company_name, start_date, end_date, is_current, today: date | None = None):
+    """
+    Columnar equivalent of compute_company_streaks for many users at once.
+    Returns {user_id: streak_total}.
+    """
+    users = np.asarray(user_ids, dtype=np.int64)
+    if users.size == 0:
+        return {}
+
+    today = today or date.today()
+    start = np.array(start_date, dtype="datetime64[D]")
+    end = np.array(end_date, dtype="datetime64[D]")
+    end = np.where(np.asarray(is_current, dtype=bool) | np.isnat(end), np.datetime64(today, "D"), end)
+
+    has_start = ~np.isnat(start)
+    month_diff = (end.astype("datetime64[M]") - start.astype("datetime64[M]")).astype(np.int64)
+    months = np.where(has_start & (end > start), month_diff, 0)
+
+    companies = np.array(
+        [(c or "").strip().lower() or "unknown" for c in company_name], dtype=object
+    ).astype(str)
+    _, company_idx = np.unique(companies, return_inverse=True)
+    uniq_users, user_idx = np.unique(users, return_inverse=True)
+
+    # one bucket per (user, company) pair; rows without a start date are skipped
+    n_companies = int(company_idx.max()) + 1
+    pair_keys = user_idx.astype(np.int64) * n_companies + company_idx
+    pairs, pair_idx = np.unique(pair_keys[has_start], return_inverse=True)
+    pair_months = np.bincount(pair_idx, weights=months[has_start], minlength=pairs.size).astype(np.int64)
+    pair_bonus = (pair_months // 12) * 3
+
+    totals = {int(u): 0 for u in uniq_users}
+    totals.update(sum_by_user(uniq_users[pairs // n_companies], pair_bonus))
+    return totals
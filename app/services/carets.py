@@ -0,0 +1,87 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.post import Post
+from app.db.post_caret import PostCaret
+from app.db.user_score import UserScore
+from app.services.user_scores import adjust_caret_total
+
+
+def toggle_caret(db: Session, post: Post, user_id: int) -> tuple[bool, int]:
+    """
+    Give or take back `user_id`'s caret on `post`. The post's caret_count and
+    the author's caret_total move by one with in-place UPDATEs, so concurrent
+    toggles never lose a count. Returns (has_caret, new caret_count).
+    """
+    existing = (
+        db.query(PostCaret)
+        .filter(PostCaret.post_id == post.id, PostCaret.user_id == user_id)
+        .first()
+    )
+    if existing:
+        db.delete(existing)
+        delta = -1
+    else:
+        db.add(PostCaret(post_id=post.id, user_id=user_id))
+        delta = 1
+    db.flush()
+
+    caret_count = db.execute(
+        update(Post)
+        .where(Post.id == post.id)
+        .values(caret_count=Post.caret_count + delta)
+        .returning(Post.caret_count)
+    ).scalar_one()
+    adjust_caret_total(db, post.user_id, delta)
+    return delta > 0, caret_count
+
+
+def remove_post_carets(db: Session, post: Post) -> None:
+    """Drop a post's carets and take them off its author's total."""
+    removed = db.query(PostCaret).filter(PostCaret.post_id == post.id).delete()
+    adjust_caret_total(db, post.user_id, -removed)
+
+
+def reconcile_caret_counts(db: Session) -> int:
+    """
+    Repair job: recount posts.caret_count from post_carets, then
+    user_scores.caret_total from the post counters. Only rows that drifted
+    are written. Returns the number of rows fixed.
+    """
+    actual_post = (
+        select(func.count(PostCaret.id))
+        .where(PostCaret.post_id == Post.id)
+        .scalar_subquery()
+    )
+    fixed = db.execute(
+        update(Post)
+        .where(Post.caret_count != actual_post)
+        .values(caret_count=actual_post)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    actual_user = (
+        select(func.coalesce(func.sum(Post.caret_count), 0))
+        .where(Post.user_id == UserScore.user_id)
+        .scalar_subquery()
+    )
+    fixed += db.execute(
+        update(UserScore)
+        .where(UserScore.caret_total != actual_user)
+        .values(caret_total=actual_user)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    db.commit()
+    return fixed
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        count = reconcile_caret_counts(session)
+        print(f"Reconciled {count} caret counters")
+    finally:
+        session.close()
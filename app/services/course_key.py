@@ -0,0 +1,16 @@
+import re
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_course_number(raw: str) -> str:
+    """
+    Catalog key for a course number, so spellings of the same course group
+    together:
+      - 'CAP 5610'
+      - 'cap5610'
+      - '  Cap  5610 '
+
+    all become 'CAP5610'.
+    """
+    return _SPACE_RE.sub("", raw or "").upper()
@@ -0,0 +1,101 @@
+"""
+Job kinds run by the background worker, and the helpers request handlers
+use to enqueue them.
+"""
+from datetime import date
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.db.inbox_item import InboxItem
+from app.db.recommendations import Recommendation
+from app.db.work_experience import WorkExperience
+from app.services.jobs import enqueue, job_handler
+from app.services.user_scores import apply_approved_recommendation, refresh_achievement_score
+
+ACHIEVEMENT_SCORE = "scores.achievement"
+RECOMMENDATION_SCORE = "scores.recommendation"
+OPEN_WORK_RESCORE = "scores.open_work_rescore"
+INBOX_WRITE = "inbox.write"
+
+
+def enqueue_achievement_refresh(db: Session, user_id: int, idempotency_key: str | None = None) -> None:
+    enqueue(db, ACHIEVEMENT_SCORE, {"user_id": user_id}, idempotency_key)
+
+
+def enqueue_open_work_rescore(db: Session, day: date | None = None) -> None:
+    """
+    Once per day (the idempotency key is the date): rescore every user with
+    current or open-ended verified work. Those entries are scored up to
+    today, so their totals grow without any entry changing. The worker
+    enqueues this on a timer; it is cheap to call more often.
+    """
+    day = (day or date.today()).isoformat()
+    enqueue(db, OPEN_WORK_RESCORE, {"day": day}, f"{OPEN_WORK_RESCORE}:{day}")
+
+
+def enqueue_recommendation_score(db: Session, recommendation_id: int) -> None:
+    enqueue(
+        db,
+        RECOMMENDATION_SCORE,
+        {"recommendation_id": recommendation_id},
+        f"{RECOMMENDATION_SCORE}:{recommendation_id}",
+    )
+
+
+def enqueue_inbox_item(
+    db: Session,
+    idempotency_key: str,
+    user_id: int,
+    type: str,
+    payload: dict,
+    status: str | None = None,
+) -> None:
+    enqueue(
+        db,
+        INBOX_WRITE,
+        {"user_id": user_id, "type": type, "status": status, "payload": payload},
+        f"{INBOX_WRITE}:{idempotency_key}",
+    )
+
+
+@job_handler(ACHIEVEMENT_SCORE)
+def _refresh_achievement(db: Session, payload: dict) -> None:
+    refresh_achievement_score(db, payload["user_id"])
+
+
+@job_handler(OPEN_WORK_RESCORE)
+def _rescore_open_work(db: Session, payload: dict) -> None:
+    # one job per user, so a failure only retries that user
+    user_ids = (
+        db.query(WorkExperience.user_id)
+        .filter(WorkExperience.verification_status == "VERIFIED")
+        .filter(or_(WorkExperience.is_current.is_(True), WorkExperience.end_date.is_(None)))
+        .distinct()
+        .order_by(WorkExperience.user_id)
+    )
+    for (user_id,) in user_ids:
+        enqueue_achievement_refresh(db, user_id, f"{OPEN_WORK_RESCORE}:{payload['day']}:{user_id}")
+
+
+@job_handler(RECOMMENDATION_SCORE)
+def _apply_recommendation(db: Session, payload: dict) -> None:
+    # incremental, so it relies on running once: the idempotency key stops
+    # double enqueues, and the points only commit together with the job's
+    # DONE while this worker still holds the job
+    rec = db.get(Recommendation, payload["recommendation_id"])
+    if rec is None or rec.status != "APPROVED":
+        return
+    apply_approved_recommendation(db, rec)
+
+
+@job_handler(INBOX_WRITE)
+def _write_inbox_item(db: Session, payload: dict) -> None:
+    item = InboxItem(
+        user_id=payload["user_id"],
+        type=payload["type"],
+        payload_json=payload["payload"],
+    )
+    if payload.get("status"):
+        item.status = payload["status"]
+    db.add(item)
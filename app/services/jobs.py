@@ -0,0 +1,238 @@
+"""
+Background jobs.
+
+Request handlers call `enqueue(db, kind, payload)`; the row is written in
+the caller's transaction, so a job exists exactly when the request commits.
+Workers (`python -m app.worker`) claim due jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never take the same
+row, then run the registered handler and commit its writes together with the
+job's DONE status, provided the worker still holds the job (a stale job may
+have been requeued and claimed by another worker meanwhile). Failed jobs are retried with exponential backoff until
+max_attempts, then left FAILED for inspection.
+
+With JOBS_INLINE=1, the jobs a session enqueued run in-process right after
+it commits instead, in a thread when the session is async (local
+development without a worker).
+"""
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import event, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.job import Job
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 15 * 60
+# RUNNING jobs locked longer than this are assumed to belong to a dead worker
+LOCK_TIMEOUT_SECONDS = int(os.getenv("JOBS_LOCK_TIMEOUT", "900"))
+
+JobHandler = Callable[[Session, dict], None]
+HANDLERS: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str):
+    """Register `fn(db, payload)` as the handler for `kind`. It must not commit."""
+    def register(fn: JobHandler) -> JobHandler:
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def jobs_inline() -> bool:
+    return os.getenv("JOBS_INLINE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict,
+    idempotency_key: str | None = None,
+    delay: float = 0,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> None:
+    """
+    Add a job to the caller's transaction. A job with the same
+    `idempotency_key` is only ever enqueued once.
+    """
+    values = {
+        "kind": kind,
+        "payload": payload,
+        "idempotency_key": idempotency_key,
+        "status": QUEUED,
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_at": datetime.utcnow() + timedelta(seconds=delay),
+    }
+    dialect = db.get_bind().dialect.name
+    if idempotency_key is not None and dialect in ("postgresql", "sqlite"):
+        upsert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = upsert(Job).values(**values).on_conflict_do_nothing(index_elements=["idempotency_key"])
+    else:
+        stmt = insert(Job).values(**values)
+    if db.get_bind().dialect.insert_returning:
+        # None when the idempotency key was already taken
+        job_id = db.execute(stmt.returning(Job.id)).scalar_one_or_none()
+        if job_id is not None:
+            db.info.setdefault(_ENQUEUED, []).append(job_id)
+    else:
+        db.execute(stmt)
+
+
+def backoff_seconds(attempt: int) -> float:
+    """Delay before retry number `attempt` (1-based): exponential, capped, jittered."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def claim_jobs(
+    db: Session, worker_id: str, limit: int = 10, job_ids: list[int] | None = None
+) -> list[int]:
+    """
+    Mark up to `limit` due jobs (only among `job_ids`, if given) RUNNING for
+    `worker_id` and return their ids.
+    """
+    now = datetime.utcnow()
+    query = db.query(Job).filter(Job.status == QUEUED, Job.run_at <= now)
+    if job_ids is not None:
+        query = query.filter(Job.id.in_(job_ids))
+    jobs = (
+        query
+        .order_by(Job.run_at.asc(), Job.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for job in jobs:
+        job.status = RUNNING
+        job.locked_at = now
+        job.locked_by = worker_id
+        job.attempts += 1
+    db.commit()
+    return [job.id for job in jobs]
+
+
+def _lock_if_owned(db: Session, job_id: int, worker_id: str) -> Job | None:
+    """
+    Re-read the job row FOR UPDATE; None when `worker_id` no longer holds it
+    (requeue_stale_jobs gave it to another worker while this one ran).
+    """
+    job = db.get(Job, job_id, with_for_update=True, populate_existing=True)
+    if job is None or job.status != RUNNING or job.locked_by != worker_id:
+        logger.warning("job %s was taken from %s while it ran; dropping its writes", job_id, worker_id)
+        db.rollback()
+        return None
+    return job
+
+
+def run_job(db: Session, job_id: int, worker_id: str) -> bool:
+    """Run one job claimed by `worker_id`. Returns whether it succeeded."""
+    job = db.get(Job, job_id)
+    kind = job.kind
+    try:
+        handler = HANDLERS.get(kind)
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind {kind!r}")
+        handler(db, job.payload)
+        job = _lock_if_owned(db, job_id, worker_id)
+        if job is None:
+            return False
+        job.status = DONE
+        job.finished_at = datetime.utcnow()
+        job.last_error = None
+        db.commit()
+        return True
+    except Exception as exc:
+        db.rollback()
+        logger.exception("job %s (%s) failed", job_id, kind)
+        job = _lock_if_owned(db, job_id, worker_id)
+        if job is None:
+            return False
+        job.last_error = f"{type(exc).__name__}: {exc}"
+        job.locked_at = None
+        job.locked_by = None
+        if job.attempts >= job.max_attempts:
+            job.status = FAILED
+            job.finished_at = datetime.utcnow()
+        else:
+            job.status = QUEUED
+            job.run_at = datetime.utcnow() + timedelta(seconds=backoff_seconds(job.attempts))
+        db.commit()
+        return False
+
+
+def requeue_stale_jobs(db: Session, timeout: float = LOCK_TIMEOUT_SECONDS) -> int:
+    """Put RUNNING jobs whose worker stopped reporting back into the queue."""
+    cutoff = datetime.utcnow() - timedelta(seconds=timeout)
+    count = (
+        db.query(Job)
+        .filter(Job.status == RUNNING, Job.locked_at < cutoff)
+        .update(
+            {Job.status: QUEUED, Job.locked_at: None, Job.locked_by: None},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return count
+
+
+def run_pending(
+    session_factory: sessionmaker,
+    worker_id: str,
+    batch_size: int = 10,
+    job_ids: list[int] | None = None,
+) -> int:
+    """Claim and run one batch of due jobs (among `job_ids`, if given). Returns how many were claimed."""
+    db = session_factory()
+    try:
+        claimed = claim_jobs(db, worker_id, batch_size, job_ids)
+        for job_id in claimed:
+            run_job(db, job_id, worker_id)
+        return len(claimed)
+    finally:
+        db.close()
+
+
+_ENQUEUED = "jobs_enqueued"
+
+
+def _run_jobs_inline(job_ids: list[int]) -> None:
+    from app.db.session import SessionLocal
+
+    run_pending(SessionLocal, f"inline:{os.getpid()}", len(job_ids), job_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_inline(session: Session) -> None:
+    # only this session's jobs; the rest of the queue is a worker's business
+    job_ids = session.info.pop(_ENQUEUED, None)
+    if not job_ids or not jobs_inline():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        # an AsyncSession committed on the event loop
+        loop.run_in_executor(None, _run_jobs_inline, job_ids)
+    else:
+        _run_jobs_inline(job_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_inline(session: Session) -> None:
+    session.info.pop(_ENQUEUED, None)
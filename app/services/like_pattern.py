@@ -0,0 +1,13 @@
+"""LIKE/ILIKE patterns built from user input."""
+
+# pass as `escape=` alongside patterns built with like_escape()
+LIKE_ESCAPE = "/"
+
+
+def like_escape(text: str) -> str:
+    """`text` with LIKE wildcards (and the escape character) matched literally."""
+    return (
+        text.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", f"{LIKE_ESCAPE}%")
+        .replace("_", f"{LIKE_ESCAPE}_")
+    )
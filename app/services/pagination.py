@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, *rest) -> str:
+    """Opaque token for the last row of a page: (created_at, ...tie-breakers)."""
+    raw = json.dumps([created_at.isoformat(), *rest], default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _tie_breaker(value, kind: type):
+    # JSON gives back ints and strings; anything else (UUID) is parsed from a string
+    if kind in (int, str):
+        if type(value) is not kind:
+            raise TypeError
+        return value
+    if not isinstance(value, str):
+        raise TypeError
+    return kind(value)
+
+
+def decode_cursor(cursor: str, *types: type) -> list:
+    """
+    (created_at, ...tie-breakers) from `encode_cursor`, each tie-breaker
+    checked against (or parsed as) the matching entry of `types`, e.g.
+    decode_cursor(cursor, int). A malformed cursor is a 400, never a value
+    that reaches the database.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types) + 1:
+            raise ValueError
+        return [
+            datetime.fromisoformat(values[0]),
+            *(_tie_breaker(value, kind) for value, kind in zip(values[1:], types)),
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def before(columns, values):
+    """
+    Keyset predicate for a page ordered by `columns` descending: rows that
+    sort strictly after the cursor row.
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        equal_prefix = [c == v for c, v in zip(columns[:i], values[:i])]
+        clauses.append(and_(*equal_prefix, column < value))
+    return or_(*clauses)
+
+
+def split_page(rows: list, limit: int, cursor_for) -> tuple[list, str | None]:
+    """Trim a limit+1 fetch to `limit` rows; the cursor is None on the last page."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, cursor_for(rows[-1])
+    return rows, None
+
+
+def take_page(rows: list, limit: int, response: Response, cursor_for) -> list:
+    """
+    Trim a limit+1 fetch to `limit` rows and, when more remain, put the
+    cursor for the next page in the X-Next-Cursor header.
+    """
+    rows, next_cursor = split_page(rows, limit, cursor_for)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
@@ -0,0 +1,168 @@
+"""
+Profile photo processing.
+
+An upload is decoded once, rotated according to its EXIF orientation,
+cropped to a centered square and re-encoded at every size in VARIANT_SIZES
+as WebP plus a JPEG fallback. Re-encoding drops all metadata (EXIF, GPS,
+embedded text). Each variant is stored in the content-addressed media store,
+so its URL is immutable; blobs no profile references any more are removed
+by collect_unreferenced_blobs (python -m app.services.photos).
+
+Rendering and storing are CPU-bound and blocking; async callers run them
+in a threadpool.
+"""
+import io
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.media_storage import MediaStorage, blob_key_from_url, blob_url, content_key, media_storage
+from app.db.user_profile import UserProfile
+
+VARIANT_SIZES = (48, 128, 512)
+# list avatars render at <= 64 CSS px; 128 stays sharp on 2x screens
+AVATAR_SIZE = 128
+# the size stored in profile_photo_url for full profile views
+PROFILE_SIZE = 512
+
+ACCEPTED_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+# refuse images that would decode to more than this many pixels
+MAX_PIXELS = 40_000_000
+# blobs younger than this are kept even when unreferenced (upload not committed yet)
+GC_GRACE_PERIOD = timedelta(days=1)
+
+_ENCODERS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+_EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+@dataclass
+class PhotoVariant:
+    size: int
+    format: str  # "webp" | "jpeg"
+    key: str  # media store key
+    data: bytes
+
+
+def _decode(data: bytes) -> Image.Image:
+    try:
+        image = Image.open(io.BytesIO(data), formats=ACCEPTED_FORMATS)
+    except (UnidentifiedImageError, OSError) as exc:
+        raise InvalidImage("Unsupported or corrupt image") from exc
+    if image.width * image.height > MAX_PIXELS:
+        raise InvalidImage("Image dimensions too large")
+    try:
+        image.load()
+    except OSError as exc:
+        raise InvalidImage("Unsupported or corrupt image") from exc
+    return ImageOps.exif_transpose(image)
+
+
+def _square(image: Image.Image) -> Image.Image:
+    side = min(image.size)
+    return ImageOps.fit(image, (side, side), Image.Resampling.LANCZOS)
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """RGB copy with any transparency composited onto white (JPEG has no alpha)."""
+    if image.mode != "RGBA":
+        return image.convert("RGB")
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def render_variants(data: bytes) -> list[PhotoVariant]:
+    image = _decode(data)
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    square = _square(image.convert("RGBA" if has_alpha else "RGB"))
+
+    variants = []
+    for size in VARIANT_SIZES:
+        # never upscale: small uploads keep their own resolution
+        resized = square if size >= square.width else square.resize((size, size), Image.Resampling.LANCZOS)
+        for fmt, (encoder, options) in _ENCODERS.items():
+            frame = _flatten(resized) if fmt == "jpeg" else resized
+            out = io.BytesIO()
+            frame.save(out, format=encoder, **options)
+            encoded = out.getvalue()
+            variants.append(PhotoVariant(size, fmt, content_key(encoded, _EXTENSIONS[fmt]), encoded))
+    return variants
+
+
+def store_variants(variants: list[PhotoVariant], storage: MediaStorage = media_storage) -> None:
+    for variant in variants:
+        storage.put(variant.key, variant.data)
+
+
+def process_photo_file(path: str, storage: MediaStorage = media_storage) -> list[PhotoVariant]:
+    """Read an uploaded file, render its variants and put them in the media store."""
+    with open(path, "rb") as in_file:
+        data = in_file.read()
+    variants = render_variants(data)
+    store_variants(variants, storage)
+    return variants
+
+
+def variant_urls(variants: list[PhotoVariant]) -> dict[str, dict[str, str]]:
+    """{"48": {"webp": url, "jpeg": url}, ...} as stored in profile_photo_variants."""
+    urls: dict[str, dict[str, str]] = {}
+    for variant in variants:
+        urls.setdefault(str(variant.size), {})[variant.format] = blob_url(variant.key)
+    return urls
+
+
+def avatar_url(profile) -> str | None:
+    """Small photo for lists (posts, replies, inbox, search); falls back to the original."""
+    if profile is None:
+        return None
+    variants = getattr(profile, "profile_photo_variants", None) or {}
+    small = variants.get(str(AVATAR_SIZE)) or {}
+    return small.get("webp") or small.get("jpeg") or profile.profile_photo_url
+
+
+def referenced_blob_keys(db: Session) -> set[str]:
+    keys = set()
+    rows = (
+        db.query(UserProfile.profile_photo_url, UserProfile.profile_photo_variants)
+        .filter(or_(UserProfile.profile_photo_url.isnot(None), UserProfile.profile_photo_variants.isnot(None)))
+        .yield_per(1000)
+    )
+    for url, variants in rows:
+        urls = [url] + [u for formats in (variants or {}).values() for u in formats.values()]
+        keys.update(key for key in map(blob_key_from_url, urls) if key)
+    return keys
+
+
+def collect_unreferenced_blobs(
+    db: Session, storage: MediaStorage = media_storage, grace: timedelta = GC_GRACE_PERIOD
+) -> int:
+    """Delete stored blobs no profile points at (older than `grace`). Returns how many."""
+    referenced = referenced_blob_keys(db)
+    cutoff = datetime.utcnow() - grace
+    removed = 0
+    for key, stored_at in list(storage.iter_keys()):
+        if key not in referenced and stored_at < cutoff:
+            storage.delete(key)
+            removed += 1
+    return removed
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        count = collect_unreferenced_blobs(session)
+        print(f"Removed {count} unreferenced media blobs")
+    finally:
+        session.close()
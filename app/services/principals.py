@@ -0,0 +1,117 @@
+"""
+Lightweight identity for authenticated requests.
+
+Most endpoints only need the caller's id (and sometimes username/status),
+not a full User row. A Principal comes from, in order:
+  1. claims embedded in the token (only when JWT_EMBED_CLAIMS is on),
+  2. a short-TTL per-process cache of user_id -> Principal,
+  3. a single users lookup, which then fills the cache.
+
+Cached principals are dropped once a session that updated or deleted the
+user commits. Other workers only see the change when their entry expires,
+hence the short TTL. Embedded claims are only as fresh as the token (they
+are not re-read until it expires), so they stay opt-in.
+"""
+import os
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.db.models import User
+
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+PRINCIPAL_CACHE_SIZE = 4096
+
+# short claim names keep the token small
+USERNAME_CLAIM = "usr"
+STATUS_CLAIM = "sts"
+
+_principals = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    username: str | None
+    status: str
+
+
+def embed_claims() -> bool:
+    return os.getenv("JWT_EMBED_CLAIMS", "").lower() in {"1", "true", "yes"}
+
+
+def principal_claims(user: User) -> dict:
+    """Extra token claims for `user`; empty unless JWT_EMBED_CLAIMS is on."""
+    if not embed_claims():
+        return {}
+    return {USERNAME_CLAIM: user.username, STATUS_CLAIM: user.status}
+
+
+def principal_from_claims(user_id: int, claims: dict) -> Principal | None:
+    if STATUS_CLAIM not in claims:
+        return None
+    return Principal(id=user_id, username=claims.get(USERNAME_CLAIM), status=claims[STATUS_CLAIM])
+
+
+def principal_from_user(user: User) -> Principal:
+    return Principal(id=user.id, username=user.username, status=user.status)
+
+
+def cached_principal(user_id: int) -> Principal | None:
+    return _principals.get(user_id)
+
+
+def cache_principal(user: User) -> Principal:
+    principal = principal_from_user(user)
+    _principals.set(user.id, principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    _principals.delete(user_id)
+
+
+def resolve_principal(db: Session, user_id: int, claims: dict) -> Principal | None:
+    """Principal for a verified token's user; None if the user no longer exists."""
+    principal = principal_from_claims(user_id, claims) or cached_principal(user_id)
+    if principal is None:
+        user = db.get(User, user_id)
+        principal = cache_principal(user) if user else None
+    return principal
+
+
+async def resolve_principal_async(db: AsyncSession, user_id: int, claims: dict) -> Principal | None:
+    principal = principal_from_claims(user_id, claims) or cached_principal(user_id)
+    if principal is None:
+        user = await db.get(User, user_id)
+        principal = cache_principal(user) if user else None
+    return principal
+
+
+def principal_cache_stats() -> dict:
+    return _principals.stats()
+
+
+_PENDING = "principals_pending_invalidation"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target: User) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING, ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_PENDING, None)
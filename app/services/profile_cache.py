@@ -0,0 +1,51 @@
+import json
+import os
+from typing import Awaitable, Callable
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.core.cache import make_etag
+from app.core.shared_cache import invalidate_tags_on_commit, shared_cache
+
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "60"))
+
+ALL_PROFILES = "profiles"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def profile_entry(payload: dict) -> dict:
+    """Cacheable form of a public profile: the JSON payload plus its ETag."""
+    encoded = jsonable_encoder(payload)
+    body = json.dumps(encoded, sort_keys=True, separators=(",", ":")).encode()
+    return {"etag": make_etag(body), "payload": encoded}
+
+
+async def cached_profile(username: str, load: Callable[[], Awaitable[dict]]) -> dict:
+    """Profile entry for `username`; on a miss `load()` builds the payload once across workers."""
+
+    async def compute():
+        return profile_entry(await load())
+
+    return await shared_cache.get_or_compute(
+        f"profile:{username}",
+        compute,
+        ttl=PROFILE_CACHE_TTL,
+        tags=lambda entry: [ALL_PROFILES, user_tag(entry["payload"]["id"])],
+    )
+
+
+def invalidate_profile_now(user_id: int) -> None:
+    shared_cache.invalidate_tags(user_tag(user_id))
+
+
+def invalidate_all_profiles() -> None:
+    shared_cache.invalidate_tags(ALL_PROFILES)
+
+
+def invalidate_profile(db: Session, user_id: int) -> None:
+    """Drop `user_id`'s cached public profile once `db` commits."""
+    invalidate_tags_on_commit(db, user_tag(user_id))
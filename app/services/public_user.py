@@ -1,86 +1,95 @@
 # app/services/public_user.py
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
 
 from app.db.models import User
 from app.db.user_profile import UserProfile
-from app.db.post import Post
-from app.db.post_caret import PostCaret
 from app.db.education import EducationEntry
 from app.db.work_experience import WorkExperience
-from app.api.achievement import get_user_achievement
-from app.api.recommendation_score import get_recommendation_score
+from app.services.user_scores import get_stored_totals
+from app.services.photos import avatar_url
+from app.services.user_search import search_user_ids
 
 
-def _totals(db: Session, user_id: int) -> tuple[int, int]:
-    # achievement total
-    ach = get_user_achievement(user_id, db)
-    achievement_total = ach["achievement_score"]["total"]
+def _totals_for(db: Session, user_ids: list[int]) -> dict[int, tuple[int, int]]:
+    # stored user_scores, as in search_public_users below
+    totals = get_stored_totals(db, user_ids)
+    return {user_id: totals[user_id][:2] for user_id in user_ids}
 
-    # recommendation total
-    rec = get_recommendation_score(user_id, db)
-    recommendation_total = rec["recommendation_score"]["total"]
 
-    return achievement_total, recommendation_total
+def _totals(db: Session, user_id: int) -> tuple[int, int]:
+    return _totals_for(db, [user_id])[user_id]
 
 
-def _verified_education(db: Session, user_id: int):
+def _verified_education_for(db: Session, user_ids: list[int]) -> dict[int, list[dict]]:
+    out = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return out
     rows = (
-        db.query(EducationEntry.university_name, EducationEntry.degree_type)
+        db.query(EducationEntry.user_id, EducationEntry.university_name, EducationEntry.degree_type)
         .filter(
-            EducationEntry.user_id == user_id,
+            EducationEntry.user_id.in_(user_ids),
             EducationEntry.verification_status == "VERIFIED",
         )
+        .order_by(EducationEntry.id.asc())
         .all()
     )
-    return [
-        {"university_name": university_name, "degree_type": degree_type}
-        for (university_name, degree_type) in rows
-    ]
+    for user_id, university_name, degree_type in rows:
+        out[user_id].append({"university_name": university_name, "degree_type": degree_type})
+    return out
 
 
-def _verified_work(db: Session, user_id: int):
+def _verified_education(db: Session, user_id: int):
+    return _verified_education_for(db, [user_id])[user_id]
+
+
+def _verified_work_for(db: Session, user_ids: list[int]) -> dict[int, list[dict]]:
+    out = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return out
     rows = (
-        db.query(WorkExperience.company_name, WorkExperience.title)
+        db.query(WorkExperience.user_id, WorkExperience.company_name, WorkExperience.title)
         .filter(
-            WorkExperience.user_id == user_id,
+            WorkExperience.user_id.in_(user_ids),
             WorkExperience.verification_status == "VERIFIED",
         )
+        .order_by(WorkExperience.id.asc())
         .all()
     )
-    return [
-        {"company_name": company_name, "title": title}
-        for (company_name, title) in rows
-    ]
+    for user_id, company_name, title in rows:
+        out[user_id].append({"company_name": company_name, "title": title})
+    return out
+
+
+def _verified_work(db: Session, user_id: int):
+    return _verified_work_for(db, [user_id])[user_id]
 
 
 def search_public_users(db: Session, q: str, limit: int = 10):
-    users = (
-        db.query(User)
-        .filter(User.status == "APPROVED")
-        .filter(
-            or_(
-                User.full_name.ilike(f"%{q}%"),
-                User.username.ilike(f"%{q}%")
-            )
-        )
-        .limit(limit)
-        .all()
-    )
+    """
+    One page of search hits, enriched in a fixed number of grouped queries:
+    users, profiles, stored score rows, verified education and verified work.
+    """
+    user_ids = search_user_ids(db, q, limit)
+    if not user_ids:
+        return []
+
+    user_map = {u.id: u for u in db.query(User).filter(User.id.in_(user_ids)).all()}
+    users = [user_map[user_id] for user_id in user_ids if user_id in user_map]
+    ids = [u.id for u in users]
+
+    profiles = {
+        p.user_id: p
+        for p in db.query(UserProfile).filter(UserProfile.user_id.in_(ids)).all()
+    }
+    totals = get_stored_totals(db, ids)
+    education = _verified_education_for(db, ids)
+    work = _verified_work_for(db, ids)
 
     results = []
     for u in users:
-        profile = db.query(UserProfile).filter(UserProfile.user_id == u.id).first()
-        achievement_total, recommendation_total = _totals(db, u.id)
-        caret_score = (
-            db.query(func.count(PostCaret.id))
-            .join(Post, Post.id == PostCaret.post_id)
-            .filter(Post.user_id == u.id)
-            .scalar()
-            or 0
-        )
-
+        profile = profiles.get(u.id)
+        achievement_total, recommendation_total, caret_score = totals[u.id]
         results.append({
             "user_id": u.id,
             "full_name": u.full_name,
@@ -88,10 +97,10 @@ def search_public_users(db: Session, q: str, limit: int = 10):
             "headline": getattr(profile, "headline", None) if profile else None,
             "achievement_total": achievement_total,
             "recommendation_total": recommendation_total,
-            "caret_score": int(caret_score),
-            "verified_education": _verified_education(db, u.id),
-            "verified_work": _verified_work(db, u.id),
-            "profile_photo_url": getattr(profile, "profile_photo_url", None) if profile else None,
+            "caret_score": caret_score,
+            "verified_education": education[u.id],
+            "verified_work": work[u.id],
+            "profile_photo_url": avatar_url(profile),
         })
 
     return results
@@ -1,44 +1,36 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 
 from app.db.models import User
 from app.db.user_profile import UserProfile
-from app.api.achievement import get_user_achievement
-from app.api.recommendation_score import get_recommendation_score
+from app.services.user_scores import get_stored_totals
+from app.services.user_search import search_user_ids
 
 
 def search_public_users(db: Session, q: str, limit: int = 10):
-    q_like = f"%{q.strip()}%"
-
-    rows = (
+    user_ids = search_user_ids(db, q, limit, public_profiles_only=True)
+    found = (
         db.query(User, UserProfile)
         .join(UserProfile, UserProfile.user_id == User.id)
-        .filter(UserProfile.visibility == "PUBLIC")
-        .filter(
-            or_(
-                UserProfile.full_name.ilike(q_like),
-                UserProfile.headline.ilike(q_like),
-                UserProfile.location.ilike(q_like),
-            )
-        )
-        .limit(limit)
+        .filter(User.id.in_(user_ids))
         .all()
+        if user_ids else []
     )
+    by_id = {user.id: (user, profile) for user, profile in found}
+    rows = [by_id[user_id] for user_id in user_ids if user_id in by_id]
+
+    totals = get_stored_totals(db, user_ids)
 
     out = []
     for user, profile in rows:
-        ach = get_user_achievement(user.id, db)
-        rec = get_recommendation_score(user.id, db)
-
         out.append({
             "user_id": user.id,
-            "full_name": profile.full_name,
+            "full_name": user.full_name,
             "headline": profile.headline,
             "location": profile.location,
             "interests": profile.interests,
             "visibility": profile.visibility,
-            "achievement_score": ach["achievement_score"]["total"],
-            "recommendation_score": rec["recommendation_score"]["total"],
+            "achievement_score": totals[user.id][0],
+            "recommendation_score": totals[user.id][1],
         })
 
     return out
@@ -0,0 +1,46 @@
+from collections import defaultdict
+
+from sqlalchemy.orm import Session
+
+from app.db.recommendations import Recommendation
+from app.scoring.recommendation_score import points_for_recommendation, weight_from_achievement
+
+
+def dependents_of(db: Session, recommender_id: int) -> list[tuple[int, str]]:
+    """
+    Edges recommender -> requester whose points depend on this recommender's
+    achievement total: every APPROVED recommendation they gave.
+    Served by ix_recommendations_recommender_status_created_at.
+    """
+    return [
+        (requester_id, rec_type)
+        for requester_id, rec_type in db.query(Recommendation.requester_id, Recommendation.rec_type)
+        .filter(
+            Recommendation.recommender_id == recommender_id,
+            Recommendation.status == "APPROVED",
+        )
+        .all()
+    ]
+
+
+def recommendation_deltas(
+    db: Session, recommender_id: int, old_total: int, new_total: int
+) -> dict[int, int]:
+    """
+    Change in recommendation total for each requester affected by a
+    recommender's achievement moving from `old_total` to `new_total`.
+
+    Weights are bucketed, so most achievement changes touch nobody; otherwise
+    only this recommender's out-edges are read and no other recommender is
+    rescored.
+    """
+    if weight_from_achievement(old_total) == weight_from_achievement(new_total):
+        return {}
+
+    deltas: dict[int, int] = defaultdict(int)
+    for requester_id, rec_type in dependents_of(db, recommender_id):
+        before = points_for_recommendation(rec_type, old_total)["points"]
+        after = points_for_recommendation(rec_type, new_total)["points"]
+        deltas[requester_id] += after - before
+
+    return {requester_id: delta for requester_id, delta in deltas.items() if delta}
@@ -0,0 +1,203 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import User
+from app.db.score_histogram import ScoreHistogram
+from app.db.user_score import UserScore
+
+ACHIEVEMENT = "achievement"
+RECOMMENDATION = "recommendation"
+
+ACHIEVEMENT_WEIGHT = 0.6
+RECOMMENDATION_WEIGHT = 0.4
+
+_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+class PercentRanks:
+    """
+    Cumulative view over one metric's histogram. Lookups are a bisect over
+    the distinct scores, not over users.
+    """
+
+    def __init__(self, buckets: list[tuple[int, int]]):
+        buckets = sorted(buckets)
+        self.scores = [score for score, _ in buckets]
+        self.cumulative = list(accumulate(count for _, count in buckets))
+        self.n = self.cumulative[-1] if self.cumulative else 0
+
+    def at_or_below(self, score: int) -> int:
+        idx = bisect_right(self.scores, score)
+        return self.cumulative[idx - 1] if idx else 0
+
+    def percent(self, score: int) -> float:
+        # Same definition the leaderboard has always used: (n - rank) / (n - 1),
+        # where rank is the 1-based position of the first user with this score.
+        if self.n <= 1:
+            return 1.0
+        return (self.at_or_below(score) - 1) / (self.n - 1)
+
+    def rank(self, score: int) -> int:
+        return self.n - self.at_or_below(score) + 1
+
+
+def load_percent_ranks(db: Session, metric: str) -> PercentRanks:
+    rows = (
+        db.query(ScoreHistogram.score, ScoreHistogram.user_count)
+        .filter(ScoreHistogram.metric == metric, ScoreHistogram.user_count > 0)
+        .all()
+    )
+    return PercentRanks([(score, count) for score, count in rows])
+
+
+def _bump(db: Session, metric: str, score: int, delta: int) -> None:
+    insert = _INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(ScoreHistogram).values(metric=metric, score=score, user_count=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ScoreHistogram.metric, ScoreHistogram.score],
+            set_={"user_count": ScoreHistogram.user_count + delta},
+        )
+        db.execute(stmt)
+        return
+
+    updated = (
+        db.query(ScoreHistogram)
+        .filter(ScoreHistogram.metric == metric, ScoreHistogram.score == score)
+        .update(
+            {ScoreHistogram.user_count: ScoreHistogram.user_count + delta},
+            synchronize_session=False,
+        )
+    )
+    if not updated:
+        db.add(ScoreHistogram(metric=metric, score=score, user_count=delta))
+        db.flush()
+
+
+def record_score_change(db: Session, metric: str, old: int | None, new: int) -> None:
+    """Move one user from the `old` bucket to the `new` one (old=None for a new user)."""
+    if old == new:
+        return
+    if old is not None:
+        _bump(db, metric, old, -1)
+    _bump(db, metric, new, 1)
+
+
+def rebuild_score_histograms(db: Session) -> None:
+    db.flush()
+    db.query(ScoreHistogram).delete(synchronize_session=False)
+    for metric, column in (
+        (ACHIEVEMENT, UserScore.achievement_total),
+        (RECOMMENDATION, UserScore.recommendation_total),
+    ):
+        rows = db.query(column, func.count()).group_by(column).all()
+        db.add_all(
+            ScoreHistogram(metric=metric, score=score, user_count=count)
+            for score, count in rows
+        )
+    db.flush()
+
+
+def combined_score(pA: float, pR: float) -> float:
+    return (ACHIEVEMENT_WEIGHT * pA) + (RECOMMENDATION_WEIGHT * pR)
+
+
+def _sorted_access(db: Session, column, batch_size: int):
+    """
+    Yield user_scores rows best-first by `column`, one keyset page at a time.
+    Rows are joined to users so the board never holds a user that is gone.
+    """
+    last = None
+    while True:
+        query = (
+            db.query(
+                UserScore.user_id,
+                UserScore.achievement_total,
+                UserScore.recommendation_total,
+            )
+            .join(User, User.id == UserScore.user_id)
+            .order_by(column.desc(), UserScore.user_id.asc())
+        )
+        if last is not None:
+            last_score, last_id = last
+            query = query.filter(
+                or_(column < last_score, and_(column == last_score, UserScore.user_id > last_id))
+            )
+        rows = query.limit(batch_size).all()
+        if not rows:
+            return
+        yield rows
+        last = (getattr(rows[-1], column.key), rows[-1].user_id)
+
+
+def top_combined(db: Session, k: int, batch_size: int = 100) -> list[dict]:
+    """
+    Top-k users by 0.6·pA + 0.4·pR using the threshold algorithm: read both
+    score indexes best-first in parallel and stop once no unseen user can
+    beat the current k-th row. Percent ranks come from the histograms, so
+    users below the cut-off are never read.
+    """
+    pa = load_percent_ranks(db, ACHIEVEMENT)
+    pr = load_percent_ranks(db, RECOMMENDATION)
+
+    by_achievement = _sorted_access(db, UserScore.achievement_total, batch_size)
+    by_recommendation = _sorted_access(db, UserScore.recommendation_total, batch_size)
+    seen: dict[int, dict] = {}
+
+    def sort_key(row):
+        return (row["combined_score"], row["pA"], row["pR"], row["achievement_score"], -row["user_id"])
+
+    while True:
+        a_page = next(by_achievement, None)
+        r_page = next(by_recommendation, None)
+
+        for user_id, achievement, recommendation in (a_page or []) + (r_page or []):
+            if user_id in seen:
+                continue
+            p_a = pa.percent(achievement)
+            p_r = pr.percent(recommendation)
+            seen[user_id] = {
+                "user_id": user_id,
+                "achievement_score": achievement,
+                "recommendation_score": recommendation,
+                "pA": p_a,
+                "pR": p_r,
+                "combined_score": combined_score(p_a, p_r),
+            }
+
+        if a_page is None or r_page is None:
+            # one index has been read to the end, so every user has been seen
+            break
+
+        if len(seen) >= k:
+            # an unseen user scores at most the last value read from each index
+            bound_a = pa.percent(a_page[-1].achievement_total)
+            bound_r = pr.percent(r_page[-1].recommendation_total)
+            kth = sorted(seen.values(), key=sort_key, reverse=True)[k - 1]
+            if (kth["combined_score"], kth["pA"]) > (combined_score(bound_a, bound_r), bound_a):
+                break
+
+    return sorted(seen.values(), key=sort_key, reverse=True)[:k]
+
+
+def user_rank(db: Session, score: UserScore) -> dict:
+    pa = load_percent_ranks(db, ACHIEVEMENT)
+    pr = load_percent_ranks(db, RECOMMENDATION)
+    p_a = pa.percent(score.achievement_total)
+    p_r = pr.percent(score.recommendation_total)
+    return {
+        "user_id": score.user_id,
+        "achievement_score": score.achievement_total,
+        "achievement_rank": pa.rank(score.achievement_total),
+        "recommendation_score": score.recommendation_total,
+        "recommendation_rank": pr.rank(score.recommendation_total),
+        "pA": p_a,
+        "pR": p_r,
+        "combined_score": combined_score(p_a, p_r),
+        "total_users": pa.n,
+    }
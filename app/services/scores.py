@@ -1,81 +1,124 @@
+from collections.abc import Iterable
 from sqlalchemy.orm import Session
-from datetime import date
 
 from app.db.education import EducationEntry
 from app.db.work_experience import WorkExperience
 from app.db.recommendations import Recommendation
 
-from app.scoring.education_score import score_education_entry
-from app.scoring.work_score import score_work_entry
-from app.scoring.work_streak import compute_company_streaks
+from app.scoring.education_score import score_education_batch
+from app.scoring.work_score import score_work_batch
+from app.scoring.work_streak import compute_company_streaks_batch
 from app.scoring.recommendation_score import points_for_recommendation
 
 
 VERIFIED = "VERIFIED"
 
 
-def get_achievement_total(db: Session, user_id: int) -> int:
-    # ✅ Only VERIFIED education counts
-    education_entries = (
-        db.query(EducationEntry)
-        .filter(EducationEntry.user_id == user_id)
-        .filter(EducationEntry.verification_status == VERIFIED)
-        .order_by(EducationEntry.id.asc())
-        .all()
+def get_achievement_totals(
+    db: Session, user_ids: Iterable[int], verified_only: bool = True
+) -> dict[int, int]:
+    """
+    Achievement totals for a set of users in two queries (education + work),
+    regardless of how many users are asked for. Rows are fetched as columns
+    and scored with the batch kernels. Users without scored entries map to 0.
+
+    By default only VERIFIED entries count (stored scores, leaderboards).
+    verified_only=False scores every entry, like the /users/{id}/achievement
+    endpoint does; /users/{id}/recommendation-score passes it on purpose so
+    recommender totals there match what that endpoint shows.
+    """
+    ids = set(user_ids)
+    if not ids:
+        return {}
+
+    # education; only VERIFIED entries when verified_only
+    education_query = (
+        db.query(
+            EducationEntry.user_id,
+            EducationEntry.university_tier,
+            EducationEntry.degree_type,
+            EducationEntry.is_completed,
+            EducationEntry.gpa,
+        )
+        .filter(EducationEntry.user_id.in_(ids))
     )
-
-    education_total = 0
-    for e in education_entries:
-        scored = score_education_entry(
-            university_tier=e.university_tier,
-            degree_type=e.degree_type,
-            is_completed=e.is_completed,
-            gpa=e.gpa,
+    if verified_only:
+        education_query = education_query.filter(EducationEntry.verification_status == VERIFIED)
+    education_rows = education_query.all()
+
+    # work; only VERIFIED entries when verified_only
+    work_query = (
+        db.query(
+            WorkExperience.user_id,
+            WorkExperience.company_name,
+            WorkExperience.employment_type,
+            WorkExperience.start_date,
+            WorkExperience.end_date,
+            WorkExperience.is_current,
         )
-        education_total += scored["total"]
-
-    # ✅ Only VERIFIED work counts
-    work_entries = (
-        db.query(WorkExperience)
-        .filter(WorkExperience.user_id == user_id)
-        .filter(WorkExperience.verification_status == VERIFIED)
-        .order_by(WorkExperience.id.asc())
-        .all()
+        .filter(WorkExperience.user_id.in_(ids))
     )
+    if verified_only:
+        work_query = work_query.filter(WorkExperience.verification_status == VERIFIED)
+    work_rows = work_query.all()
 
-    # ✅ streak only from VERIFIED work entries
-    streak_total, _streak_breakdown = compute_company_streaks(work_entries)
+    totals = {user_id: 0 for user_id in ids}
 
-    work_total = 0
-    for w in work_entries:
-        end_dt = w.end_date
-        if w.is_current or end_dt is None:
-            end_dt = date.today()
+    if education_rows:
+        user_col, tier, degree, completed, gpa = zip(*education_rows)
+        _points, education_totals = score_education_batch(user_col, tier, degree, completed, gpa)
+        for user_id, total in education_totals.items():
+            totals[user_id] += total
 
-        scored = score_work_entry(
-            employment_type=w.employment_type,
-            start_date=w.start_date,
-            end_date=end_dt,
-        )
-        work_total += scored["total"]
+    if work_rows:
+        user_col, company, employment_type, start, end, current = zip(*work_rows)
+        _points, work_totals = score_work_batch(user_col, employment_type, start, end, current)
+        # ✅ streak only from VERIFIED work entries
+        streak_totals = compute_company_streaks_batch(user_col, company, start, end, current)
+        for user_id, total in work_totals.items():
+            totals[user_id] += total + streak_totals[user_id]
 
-    return education_total + work_total + streak_total
+    return totals
 
 
-def get_recommendation_total(db: Session, user_id: int) -> int:
-    # all APPROVED recs received by this user
+def get_achievement_total(db: Session, user_id: int) -> int:
+    return get_achievement_totals(db, [user_id])[user_id]
+
+
+def get_recommendation_totals(
+    db: Session,
+    user_ids: Iterable[int],
+    achievement_totals: dict[int, int] | None = None,
+) -> dict[int, int]:
+    """
+    Recommendation totals for a set of users. All recommenders are scored
+    with one bulk achievement lookup; callers that already hold achievement
+    totals (e.g. a full rescore) can pass them in to skip that lookup.
+    """
+    ids = set(user_ids)
+    if not ids:
+        return {}
+
+    # all APPROVED recs received by these users
     recs = (
         db.query(Recommendation)
-        .filter(Recommendation.requester_id == user_id)
+        .filter(Recommendation.requester_id.in_(ids))
         .filter(Recommendation.status == "APPROVED")
         .order_by(Recommendation.id.asc())
         .all()
     )
 
-    total = 0
+    known = achievement_totals or {}
+    missing = {r.recommender_id for r in recs} - known.keys()
+    recommender_totals = {**known, **get_achievement_totals(db, missing)}
+
+    totals = {user_id: 0 for user_id in ids}
     for r in recs:
-        recommender_achievement_total = get_achievement_total(db, r.recommender_id)
-        scored = points_for_recommendation(r.rec_type, recommender_achievement_total)
-        total += scored["points"]
+        scored = points_for_recommendation(r.rec_type, recommender_totals[r.recommender_id])
+        totals[r.requester_id] += scored["points"]
 
-    return total
+    return totals
+
+
+def get_recommendation_total(db: Session, user_id: int) -> int:
+    return get_recommendation_totals(db, [user_id])[user_id]
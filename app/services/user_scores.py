@@ -0,0 +1,272 @@
+from datetime import datetime
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.db.models import User
+from app.db.post import Post
+from app.db.post_caret import PostCaret
+from app.db.recommendations import Recommendation
+from app.db.user_score import UserScore
+from app.services.profile_cache import invalidate_all_profiles, invalidate_profile
+from app.services.recommendation_graph import recommendation_deltas
+from app.services.score_ranks import (
+    ACHIEVEMENT,
+    RECOMMENDATION,
+    rebuild_score_histograms,
+    record_score_change,
+)
+from app.services.scores import (
+    get_achievement_total,
+    get_achievement_totals,
+    get_recommendation_total,
+    get_recommendation_totals,
+)
+from app.scoring.recommendation_score import points_for_recommendation
+
+REBUILD_CHUNK_SIZE = 1000
+
+
+def compute_user_score(db: Session, user_id: int) -> UserScore:
+    """The user's totals computed from scratch, as a row that is not added to the session."""
+    return UserScore(
+        user_id=user_id,
+        achievement_total=get_achievement_total(db, user_id),
+        recommendation_total=get_recommendation_total(db, user_id),
+        caret_total=_caret_total(db, user_id),
+        last_computed_at=datetime.utcnow(),
+    )
+
+
+def ensure_user_score(db: Session, user_id: int) -> UserScore:
+    """
+    The user's score row. A missing row is created with totals computed from
+    scratch (never zeros), so it already reflects any pending change and
+    incremental updates must not be applied on top of it.
+    """
+    score = db.get(UserScore, user_id)
+    if score is None:
+        db.flush()
+        score = compute_user_score(db, user_id)
+        db.add(score)
+        db.flush()
+        record_score_change(db, ACHIEVEMENT, None, score.achievement_total)
+        record_score_change(db, RECOMMENDATION, None, score.recommendation_total)
+    return score
+
+
+def _set_achievement_total(db: Session, score: UserScore, total: int) -> None:
+    record_score_change(db, ACHIEVEMENT, score.achievement_total, total)
+    score.achievement_total = total
+    invalidate_profile(db, score.user_id)
+
+
+def _set_recommendation_total(db: Session, score: UserScore, total: int) -> None:
+    record_score_change(db, RECOMMENDATION, score.recommendation_total, total)
+    score.recommendation_total = total
+    invalidate_profile(db, score.user_id)
+
+
+def _caret_totals(db: Session, user_ids: list[int]) -> dict[int, int]:
+    rows = (
+        db.query(Post.user_id, func.count(PostCaret.id))
+        .join(PostCaret, PostCaret.post_id == Post.id)
+        .filter(Post.user_id.in_(user_ids))
+        .group_by(Post.user_id)
+        .all()
+    )
+    totals = {user_id: 0 for user_id in user_ids}
+    totals.update({user_id: int(count) for user_id, count in rows})
+    return totals
+
+
+def _caret_total(db: Session, user_id: int) -> int:
+    return _caret_totals(db, [user_id])[user_id]
+
+
+def refresh_recommendation_score(db: Session, user_id: int) -> UserScore:
+    db.flush()
+    score = ensure_user_score(db, user_id)
+    _set_recommendation_total(db, score, get_recommendation_total(db, user_id))
+    score.last_computed_at = datetime.utcnow()
+    return score
+
+
+def refresh_achievement_score(db: Session, user_id: int) -> UserScore:
+    """
+    Recompute a user's achievement total. A recommender's achievement
+    weights the recommendations they gave, so when it changes the users
+    they recommended are adjusted by the difference in points.
+    """
+    db.flush()
+    score = ensure_user_score(db, user_id)
+    old_total = score.achievement_total
+    new_total = get_achievement_total(db, user_id)
+    _set_achievement_total(db, score, new_total)
+    score.last_computed_at = datetime.utcnow()
+
+    deltas = recommendation_deltas(db, user_id, old_total, new_total)
+    _apply_recommendation_deltas(db, deltas)
+    return score
+
+
+def apply_approved_recommendation(db: Session, rec: Recommendation) -> UserScore:
+    """
+    Add a newly approved recommendation's points to the requester, weighted
+    by the recommender's stored achievement total. The recommender's row is
+    locked and re-read so a concurrent achievement refresh can't be missed.
+    """
+    recommender_score = db.get(
+        UserScore, rec.recommender_id, with_for_update=True, populate_existing=True
+    ) or ensure_user_score(db, rec.recommender_id)
+    points = points_for_recommendation(rec.rec_type, recommender_score.achievement_total)["points"]
+    _apply_recommendation_deltas(db, {rec.requester_id: points})
+    return ensure_user_score(db, rec.requester_id)
+
+
+def _apply_recommendation_deltas(db: Session, deltas: dict[int, int]) -> None:
+    """
+    Atomic recommendation_total = recommendation_total + delta, one UPDATE
+    per distinct delta. Users without a row get one computed from scratch.
+    """
+    if not deltas:
+        return
+    now = datetime.utcnow()
+    by_delta: dict[int, list[int]] = {}
+    for user_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(user_id)
+
+    for delta, user_ids in by_delta.items():
+        rows = db.execute(
+            update(UserScore)
+            .where(UserScore.user_id.in_(user_ids))
+            .values(
+                recommendation_total=UserScore.recommendation_total + delta,
+                last_computed_at=now,
+            )
+            .returning(UserScore.user_id, UserScore.recommendation_total)
+        ).all()
+        for user_id, total in rows:
+            record_score_change(db, RECOMMENDATION, total - delta, total)
+            invalidate_profile(db, user_id)
+        for user_id in set(user_ids) - {user_id for user_id, _ in rows}:
+            # computed from scratch, this change included
+            ensure_user_score(db, user_id)
+
+
+def get_stored_totals(db: Session, user_ids: list[int]) -> dict[int, tuple[int, int, int]]:
+    """
+    (achievement, recommendation, caret) per user as last materialized in
+    user_scores, in one query. Users without a row map to zeros.
+    """
+    totals = {user_id: (0, 0, 0) for user_id in user_ids}
+    if user_ids:
+        rows = (
+            db.query(
+                UserScore.user_id,
+                UserScore.achievement_total,
+                UserScore.recommendation_total,
+                UserScore.caret_total,
+            )
+            .filter(UserScore.user_id.in_(user_ids))
+            .all()
+        )
+        totals.update({user_id: (a, r, c) for user_id, a, r, c in rows})
+    return totals
+
+
+def get_caret_totals(db: Session, user_ids: list[int]) -> dict[int, int]:
+    """Carets received per user, read from the stored counter."""
+    totals = {user_id: 0 for user_id in user_ids}
+    if user_ids:
+        rows = (
+            db.query(UserScore.user_id, UserScore.caret_total)
+            .filter(UserScore.user_id.in_(user_ids))
+            .all()
+        )
+        totals.update({user_id: caret_total for user_id, caret_total in rows})
+    return totals
+
+
+def get_caret_total(db: Session, user_id: int) -> int:
+    return get_caret_totals(db, [user_id])[user_id]
+
+
+def adjust_caret_total(db: Session, user_id: int, delta: int) -> None:
+    """Atomic caret_total = caret_total + delta for the user who received (or lost) carets."""
+    if not delta:
+        return
+    invalidate_profile(db, user_id)
+    if db.get(UserScore, user_id) is None:
+        # counted from scratch, this change included
+        ensure_user_score(db, user_id)
+        return
+    db.execute(
+        update(UserScore)
+        .where(UserScore.user_id == user_id)
+        .values(caret_total=UserScore.caret_total + delta, last_computed_at=datetime.utcnow())
+    )
+
+
+def refresh_caret_score(db: Session, user_id: int) -> UserScore:
+    db.flush()
+    score = ensure_user_score(db, user_id)
+    score.caret_total = _caret_total(db, user_id)
+    invalidate_profile(db, user_id)
+    score.last_computed_at = datetime.utcnow()
+    return score
+
+
+def refresh_user_scores(db: Session, user_id: int) -> UserScore:
+    refresh_achievement_score(db, user_id)
+    refresh_recommendation_score(db, user_id)
+    return refresh_caret_score(db, user_id)
+
+
+def rebuild_user_scores(db: Session) -> int:
+    """
+    Full recompute of every user's row (backfill / nightly rescoring).
+    Achievement totals for everyone are computed first so recommendation
+    totals reuse them instead of rescoring each recommender.
+    """
+    user_ids = [user_id for (user_id,) in db.query(User.id).order_by(User.id.asc()).all()]
+    chunks = [
+        user_ids[i:i + REBUILD_CHUNK_SIZE]
+        for i in range(0, len(user_ids), REBUILD_CHUNK_SIZE)
+    ]
+    now = datetime.utcnow()
+
+    achievement_totals: dict[int, int] = {}
+    for chunk in chunks:
+        achievement_totals.update(get_achievement_totals(db, chunk))
+
+    existing = {score.user_id: score for score in db.query(UserScore).all()}
+    for chunk in chunks:
+        recommendation_totals = get_recommendation_totals(db, chunk, achievement_totals)
+        caret_totals = _caret_totals(db, chunk)
+        for user_id in chunk:
+            score = existing.get(user_id)
+            if score is None:
+                score = UserScore(user_id=user_id)
+                db.add(score)
+            score.achievement_total = achievement_totals[user_id]
+            score.recommendation_total = recommendation_totals[user_id]
+            score.caret_total = caret_totals[user_id]
+            score.last_computed_at = now
+
+    rebuild_score_histograms(db)
+    db.commit()
+    invalidate_all_profiles()
+    return len(user_ids)
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        count = rebuild_user_scores(session)
+        print(f"Rebuilt scores for {count} users")
+    finally:
+        session.close()
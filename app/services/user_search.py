@@ -0,0 +1,200 @@
+"""
+Public user search.
+
+On Postgres, matching runs on pg_trgm GIN indexes over users.full_name,
+users.username, user_profiles.headline and user_profiles.location (see the
+add_user_search_indexes migration). Substring (ILIKE) and fuzzy (%) hits
+are collected per table so each side is served by a bitmap index scan, then
+ranked by the best trigram similarity across the four fields. `^name`
+queries are username prefix lookups on a pattern-ops btree.
+
+Other databases (SQLite in tests and local development) use TrigramIndex,
+an in-memory index that implements the same trigram similarity and ranking.
+It is built from every visible user, so it is kept per database for
+USER_SEARCH_INDEX_TTL seconds rather than rebuilt on each request; new or
+edited users show up once it expires.
+"""
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+
+from sqlalchemy import func, or_, select, union
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.db.models import User
+from app.db.user_profile import UserProfile
+from app.services.like_pattern import LIKE_ESCAPE, like_escape
+
+# pg_trgm's default similarity threshold for the % operator
+SIMILARITY_THRESHOLD = 0.3
+
+SEARCH_INDEX_TTL = float(os.getenv("USER_SEARCH_INDEX_TTL", "30"))
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# (bind, public_profiles_only) -> TrigramIndex
+_indexes = TTLCache(maxsize=8, ttl=SEARCH_INDEX_TTL)
+
+
+def trigrams(text: str | None) -> set[str]:
+    """Trigrams the way pg_trgm extracts them: per word, padded "  w ", lowercased."""
+    grams = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a: str | None, b: str | None) -> float:
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def parse_query(q: str) -> tuple[str, bool]:
+    """Returns (text, is_username_prefix); '^sat' searches usernames starting with 'sat'."""
+    text = q.strip()
+    if text.startswith("^"):
+        return text[1:].strip().lower(), True
+    return text, False
+
+
+@dataclass
+class SearchDocument:
+    user_id: int
+    full_name: str | None
+    username: str | None
+    headline: str | None
+    location: str | None
+
+    @property
+    def fields(self) -> tuple[str | None, ...]:
+        return (self.full_name, self.username, self.headline, self.location)
+
+
+class TrigramIndex:
+    """
+    In-memory counterpart of the Postgres search: a trigram -> user posting
+    list for fuzzy candidates, a substring check standing in for ILIKE, and
+    the same greatest-similarity ranking.
+    """
+
+    def __init__(self, documents: list[SearchDocument]):
+        self.documents = {doc.user_id: doc for doc in documents}
+        self.postings: dict[str, set[int]] = defaultdict(set)
+        for doc in documents:
+            for field in doc.fields:
+                for gram in trigrams(field):
+                    self.postings[gram].add(doc.user_id)
+
+    def _rank(self, doc: SearchDocument, text: str) -> float:
+        return max(similarity(field, text) for field in doc.fields)
+
+    def search(self, q: str, limit: int) -> list[int]:
+        text, prefix = parse_query(q)
+        if not text:
+            return []
+
+        if prefix:
+            hits = [
+                doc for doc in self.documents.values()
+                if doc.username and doc.username.startswith(text)
+            ]
+            hits.sort(key=lambda doc: (len(doc.username), doc.username))
+            return [doc.user_id for doc in hits[:limit]]
+
+        needle = text.lower()
+        scored = []
+        for doc in self.documents.values():
+            rank = self._rank(doc, text)
+            substring = any(needle in (field or "").lower() for field in doc.fields)
+            if substring or rank >= SIMILARITY_THRESHOLD:
+                scored.append((-rank, doc.user_id))
+        scored.sort()
+        return [user_id for _, user_id in scored[:limit]]
+
+
+def _visible(query, public_profiles_only: bool):
+    query = query.where(User.status == "APPROVED")
+    if public_profiles_only:
+        query = query.where(UserProfile.visibility == "PUBLIC")
+    return query
+
+
+def _search_postgres(db: Session, q: str, limit: int, public_profiles_only: bool) -> list[int]:
+    text, prefix = parse_query(q)
+    if not text:
+        return []
+
+    base = select(User.id).outerjoin(UserProfile, UserProfile.user_id == User.id)
+    base = _visible(base, public_profiles_only)
+
+    if prefix:
+        query = (
+            base.where(User.username.like(f"{like_escape(text)}%", escape=LIKE_ESCAPE))
+            .order_by(func.length(User.username), User.username)
+        )
+        return list(db.execute(query.limit(limit)).scalars())
+
+    like = f"%{like_escape(text)}%"
+    user_hits = select(User.id.label("user_id")).where(
+        or_(
+            User.full_name.ilike(like, escape=LIKE_ESCAPE),
+            User.username.ilike(like, escape=LIKE_ESCAPE),
+            User.full_name.op("%")(text),
+            User.username.op("%")(text),
+        )
+    )
+    profile_hits = select(UserProfile.user_id.label("user_id")).where(
+        or_(
+            UserProfile.headline.ilike(like, escape=LIKE_ESCAPE),
+            UserProfile.location.ilike(like, escape=LIKE_ESCAPE),
+            UserProfile.headline.op("%")(text),
+            UserProfile.location.op("%")(text),
+        )
+    )
+    candidates = union(user_hits, profile_hits).subquery("candidates")
+
+    rank = func.greatest(
+        func.similarity(User.full_name, text),
+        func.similarity(func.coalesce(User.username, ""), text),
+        func.similarity(func.coalesce(UserProfile.headline, ""), text),
+        func.similarity(func.coalesce(UserProfile.location, ""), text),
+    )
+    query = (
+        base.join(candidates, candidates.c.user_id == User.id)
+        .order_by(rank.desc(), User.id.asc())
+        .limit(limit)
+    )
+    return list(db.execute(query).scalars())
+
+
+def _search_in_memory(db: Session, q: str, limit: int, public_profiles_only: bool) -> list[int]:
+    key = (db.get_bind(), public_profiles_only)
+    index = _indexes.get(key)
+    if index is None:
+        rows = db.execute(
+            _visible(
+                select(User.id, User.full_name, User.username, UserProfile.headline, UserProfile.location)
+                .outerjoin(UserProfile, UserProfile.user_id == User.id),
+                public_profiles_only,
+            )
+        ).all()
+        index = TrigramIndex([SearchDocument(*row) for row in rows])
+        _indexes.set(key, index)
+    return index.search(q, limit)
+
+
+def search_user_ids(
+    db: Session, q: str, limit: int = 10, public_profiles_only: bool = False
+) -> list[int]:
+    """
+    Ids of approved users matching `q`, best match first. With
+    `public_profiles_only`, users must also have a PUBLIC profile.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, q, limit, public_profiles_only)
+    return _search_in_memory(db, q, limit, public_profiles_only)
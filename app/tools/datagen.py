@@ -0,0 +1,504 @@
+"""
+Deterministic synthetic dataset for load tests and benchmarks.
+
+    python -m app.tools.datagen --users 100000
+    python -m app.tools.datagen --users 1000000 --seed 7 --reset --scores
+
+Loads into DATABASE_URL. The same --users/--seed always produce the same
+rows: every table draws from its own generator seeded with "<seed>:<table>",
+ids are assigned arithmetically, and timestamps are offsets from a fixed
+epoch rather than now().
+
+Shape of the data (per user unless noted):
+  users / user_profiles        1, ~90% APPROVED
+  education / work entries     1 each; VERIFIED/PENDING/REJECTED by
+                               VERIFICATION_MIX, with a matching
+                               verification request per entry
+  recommendations              --recommendations-per-user edges; requester
+                               and recommender both drawn from a Zipf
+                               distribution over user ids, so in-degree is
+                               power-law and user 1 is the biggest hub
+  posts                        --posts-per-user; carets are Pareto-sized
+                               sets of distinct users (uq_post_caret holds),
+                               never the author
+  reflections                  1, with distinct carets
+  user_courses                 --courses-per-user distinct courses from a
+                               Zipf-popular catalog; visibility by
+                               VISIBILITY_MIX
+  contact methods / requests   ~60% / 1
+  inbox_items                  3
+
+Rows are streamed in batches: COPY on PostgreSQL (psycopg2), executemany
+inserts elsewhere. Nothing goes through the ORM, so a million users load
+in minutes. --scores then rebuilds user_scores and the score histograms.
+"""
+import argparse
+import bisect
+import csv
+import io
+import itertools
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db import models  # noqa: F401  # registers the mapped tables
+from app.db.base import Base
+from app.db.verification_request import VerificationRequest  # noqa: F401
+from app.services.course_key import normalize_course_number
+
+EPOCH = datetime(2025, 1, 1)
+SPAN_MINUTES = 365 * 24 * 60
+
+APPROVED_USERS = 0.9
+VERIFICATION_MIX = {"VERIFIED": 6, "PENDING": 3, "REJECTED": 1}
+# entry status -> status of the verification request that produced it
+REQUEST_STATUS = {"VERIFIED": "APPROVED", "PENDING": "PENDING", "REJECTED": "REJECTED"}
+RECOMMENDATION_MIX = {"APPROVED": 6, "PENDING": 3, "REJECTED": 1}
+VISIBILITY_MIX = {"PUBLIC": 7, "CIRCLE": 2, "PRIVATE": 1}
+CONTACT_REQUEST_MIX = {"PENDING": 5, "ACCEPTED": 3, "IGNORED": 2}
+ZIPF_EXPONENT = 1.1
+MAX_CARETS = 200
+
+UNIVERSITIES = ["FAU", "UCF", "USF", "MIT", "Stanford", "Georgia Tech", "UT Austin", "Purdue"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark"]
+EMPLOYMENT_TYPES = ["internship", "full_time", "part_time", "contract"]
+REC_TYPES = ["job", "academic", "project", "leadership"]
+POST_TYPES = ["behind_resume", "this_lately", "recent_realization", "currently_building"]
+REPLY_TYPES = ["validate", "context", "impact", "clarify", "challenge"]
+CONTACT_METHODS = ["EMAIL", "LINKEDIN", "DISCORD", "PHONE"]
+SUBJECTS = {"CAP": "Machine Learning", "COP": "Programming", "MAC": "Calculus", "STA": "Statistics",
+            "PHY": "Physics", "CHM": "Chemistry", "ENC": "Composition", "ECO": "Economics"}
+# (course_number, course_name), most popular first
+CATALOG = [
+    (f"{prefix} {number}", f"{name} {number}")
+    for number in (1101, 2311, 3530, 4610, 5610)
+    for prefix, name in SUBJECTS.items()
+]
+
+
+@dataclass
+class Scale:
+    users: int
+    posts_per_user: int = 2
+    courses_per_user: int = 2
+    recommendations_per_user: int = 3
+    inbox_per_user: int = 3
+
+
+def _rng(seed: int, table: str) -> random.Random:
+    return random.Random(f"{seed}:{table}")
+
+
+def _at(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(minutes=rng.randrange(SPAN_MINUTES))
+
+
+def _pick(rng: random.Random, mix: dict[str, int]) -> str:
+    return rng.choices(list(mix), list(mix.values()))[0]
+
+
+def _zipf_sampler(n: int, rng: random.Random) -> Callable[[], int]:
+    """1..n with P(k) proportional to 1 / k**ZIPF_EXPONENT."""
+    cumulative = list(itertools.accumulate(1 / k ** ZIPF_EXPONENT for k in range(1, n + 1)))
+    total = cumulative[-1]
+    return lambda: bisect.bisect_left(cumulative, rng.random() * total) + 1
+
+
+def _distinct_users(rng: random.Random, users: int, count: int, exclude: int) -> list[int]:
+    picked = rng.sample(range(1, users + 1), min(count + 1, users))
+    return [uid for uid in picked if uid != exclude][:count]
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _course_ids(seed: int, uid: int, scale: Scale) -> list[uuid.UUID]:
+    """Ids of user `uid`'s courses, computable from any table's generator."""
+    return [uuid.uuid5(uuid.NAMESPACE_OID, f"{seed}:course:{uid}:{k}") for k in range(scale.courses_per_user)]
+
+
+def _post_owner(post_id: int, scale: Scale) -> int:
+    return (post_id - 1) // scale.posts_per_user + 1
+
+
+def users(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "users")
+    for uid in range(1, scale.users + 1):
+        yield {
+            "id": uid,
+            "full_name": f"User {uid}",
+            "email": f"user{uid}@example.com",
+            "username": f"user{uid}",
+            "status": "APPROVED" if rng.random() < APPROVED_USERS else "PENDING",
+            "created_at": _at(rng),
+        }
+
+
+def user_profiles(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "user_profiles")
+    for uid in range(1, scale.users + 1):
+        yield {
+            "id": uid,
+            "user_id": uid,
+            "headline": f"Student at {rng.choice(UNIVERSITIES)}",
+            "university_names": [rng.choice(UNIVERSITIES)],
+            "top_skills": rng.sample(["python", "sql", "ml", "react", "go", "stats"], 3),
+            "is_open_to_recommendations": rng.random() < 0.8,
+            "is_hiring": rng.random() < 0.05,
+            "visibility": "PUBLIC",
+        }
+
+
+def education_entries(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "education_entries")
+    for uid in range(1, scale.users + 1):
+        start = date(2015, 8, 20) + timedelta(days=rng.randrange(3000))
+        yield {
+            "id": uid,
+            "user_id": uid,
+            "degree_type": rng.choice(["bachelor", "master", "phd"]),
+            "university_name": rng.choice(UNIVERSITIES),
+            "university_tier": rng.randint(1, 5),
+            "gpa": round(rng.uniform(2.0, 4.0), 2),
+            "start_date": start,
+            "end_date": start + timedelta(days=4 * 365),
+            "is_completed": rng.random() < 0.7,
+            "college_id": f"C{uid:08d}",
+            "verification_status": _pick(rng, VERIFICATION_MIX),
+        }
+
+
+def work_experiences(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "work_experiences")
+    for uid in range(1, scale.users + 1):
+        start = date(2018, 1, 1) + timedelta(days=rng.randrange(2500))
+        current = rng.random() < 0.3
+        yield {
+            "id": uid,
+            "user_id": uid,
+            "company_name": rng.choice(COMPANIES),
+            "title": "Engineer",
+            "employment_type": rng.choice(EMPLOYMENT_TYPES),
+            "is_current": current,
+            "start_date": start,
+            "end_date": None if current else start + timedelta(days=rng.randint(60, 1500)),
+            "verification_status": _pick(rng, VERIFICATION_MIX),
+        }
+
+
+def verification_requests(scale: Scale, seed: int) -> Iterator[dict]:
+    # replays the entry generators so each request matches its entry's status
+    rng = _rng(seed, "verification_requests")
+    entries = (
+        ("EDUCATION", 0, education_entries(scale, seed)),
+        ("WORK", scale.users, work_experiences(scale, seed)),
+    )
+    for subject_type, id_offset, rows in entries:
+        for entry in rows:
+            status = REQUEST_STATUS[entry["verification_status"]]
+            created_at = _at(rng)
+            yield {
+                "id": id_offset + entry["id"],
+                "owner_user_id": entry["user_id"],
+                "subject_type": subject_type,
+                "subject_id": entry["id"],
+                "status": status,
+                "contact_name": "Registrar",
+                "contact_email": "registrar@example.com",
+                "created_at": created_at,
+                "decided_at": None if status == "PENDING" else created_at + timedelta(days=2),
+            }
+
+
+def recommendations(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "recommendations")
+    zipf = _zipf_sampler(scale.users, rng)
+    for rec_id in range(1, scale.users * scale.recommendations_per_user + 1):
+        requester, recommender = zipf(), zipf()
+        if requester == recommender:
+            recommender = recommender % scale.users + 1
+        status = _pick(rng, RECOMMENDATION_MIX)
+        created_at = _at(rng)
+        yield {
+            "id": rec_id,
+            "requester_id": requester,
+            "recommender_id": recommender,
+            "rec_type": rng.choice(REC_TYPES),
+            "reason": "We worked together",
+            "status": status,
+            "created_at": created_at,
+            "decided_at": None if status == "PENDING" else created_at + timedelta(days=1),
+        }
+
+
+def _caret_fans(rng: random.Random, scale: Scale, owner: int) -> list[int]:
+    count = min(MAX_CARETS, int(rng.paretovariate(1.2)) - 1)
+    return _distinct_users(rng, scale.users, count, exclude=owner)
+
+
+def posts(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "posts")
+    fans_rng = _rng(seed, "post_carets")
+    for post_id in range(1, scale.users * scale.posts_per_user + 1):
+        owner = _post_owner(post_id, scale)
+        yield {
+            "id": post_id,
+            "user_id": owner,
+            "type": rng.choice(POST_TYPES),
+            "content": f"Post {post_id}",
+            "created_at": _at(rng),
+            # same draws as post_carets(), so the denormalized count matches
+            "caret_count": len(_caret_fans(fans_rng, scale, owner)),
+        }
+
+
+def post_carets(scale: Scale, seed: int) -> Iterator[dict]:
+    # fans come from the stream posts() replays for caret_count; times don't
+    rng, clock = _rng(seed, "post_carets"), _rng(seed, "post_caret_times")
+    for post_id in range(1, scale.users * scale.posts_per_user + 1):
+        for fan in _caret_fans(rng, scale, _post_owner(post_id, scale)):
+            yield {"post_id": post_id, "user_id": fan, "created_at": _at(clock)}
+
+
+def post_replies(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "post_replies")
+    for post_id in range(1, scale.users * scale.posts_per_user + 1):
+        owner = _post_owner(post_id, scale)
+        for sender in _distinct_users(rng, scale.users, rng.choice([0, 0, 1, 2]), exclude=owner):
+            yield {
+                "post_id": post_id,
+                "owner_id": owner,
+                "sender_id": sender,
+                "recipient_id": owner,
+                "type": rng.choice(REPLY_TYPES),
+                "message": "Thanks for sharing",
+                "created_at": _at(rng),
+            }
+
+
+def reflections(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "reflections")
+    for uid in range(1, scale.users + 1):
+        yield {"id": uid, "user_id": uid, "type": "story", "content": f"Story {uid}", "created_at": _at(rng)}
+
+
+def reflection_carets(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "reflection_carets")
+    for reflection_id in range(1, scale.users + 1):
+        for fan in _distinct_users(rng, scale.users, rng.randint(0, 5), exclude=reflection_id):
+            yield {"reflection_id": reflection_id, "user_id": fan, "created_at": _at(rng)}
+
+
+def user_courses(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "user_courses")
+    popular = _zipf_sampler(len(CATALOG), rng)
+    for uid in range(1, scale.users + 1):
+        taken: set[int] = set()
+        while len(taken) < min(scale.courses_per_user, len(CATALOG)):
+            taken.add(popular() - 1)
+        for course_id, index in zip(_course_ids(seed, uid, scale), sorted(taken)):
+            number, name = CATALOG[index]
+            created_at = _at(rng)
+            yield {
+                "id": course_id,
+                "user_id": uid,
+                "course_name": name,
+                "course_number": number,
+                "course_key": normalize_course_number(number),
+                "grade": rng.choice(["A", "A-", "B+", "B", "C"]),
+                "program_level": rng.choice(["BACHELORS", "MASTERS", "PHD"]),
+                "term": rng.choice(["Fall 2024", "Spring 2025", "Fall 2025"]),
+                "visibility": _pick(rng, VISIBILITY_MIX),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+
+def contact_methods(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "contact_methods")
+    for uid in range(1, scale.users + 1):
+        if rng.random() < 0.6:
+            created_at = _at(rng)
+            yield {
+                "id": _uuid(rng),
+                "user_id": uid,
+                "method": rng.choice(CONTACT_METHODS),
+                "value": f"user{uid}@example.com",
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+
+def contact_requests(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "contact_requests")
+    for uid in range(1, scale.users + 1):
+        # uniform over everyone but the requester
+        target = rng.randrange(1, scale.users)
+        target += target >= uid
+        status = _pick(rng, CONTACT_REQUEST_MIX)
+        created_at = _at(rng)
+        yield {
+            "id": _uuid(rng),
+            "requester_id": uid,
+            "target_id": target,
+            "course_id": rng.choice(_course_ids(seed, target, scale)),
+            "status": status,
+            "message": "Could we compare notes?",
+            "created_at": created_at,
+            "responded_at": None if status == "PENDING" else created_at + timedelta(hours=6),
+        }
+
+
+def inbox_items(scale: Scale, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "inbox_items")
+    for uid in range(1, scale.users + 1):
+        for _ in range(scale.inbox_per_user):
+            created_at = _at(rng)
+            yield {
+                "id": _uuid(rng),
+                "user_id": uid,
+                "type": "RECOMMENDATION_APPROVED",
+                "payload_json": {"recommendation_id": rng.randint(1, scale.users * scale.recommendations_per_user)},
+                "status": rng.choice(["UNREAD", "READ"]),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+
+# in foreign-key order
+GENERATORS: dict[str, Callable[[Scale, int], Iterator[dict]]] = {
+    "users": users,
+    "user_profiles": user_profiles,
+    "education_entries": education_entries,
+    "work_experiences": work_experiences,
+    "verification_requests": verification_requests,
+    "recommendations": recommendations,
+    "posts": posts,
+    "post_carets": post_carets,
+    "post_replies": post_replies,
+    "reflections": reflections,
+    "reflection_carets": reflection_carets,
+    "user_courses": user_courses,
+    "contact_methods": contact_methods,
+    "contact_requests": contact_requests,
+    "inbox_items": inbox_items,
+}
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return r"\N"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value)
+
+
+def _copy(conn: Connection, table: str, batch: list[dict]) -> None:
+    columns = list(batch[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+    buffer.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _insert(conn: Connection, table: str, batch: list[dict]) -> None:
+    conn.execute(insert(Base.metadata.tables[table]), batch)
+
+
+def _reset_sequences(conn: Connection) -> None:
+    """Explicit ids bypass PostgreSQL sequences; move them past the loaded rows."""
+    for table in GENERATORS:
+        id_column = Base.metadata.tables[table].c.get("id")
+        if id_column is not None and id_column.type.python_type is int:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+            ))
+
+
+def load(
+    engine: Engine,
+    scale: Scale,
+    seed: int = 42,
+    batch_size: int = 10_000,
+    log: Callable[[str], None] = lambda message: None,
+) -> dict[str, int]:
+    """Insert the dataset for (scale, seed); returns rows written per table."""
+    use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+    write = _copy if use_copy else _insert
+    counts = {}
+    with engine.begin() as conn:
+        for table, generate in GENERATORS.items():
+            started = time.perf_counter()
+            counts[table] = 0
+            for batch in _batches(generate(scale, seed), batch_size):
+                write(conn, table, batch)
+                counts[table] += len(batch)
+            log(f"{table}: {counts[table]} rows in {time.perf_counter() - started:.1f}s")
+        if engine.dialect.name == "postgresql":
+            _reset_sequences(conn)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load a deterministic synthetic dataset into DATABASE_URL")
+    parser.add_argument("--users", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--posts-per-user", type=int, default=2)
+    parser.add_argument("--courses-per-user", type=int, default=2)
+    parser.add_argument("--recommendations-per-user", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--scores", action="store_true", help="rebuild user_scores afterwards")
+    args = parser.parse_args()
+
+    from app.db.session import SessionLocal, engine
+    from app.services.user_scores import rebuild_user_scores
+
+    if args.reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    scale = Scale(
+        users=args.users,
+        posts_per_user=args.posts_per_user,
+        courses_per_user=args.courses_per_user,
+        recommendations_per_user=args.recommendations_per_user,
+    )
+    started = time.perf_counter()
+    load(engine, scale, args.seed, args.batch_size, log=print)
+    if args.scores:
+        db = SessionLocal()
+        try:
+            print(f"user_scores: {rebuild_user_scores(db)} users rescored")
+        finally:
+            db.close()
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
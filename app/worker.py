@@ -0,0 +1,82 @@
+"""
+Background job worker.
+
+    python -m app.worker          # run until SIGINT/SIGTERM
+    python -m app.worker --once   # drain due jobs and exit
+
+Run as many as needed; SKIP LOCKED keeps them off each other's jobs.
+
+Every JOBS_RESCORE_INTERVAL seconds (default hourly) the worker also
+enqueues the day's rescore of users with current or open-ended work, whose
+achievement totals depend on today's date. The idempotency key makes that
+one job per day however many workers run.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import time
+
+from app.db import models  # noqa: F401  # ensures all models are registered
+from app.db.session import SessionLocal
+from app.services.job_handlers import enqueue_open_work_rescore  # also registers the job kinds
+from app.services.jobs import requeue_stale_jobs, run_pending
+
+logger = logging.getLogger("app.worker")
+
+POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+BATCH_SIZE = int(os.getenv("JOBS_BATCH_SIZE", "10"))
+STALE_CHECK_INTERVAL = 60.0
+RESCORE_INTERVAL = float(os.getenv("JOBS_RESCORE_INTERVAL", "3600"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background jobs")
+    parser.add_argument("--once", action="store_true", help="drain due jobs and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    logger.info("worker %s started", worker_id)
+    next_stale_check = 0.0
+    next_rescore = 0.0
+    while not stopping:
+        if time.monotonic() >= next_stale_check:
+            db = SessionLocal()
+            try:
+                requeued = requeue_stale_jobs(db)
+            finally:
+                db.close()
+            if requeued:
+                logger.warning("requeued %d stale jobs", requeued)
+            next_stale_check = time.monotonic() + STALE_CHECK_INTERVAL
+
+        if time.monotonic() >= next_rescore:
+            db = SessionLocal()
+            try:
+                enqueue_open_work_rescore(db)
+                db.commit()
+            finally:
+                db.close()
+            next_rescore = time.monotonic() + RESCORE_INTERVAL
+
+        claimed = run_pending(SessionLocal, worker_id, BATCH_SIZE)
+        if not claimed:
+            if args.once:
+                break
+            time.sleep(POLL_INTERVAL)
+    logger.info("worker %s stopped", worker_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import os
+import tempfile
+
+# app.db.session builds its engines at import time, so point them at the
+# benchmark database before any test imports the app. Never reuse a
+# DATABASE_URL from .env: the benchmarks drop and recreate every table.
+os.environ["DATABASE_URL"] = os.getenv(
+    "BENCH_DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='recach-bench-'), 'bench.db')}",
+)
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ.setdefault("QUERY_PROFILER", "1")
+os.environ.setdefault("ADMIN_EMAIL", "bench-admin@example.com")
@@ -0,0 +1,72 @@
+import pytest
+from jose import ExpiredSignatureError
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core import jwt as jwt_utils
+from app.core.jwt import create_access_token, verify_access_token
+from app.db.models import User
+from app.services import principals
+from app.services.principals import Principal, resolve_principal
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.add(User(id=1, full_name="Ada", email="ada@example.com", username="ada", status="APPROVED"))
+    session.commit()
+    session.statements = statements
+    yield session
+    session.close()
+    principals._principals.clear()
+
+
+def test_verified_tokens_are_cached(monkeypatch):
+    token = create_access_token("7")
+    assert verify_access_token(token)["sub"] == "7"
+
+    def fail(token):
+        raise AssertionError("signature checked again")
+
+    monkeypatch.setattr(jwt_utils, "decode_access_token", fail)
+    assert verify_access_token(token)["sub"] == "7"
+
+
+def test_expired_tokens_are_not_cached():
+    token = create_access_token("7", expires_minutes=-1)
+    with pytest.raises(ExpiredSignatureError):
+        verify_access_token(token)
+    assert jwt_utils._verified_tokens.get(token) is None
+
+
+def test_principal_is_cached_until_the_user_changes(db):
+    db.statements.clear()
+    assert resolve_principal(db, 1, {}) == Principal(id=1, username="ada", status="APPROVED")
+    assert resolve_principal(db, 1, {}).username == "ada"
+    assert len(db.statements) == 1
+
+    user = db.get(User, 1)
+    user.username = "lovelace"
+    db.flush()
+    assert resolve_principal(db, 1, {}).username == "ada"  # not committed yet
+
+    db.commit()
+    assert resolve_principal(db, 1, {}).username == "lovelace"
+
+
+def test_embedded_claims_skip_the_user_lookup(db, monkeypatch):
+    monkeypatch.setenv("JWT_EMBED_CLAIMS", "1")
+    token = create_access_token("1", claims=principals.principal_claims(db.get(User, 1)))
+    principals._principals.clear()
+    db.statements.clear()
+    assert resolve_principal(db, 1, verify_access_token(token)) == Principal(id=1, username="ada", status="APPROVED")
+    assert db.statements == []
+
+
+def test_claims_are_opt_in_and_unknown_users_resolve_to_none(db):
+    assert principals.principal_claims(db.get(User, 1)) == {}
+    assert resolve_principal(db, 99, {}) is None
@@ -0,0 +1,63 @@
+from collections import Counter
+
+from sqlalchemy import create_engine, func, select
+
+from app.db.base import Base
+from app.tools import datagen
+
+
+def _load(seed=42, users=60):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    datagen.load(engine, datagen.Scale(users=users), seed=seed, batch_size=50)
+    return engine
+
+
+def _rows(engine, table):
+    columns = Base.metadata.tables[table]
+    with engine.connect() as conn:
+        return conn.execute(select(columns).order_by(*columns.primary_key.columns)).all()
+
+
+def test_same_seed_gives_same_rows():
+    first, second, other = _load(), _load(), _load(seed=7)
+    for table in datagen.GENERATORS:
+        assert _rows(first, table) == _rows(second, table), table
+    assert _rows(first, "recommendations") != _rows(other, "recommendations")
+
+
+def test_rows_respect_model_constraints():
+    engine = _load(users=300)
+    tables = Base.metadata.tables
+    with engine.connect() as conn:
+        posts = {row.id: row for row in conn.execute(select(tables["posts"]))}
+        carets = conn.execute(select(tables["post_carets"])).all()
+        courses = {row.id: row.user_id for row in conn.execute(select(tables["user_courses"]))}
+        contact_requests = conn.execute(select(tables["contact_requests"])).all()
+        entries = {row.id: row.verification_status for row in conn.execute(select(tables["education_entries"]))}
+        verifications = conn.execute(
+            select(tables["verification_requests"]).where(tables["verification_requests"].c.subject_type == "EDUCATION")
+        ).all()
+        recommenders = Counter(
+            recommender for (recommender,) in conn.execute(select(tables["recommendations"].c.recommender_id))
+        )
+        self_recommendations = conn.execute(
+            select(func.count()).where(
+                tables["recommendations"].c.requester_id == tables["recommendations"].c.recommender_id
+            )
+        ).scalar_one()
+
+    assert len({(caret.post_id, caret.user_id) for caret in carets}) == len(carets)
+    assert all(posts[caret.post_id].user_id != caret.user_id for caret in carets)
+    per_post = Counter(caret.post_id for caret in carets)
+    assert all(post.caret_count == per_post[post.id] for post in posts.values())
+
+    assert all(courses[request.course_id] == request.target_id for request in contact_requests)
+    assert all(request.requester_id != request.target_id for request in contact_requests)
+
+    assert {
+        request.subject_id: datagen.REQUEST_STATUS[entries[request.subject_id]] for request in verifications
+    } == {request.subject_id: request.status for request in verifications}
+
+    assert self_recommendations == 0
+    assert recommenders.most_common(1)[0][0] == 1
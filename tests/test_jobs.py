@@ -0,0 +1,174 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, or_, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.job import Job
+from app.db.user_score import UserScore
+from app.db.work_experience import WorkExperience
+from app.services import jobs
+from app.services.job_handlers import enqueue_open_work_rescore
+from app.services.jobs import (
+    DONE,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    backoff_seconds,
+    claim_jobs,
+    enqueue,
+    job_handler,
+    requeue_stale_jobs,
+    run_pending,
+)
+from app.services.scores import get_achievement_totals
+from app.tools import datagen
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Job.__table__.create(engine)
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+@pytest.fixture
+def calls():
+    seen = []
+
+    @job_handler("test.record")
+    def record(db, payload):
+        seen.append(payload["n"])
+
+    @job_handler("test.fail")
+    def fail(db, payload):
+        raise RuntimeError("boom")
+
+    yield seen
+    jobs.HANDLERS.pop("test.record")
+    jobs.HANDLERS.pop("test.fail")
+
+
+def test_idempotency_key_enqueues_once(session_factory, calls):
+    db = session_factory()
+    enqueue(db, "test.record", {"n": 1}, idempotency_key="same")
+    enqueue(db, "test.record", {"n": 2}, idempotency_key="same")
+    enqueue(db, "test.record", {"n": 3})
+    db.commit()
+
+    assert run_pending(session_factory, "w1") == 2
+    assert sorted(calls) == [1, 3]
+    assert {job.status for job in db.query(Job).all()} == {DONE}
+
+
+def test_uncommitted_jobs_are_not_run(session_factory, calls):
+    db = session_factory()
+    enqueue(db, "test.record", {"n": 1})
+    db.rollback()
+
+    assert run_pending(session_factory, "w1") == 0
+    assert calls == []
+
+
+def test_failures_back_off_then_fail(session_factory, calls):
+    db = session_factory()
+    enqueue(db, "test.fail", {}, max_attempts=2)
+    db.commit()
+
+    assert run_pending(session_factory, "w1") == 1
+    job = db.query(Job).one()
+    assert job.status == QUEUED
+    assert job.attempts == 1
+    assert job.run_at > datetime.utcnow()
+    assert "boom" in job.last_error
+
+    # not due yet
+    assert run_pending(session_factory, "w1") == 0
+
+    job.run_at = datetime.utcnow()
+    db.commit()
+    assert run_pending(session_factory, "w1") == 1
+    db.expire_all()
+    job = db.query(Job).one()
+    assert job.status == FAILED
+    assert job.attempts == 2
+
+
+def test_inline_mode_runs_only_the_committing_sessions_jobs(session_factory, calls, monkeypatch):
+    monkeypatch.setenv("JOBS_INLINE", "1")
+    monkeypatch.setattr("app.db.session.SessionLocal", session_factory)
+    db = session_factory()
+    # queued by someone else (a request whose worker hasn't picked it up yet)
+    db.add(Job(kind="test.record", payload={"n": 1}, status=QUEUED, run_at=datetime.utcnow()))
+    db.commit()
+
+    enqueue(db, "test.record", {"n": 2})
+    db.commit()
+
+    assert calls == [2]
+    assert sorted(job.status for job in db.query(Job).all()) == [DONE, QUEUED]
+
+
+def test_job_taken_over_while_running_does_not_commit(tmp_path):
+    # a file database so the "other worker" gets its own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Job.__table__.create(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    @job_handler("test.slow")
+    def slow(db, payload):
+        db.add(Job(kind="test.side_effect", payload={}, status=DONE))
+        # meanwhile the lock times out and another worker claims the job
+        other = session_factory()
+        requeue_stale_jobs(other, timeout=0)
+        assert claim_jobs(other, "w2")
+        other.close()
+
+    try:
+        db = session_factory()
+        enqueue(db, "test.slow", {})
+        db.commit()
+        assert run_pending(session_factory, "w1") == 1
+    finally:
+        jobs.HANDLERS.pop("test.slow")
+
+    job = db.query(Job).one()
+    assert (job.status, job.locked_by) == (RUNNING, "w2")
+
+
+def test_open_work_rescore_refreshes_frozen_totals_once_a_day():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    datagen.load(engine, datagen.Scale(users=40))
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    open_work = {
+        user_id
+        for (user_id,) in db.query(WorkExperience.user_id).filter(
+            WorkExperience.verification_status == "VERIFIED",
+            or_(WorkExperience.is_current.is_(True), WorkExperience.end_date.is_(None)),
+        )
+    }
+    assert open_work
+    # as if stored a few months ago
+    db.execute(update(UserScore).values(achievement_total=0))
+    enqueue_open_work_rescore(db, date(2026, 3, 1))
+    enqueue_open_work_rescore(db, date(2026, 3, 1))
+    db.commit()
+
+    while run_pending(session_factory, "w1"):
+        pass
+
+    stored = dict(db.query(UserScore.user_id, UserScore.achievement_total))
+    live = get_achievement_totals(db, open_work)
+    assert {user_id: stored[user_id] for user_id in open_work} == live
+    assert db.query(Job).filter(Job.kind == "scores.open_work_rescore").count() == 1
+    assert {job.status for job in db.query(Job)} == {DONE}
+    db.close()
+
+
+def test_backoff_grows_and_is_capped():
+    assert 2.5 <= backoff_seconds(1) <= 5
+    assert 10 <= backoff_seconds(3) <= 20
+    assert backoff_seconds(30) <= jobs.BACKOFF_MAX_SECONDS
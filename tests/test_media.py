@@ -0,0 +1,72 @@
+import os
+from datetime import datetime, timedelta
+
+import anyio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import media
+from app.core.media_storage import LocalMediaStorage, blob_url, content_key
+
+DATA = bytes(range(256)) * 40
+
+# FileResponse uses anyio.open_file, which anyio imports lazily; resolve it
+# here so pytest's assertion rewriting of anyio never runs on the portal thread
+anyio.open_file
+
+
+def _client(tmp_path, monkeypatch):
+    storage = LocalMediaStorage(str(tmp_path))
+    monkeypatch.setattr(media, "media_storage", storage)
+    app = FastAPI()
+    app.include_router(media.router)
+    return TestClient(app), storage
+
+
+def test_serves_blob_with_immutable_caching(tmp_path, monkeypatch):
+    client, storage = _client(tmp_path, monkeypatch)
+    key = content_key(DATA, "jpg")
+    storage.put(key, DATA)
+
+    response = client.get(blob_url(key))
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert response.headers["content-type"] == "image/jpeg"
+    assert response.headers["cache-control"] == media.IMMUTABLE
+    assert response.headers["etag"] == f'"{key.split(".")[0]}"'
+
+    revalidated = client.get(blob_url(key), headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
+def test_range_requests(tmp_path, monkeypatch):
+    client, storage = _client(tmp_path, monkeypatch)
+    key = content_key(DATA, "webp")
+    storage.put(key, DATA)
+
+    response = client.get(blob_url(key), headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == DATA[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(DATA)}"
+
+
+def test_unknown_or_malformed_keys_are_404(tmp_path, monkeypatch):
+    client, _ = _client(tmp_path, monkeypatch)
+    assert client.get(blob_url(content_key(b"missing", "jpg"))).status_code == 404
+    assert client.get(blob_url("../../etc/passwd")).status_code == 404
+    assert client.get(blob_url("abc.png")).status_code == 404
+
+
+def test_put_is_idempotent_and_lists_keys(tmp_path):
+    storage = LocalMediaStorage(str(tmp_path))
+    key = content_key(DATA, "jpg")
+    storage.put(key, DATA)
+    old = (datetime.now() - timedelta(days=3)).timestamp()
+    os.utime(storage.path(key), (old, old))
+
+    storage.put(key, DATA)  # refreshes the mtime instead of rewriting
+    [(listed, stored_at)] = list(storage.iter_keys())
+    assert listed == key
+    assert stored_at > datetime.utcnow() - timedelta(minutes=1)
+    assert storage.read(key) == DATA
@@ -0,0 +1,54 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics
+from app.core.metrics import GaugeFamily, Histogram, MetricsMiddleware
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        in_flight = metrics.IN_FLIGHT.value("GET", "/items/{item_id}")
+        return {"item_id": item_id, "in_flight": in_flight}
+
+    @app.get("/metrics")
+    def scrape():
+        return PlainTextResponse(metrics.render([GaugeFamily("jobs_queue_depth", "Jobs.").add(value=3)]))
+
+    return TestClient(app)
+
+
+def test_requests_are_recorded_per_route_template():
+    client = _client()
+    before = metrics.LATENCY.count("GET", "/items/{item_id}")
+    assert client.get("/items/1").json()["in_flight"] == 1
+    client.get("/items/2")
+    client.get("/nope")
+
+    assert metrics.LATENCY.count("GET", "/items/{item_id}") == before + 2
+    assert metrics.IN_FLIGHT.value("GET", "/items/{item_id}") == 0
+    assert metrics.REQUESTS.value("GET", "unmatched", "404") >= 1
+
+    body = client.get("/metrics").text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/items/{item_id}",le="+Inf"}' in body
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"}' in body
+    assert "jobs_queue_depth 3" in body
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe("/a", value=value)
+
+    assert histogram.samples() == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 4.25',
+        'latency_seconds_count{route="/a"} 4',
+    ]
@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 12, 30, 5, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42), int) == [created_at, 42]
+
+
+def test_cursor_round_trip_with_uuid_and_extra_key():
+    created_at = datetime(2025, 3, 1)
+    item_id = uuid.uuid4()
+    cursor = encode_cursor(created_at, "recommendation", item_id)
+    assert decode_cursor(cursor, str, uuid.UUID) == [created_at, "recommendation", item_id]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "garbage",
+        "",
+        encode_cursor(datetime(2025, 1, 1), 1, 2),
+        encode_cursor(datetime(2025, 1, 1), "x"),
+        encode_cursor(datetime(2025, 1, 1), {"id": 1}),
+        encode_cursor(datetime(2025, 1, 1), True),
+    ],
+)
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, int)
+    assert exc.value.status_code == 400
+
+
+def test_malformed_uuid_tie_breaker_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(encode_cursor(datetime(2025, 1, 1), "not-a-uuid"), uuid.UUID)
+    assert exc.value.status_code == 400
@@ -0,0 +1,63 @@
+import hashlib
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from app.services.photos import (
+    InvalidImage,
+    VARIANT_SIZES,
+    avatar_url,
+    render_variants,
+    variant_urls,
+)
+
+
+def _jpeg(size, **save_options) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(out, format="JPEG", **save_options)
+    return out.getvalue()
+
+
+def test_variants_are_square_sized_and_content_named():
+    variants = render_variants(_jpeg((1200, 800)))
+
+    assert [(v.size, v.format) for v in variants] == [
+        (size, fmt) for size in VARIANT_SIZES for fmt in ("webp", "jpeg")
+    ]
+    for variant in variants:
+        with Image.open(io.BytesIO(variant.data)) as image:
+            assert image.size == (variant.size, variant.size)
+        ext = "jpg" if variant.format == "jpeg" else "webp"
+        assert variant.key == f"{hashlib.sha256(variant.data).hexdigest()}.{ext}"
+
+
+def test_metadata_is_stripped():
+    exif = Image.Exif()
+    exif[0x010F] = "SecretCam"  # Make
+    variants = render_variants(_jpeg((600, 600), exif=exif.tobytes()))
+    for variant in variants:
+        with Image.open(io.BytesIO(variant.data)) as image:
+            assert not image.getexif()
+            assert b"SecretCam" not in variant.data
+
+
+def test_small_uploads_are_not_upscaled():
+    sizes = {v.size: v for v in render_variants(_jpeg((100, 100)))}
+    with Image.open(io.BytesIO(sizes[512].data)) as image:
+        assert image.size == (100, 100)
+
+
+def test_rejects_non_images():
+    with pytest.raises(InvalidImage):
+        render_variants(b"<svg></svg>")
+
+
+def test_avatar_prefers_small_webp_variant():
+    urls = variant_urls(render_variants(_jpeg((600, 600))))
+    profile = SimpleNamespace(profile_photo_url=urls["512"]["jpeg"], profile_photo_variants=urls)
+
+    assert avatar_url(profile) == urls["128"]["webp"]
+    assert avatar_url(SimpleNamespace(profile_photo_url="/x.jpg", profile_photo_variants=None)) == "/x.jpg"
+    assert avatar_url(None) is None
@@ -0,0 +1,188 @@
+"""
+Query-count regression suite.
+
+Loads the app.tools.datagen dataset at BENCH_USERS users
+and at BENCH_GROWTH times that, calls every GET endpoint with cold caches
+and compares SQL statement counts (read from the Server-Timing header the
+query profiler adds). An endpoint whose statement count grows with the data
+has an N+1 loop and fails here.
+
+Latency percentiles are collected too, but only reported: set BENCH_REPORT
+to a path to get them as JSON. Point BENCH_DATABASE_URL at a scratch
+Postgres database to benchmark there instead of SQLite (see conftest.py).
+"""
+import json
+import os
+import re
+import statistics
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, update
+
+from app.api.admin_auth import ADMIN_EMAIL
+from app.core import jwt as jwt_utils
+from app.core.jwt import create_access_token
+from app.core.shared_cache import MemoryBackend, shared_cache
+from app.db.base import Base
+from app.db.contact_method import ContactMethod
+from app.db.contact_request import ContactRequest
+from app.db.models import User
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.services import principals
+from app.services.course_key import normalize_course_number
+from app.services.user_scores import rebuild_user_scores
+from app.tools import datagen
+
+BENCH_USERS = int(os.getenv("BENCH_USERS", "20"))
+BENCH_GROWTH = int(os.getenv("BENCH_GROWTH", "4"))
+BENCH_REPEAT = int(os.getenv("BENCH_REPEAT", "3"))
+
+USER, ADMIN, ANONYMOUS = "user", "admin", None
+
+# GET path templates (filled from _seed()) and who calls them
+ENDPOINTS = {
+    "/users/me/achievement": USER,
+    "/users/me/recommendation-score": USER,
+    "/users/me/reflection-caret-score": USER,
+    "/users/me/caret-notifications": USER,
+    "/education/{education_id}/score": ANONYMOUS,
+    "/users/{user_id}/achievement": ANONYMOUS,
+    "/work/{work_id}/score": ANONYMOUS,
+    "/recommendations/pending": USER,
+    "/users/{user_id}/recommendation-score": ANONYMOUS,
+    "/me/profile": USER,
+    "/public/users/search?q=user": ANONYMOUS,
+    "/public/users/{username}": ANONYMOUS,
+    "/admin/verifications": ADMIN,
+    "/admin/cache/stats": ADMIN,
+    "/feed": ANONYMOUS,
+    "/leaderboard/combined": ANONYMOUS,
+    "/leaderboard/me": USER,
+    "/leaderboard/achievements": ANONYMOUS,
+    "/leaderboard/recommendations": ANONYMOUS,
+    "/reflections": USER,
+    "/reflections/{reflection_id}": USER,
+    "/posts": USER,
+    "/posts/{post_id}": USER,
+    "/posts/{post_id}/replies": USER,
+    "/api/courses/me": USER,
+    "/api/courses/search?q=cap": USER,
+    "/api/courses/groups/{course_key}/people": USER,
+    "/api/profile/contact-method/me": USER,
+    "/api/contact-requests/{contact_request_id}/contact": USER,
+    "/api/inbox": USER,
+    "/inbox/posts": USER,
+    "/metrics": ANONYMOUS,
+    "/health": ANONYMOUS,
+}
+
+# GET routes with nothing to measure here
+NOT_BENCHMARKED = {"/openapi.json", "/docs", "/docs/oauth2-redirect", "/redoc", "/media/blobs/{key}"}
+
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def _cold_caches() -> None:
+    shared_cache.backend = MemoryBackend()
+    principals._principals.clear()
+    jwt_utils._verified_tokens.clear()
+
+
+def _seed(users: int) -> SimpleNamespace:
+    """Load the dataset and return the ids the path templates need.
+
+    Requests are made as user 1, the recommendation hub: datagen draws both
+    ends of every edge Zipf-distributed, so user 1's recommendations grow
+    with the dataset and per-row loops over them cost extra statements.
+    """
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    datagen.load(engine, datagen.Scale(users=users))
+    db = SessionLocal()
+    try:
+        db.execute(update(User).where(User.id == 1).values(status="APPROVED"))
+        request = db.execute(select(ContactRequest).where(ContactRequest.requester_id == 1)).scalar_one()
+        request.status = "ACCEPTED"
+        if db.execute(select(ContactMethod).where(ContactMethod.user_id == request.target_id)).first() is None:
+            db.execute(insert(ContactMethod).values(
+                user_id=request.target_id, method="EMAIL", value="target@example.com"
+            ))
+        db.commit()
+        rebuild_user_scores(db)
+        contact_request_id = request.id
+    finally:
+        db.close()
+    return SimpleNamespace(
+        username="user1",
+        user_id=1,
+        post_id=1,
+        reflection_id=1,
+        education_id=1,
+        work_id=1,
+        course_key=normalize_course_number(datagen.CATALOG[0][0]),
+        contact_request_id=contact_request_id,
+    )
+
+
+def _run(users: int) -> dict[str, dict]:
+    dataset = _seed(users)
+
+    client = TestClient(app)
+    headers = {
+        USER: {"Authorization": f"Bearer {create_access_token(str(dataset.user_id))}"},
+        ADMIN: {"Authorization": f"Bearer {create_access_token(f'admin:{ADMIN_EMAIL}')}"},
+        ANONYMOUS: {},
+    }
+    results = {}
+    for template, caller in ENDPOINTS.items():
+        path = template.format(**vars(dataset))
+        queries, latencies, status = [], [], None
+        for _ in range(BENCH_REPEAT):
+            _cold_caches()
+            started = time.perf_counter()
+            response = client.get(path, headers=headers[caller])
+            latencies.append((time.perf_counter() - started) * 1000)
+            status = response.status_code
+            queries.append(int(_QUERIES_RE.search(response.headers["server-timing"]).group(1)))
+        latencies.sort()
+        results[template] = {
+            "status": status,
+            "queries": max(queries),
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+        }
+    return results
+
+
+@pytest.fixture(scope="module")
+def bench():
+    small = _run(BENCH_USERS)
+    large = _run(BENCH_USERS * BENCH_GROWTH)
+    report = {"users": [BENCH_USERS, BENCH_USERS * BENCH_GROWTH], "small": small, "large": large}
+    if os.getenv("BENCH_REPORT"):
+        with open(os.environ["BENCH_REPORT"], "w") as out_file:
+            json.dump(report, out_file, indent=2)
+    return report
+
+
+def test_every_get_route_is_benchmarked():
+    routes = {route.path for route in app.routes if "GET" in getattr(route, "methods", ())}
+    benchmarked = {template.split("?")[0] for template in ENDPOINTS}
+    benchmarked = {
+        path.replace("{contact_request_id}", "{request_id}") for path in benchmarked
+    }
+    assert routes - NOT_BENCHMARKED - benchmarked == set()
+
+
+@pytest.mark.parametrize("template", list(ENDPOINTS))
+def test_statement_count_does_not_grow_with_data(bench, template):
+    small, large = bench["small"][template], bench["large"][template]
+    assert small["status"] == large["status"] == 200
+    assert large["queries"] <= small["queries"], (
+        f"{template}: {small['queries']} statements at {BENCH_USERS} users, "
+        f"{large['queries']} at {BENCH_USERS * BENCH_GROWTH}"
+    )
@@ -0,0 +1,145 @@
+"""
+Index coverage for the hot query shapes.
+
+Loads the app.tools.datagen dataset (BENCH_PLAN_USERS users) and EXPLAINs
+each filter the busy endpoints run, asserting the plan goes through the
+index meant for it. On PostgreSQL (BENCH_DATABASE_URL, see conftest.py)
+sequential scans are disabled for the EXPLAIN, so the assertion is that the
+index matches the shape rather than that it wins at this row count.
+"""
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.db.base import Base
+from app.db.contact_request import ContactRequest
+from app.db.education import EducationEntry
+from app.db.inbox_item import InboxItem
+from app.db.post import Post
+from app.db.post_caret import PostCaret
+from app.db.recommendations import Recommendation
+from app.db.session import engine
+from app.db.verification_request import VerificationRequest
+from app.db.work_experience import WorkExperience
+from app.tools import datagen
+
+BENCH_PLAN_USERS = int(os.getenv("BENCH_PLAN_USERS", "2000"))
+
+USER_IDS = [1, 2, 3, 5, 8]
+
+# name -> (statement, indexes that may serve it)
+HOT_QUERIES = {
+    # scores.get_recommendation_totals, public profile recommenders
+    "approved recommendations received": (
+        select(Recommendation).where(
+            Recommendation.requester_id.in_(USER_IDS), Recommendation.status == "APPROVED"
+        ),
+        {"ix_recommendations_requester_status"},
+    ),
+    # GET /recommendations/pending
+    "pending recommendations to decide": (
+        select(Recommendation)
+        .where(Recommendation.recommender_id == 1, Recommendation.status == "PENDING")
+        .order_by(Recommendation.created_at.desc()),
+        {"ix_recommendations_recommender_status_created_at"},
+    ),
+    # recommendation_graph.dependents_of
+    "approved recommendations given": (
+        select(Recommendation.requester_id, Recommendation.rec_type).where(
+            Recommendation.recommender_id == 1, Recommendation.status == "APPROVED"
+        ),
+        {"ix_recommendations_recommender_status_created_at"},
+    ),
+    # GET /admin/verifications
+    "verification review queue": (
+        select(VerificationRequest)
+        .where(VerificationRequest.status == "PENDING")
+        .order_by(VerificationRequest.created_at.desc()),
+        {"ix_verification_requests_status_created_at"},
+    ),
+    # scores.get_achievement_totals, courses._people_out, public_user
+    "verified education": (
+        select(EducationEntry.user_id, EducationEntry.university_name).where(
+            EducationEntry.user_id.in_(USER_IDS), EducationEntry.verification_status == "VERIFIED"
+        ),
+        {"ix_education_entries_user_status"},
+    ),
+    "verified work": (
+        select(WorkExperience.user_id, WorkExperience.company_name).where(
+            WorkExperience.user_id.in_(USER_IDS), WorkExperience.verification_status == "VERIFIED"
+        ),
+        {"ix_work_experiences_user_status"},
+    ),
+    # achievement_service, /users/{id}/achievement
+    "a user's education": (
+        select(EducationEntry).where(EducationEntry.user_id == 1),
+        {"ix_education_entries_user_status"},
+    ),
+    "a user's work": (
+        select(WorkExperience).where(WorkExperience.user_id == 1),
+        {"ix_work_experiences_user_status"},
+    ),
+    # contact_requests._rate_limit
+    "contact request rate limit": (
+        select(func.count()).select_from(ContactRequest).where(
+            ContactRequest.requester_id == 1,
+            ContactRequest.created_at >= datagen.EPOCH + timedelta(days=180),
+        ),
+        {"ix_contact_requests_requester_created_at"},
+    ),
+    # GET /api/inbox
+    "inbox page": (
+        select(InboxItem)
+        .where(InboxItem.user_id == 1, InboxItem.created_at < datetime(2030, 1, 1))
+        .order_by(InboxItem.created_at.desc(), InboxItem.id.desc())
+        .limit(50),
+        {"ix_inbox_items_user_created_at_id"},
+    ),
+    # GET /users/me/caret-notifications: from the owner's posts to their carets
+    "caret notifications": (
+        select(PostCaret.id)
+        .join(Post, Post.id == PostCaret.post_id)
+        .where(Post.user_id == 1)
+        .order_by(PostCaret.created_at.desc(), PostCaret.id.desc())
+        .limit(50),
+        {"ix_posts_user_created_at_id", "ix_post_carets_post_id"},
+    ),
+    # GET /posts: which of these posts the caller has careted
+    "caret lookup": (
+        select(PostCaret.post_id).where(PostCaret.user_id == 1, PostCaret.post_id.in_(USER_IDS)),
+        {"uq_post_caret", "sqlite_autoindex_post_carets_1"},
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def loaded():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    datagen.load(engine, datagen.Scale(users=BENCH_PLAN_USERS))
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return engine
+
+
+def _plan(conn, statement) -> str:
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+        return "\n".join(row[-1] for row in rows)
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    rows = conn.exec_driver_sql(f"EXPLAIN {compiled}", params).all()
+    return "\n".join(row[0] for row in rows)
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_its_index(loaded, name):
+    statement, indexes = HOT_QUERIES[name]
+    with loaded.begin() as conn:
+        plan = _plan(conn, statement)
+    assert any(index in plan for index in indexes), f"{name}:\n{plan}"
@@ -0,0 +1,62 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import query_profiler
+from app.core.query_profiler import QueryProfilerMiddleware, statement_shape
+
+
+def _client():
+    engine = create_engine("sqlite://")
+    async_engine = create_async_engine("sqlite+aiosqlite://")
+    app = FastAPI()
+    app.add_middleware(QueryProfilerMiddleware)
+
+    @app.get("/loop")
+    def loop():
+        with engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :n"), {"n": i})
+            conn.execute(text("SELECT count(*) FROM sqlite_master"))
+        return {}
+
+    @app.get("/async")
+    async def run_async():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {}
+
+    return TestClient(app)
+
+
+def test_counts_statements_and_sets_server_timing():
+    client = _client()
+    timing = client.get("/loop").headers["server-timing"]
+    assert 'desc="4 queries"' in timing
+    assert timing.startswith("db;dur=") and ", app;dur=" in timing
+
+    assert 'desc="2 queries"' in client.get("/async").headers["server-timing"]
+
+
+def test_logs_slow_requests_with_repeated_shapes(monkeypatch, caplog):
+    monkeypatch.setattr(query_profiler, "SLOW_REQUEST_QUERIES", 3)
+    with caplog.at_level(logging.WARNING, logger="app.core.query_profiler"):
+        _client().get("/loop")
+
+    [record] = caplog.records
+    assert record.queries == 4
+    assert record.repeated_statements == [("SELECT ?", 3)]
+    assert "3x SELECT ?" in record.getMessage()
+
+
+def test_statement_shape_folds_literals_and_in_lists():
+    assert statement_shape("SELECT * FROM t\n WHERE id IN (?, ?, ?) AND name = 'x'") == (
+        "SELECT * FROM t WHERE id IN (?) AND name = ?"
+    )
+    assert statement_shape("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)") == (
+        "SELECT * FROM t WHERE id IN (?)"
+    )
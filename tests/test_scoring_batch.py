@@ -0,0 +1,109 @@
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.scoring.education_score import score_education_batch, score_education_entry
+from app.scoring.work_score import score_work_batch, score_work_entry
+from app.scoring.work_streak import compute_company_streaks, compute_company_streaks_batch
+
+TODAY = date(2026, 2, 1)
+
+DEGREES = ["bachelor", "master", "phd", " PhD ", "Master", "associate", "", None]
+GPAS = [None, 0.0, 2.99, 3.0, 3.29, 3.3, 3.5, 3.69, 3.7, 3.89, 3.9, 4.0]
+EMPLOYMENT_TYPES = ["internship", "full_time", "part_time", "contract", " Full_Time", "freelance", "", None]
+COMPANIES = ["Acme", " acme ", "ACME", "Globex", "", None]
+
+
+def _random_date(rng: random.Random) -> date:
+    return date(2015, 1, 1) + timedelta(days=rng.randint(0, 4000))
+
+
+def test_education_batch_matches_scalar():
+    rng = random.Random(7)
+    rows = [
+        (
+            rng.randint(1, 20),
+            rng.randint(0, 6),
+            rng.choice(DEGREES),
+            rng.random() < 0.7,
+            rng.choice(GPAS),
+        )
+        for _ in range(500)
+    ]
+    user_ids, tiers, degrees, completed, gpas = zip(*rows)
+
+    points, totals = score_education_batch(user_ids, tiers, degrees, completed, gpas)
+
+    expected_totals: dict[int, int] = {}
+    for i, (user_id, tier, degree, done, gpa) in enumerate(rows):
+        expected = score_education_entry(tier, degree, done, gpa)["total"]
+        assert points[i] == expected
+        expected_totals[user_id] = expected_totals.get(user_id, 0) + expected
+    assert totals == expected_totals
+
+
+def test_work_batch_matches_scalar():
+    rng = random.Random(11)
+    rows = []
+    for _ in range(500):
+        start = _random_date(rng)
+        end = rng.choice([None, _random_date(rng), start, start + timedelta(days=rng.randint(0, 1500))])
+        rows.append((rng.randint(1, 20), rng.choice(EMPLOYMENT_TYPES), start, end, rng.random() < 0.2))
+    user_ids, types, starts, ends, current = zip(*rows)
+
+    points, totals = score_work_batch(user_ids, types, starts, ends, current, today=TODAY)
+
+    expected_totals: dict[int, int] = {}
+    for i, (user_id, employment_type, start, end, is_current) in enumerate(rows):
+        end_dt = TODAY if is_current or end is None else end
+        expected = score_work_entry(employment_type, start, end_dt)["total"]
+        assert points[i] == expected
+        expected_totals[user_id] = expected_totals.get(user_id, 0) + expected
+    assert totals == expected_totals
+
+
+def test_streak_batch_matches_scalar(monkeypatch):
+    import app.scoring.work_streak as work_streak
+
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return TODAY
+
+    monkeypatch.setattr(work_streak, "date", FixedDate)
+
+    rng = random.Random(3)
+    rows = []
+    for _ in range(400):
+        start = rng.choice([None, _random_date(rng), _random_date(rng)])
+        end = rng.choice([None, _random_date(rng), start])
+        rows.append(
+            SimpleNamespace(
+                user_id=rng.randint(1, 15),
+                company_name=rng.choice(COMPANIES),
+                start_date=start,
+                end_date=end,
+                is_current=rng.random() < 0.2,
+            )
+        )
+
+    totals = compute_company_streaks_batch(
+        [w.user_id for w in rows],
+        [w.company_name for w in rows],
+        [w.start_date for w in rows],
+        [w.end_date for w in rows],
+        [w.is_current for w in rows],
+        today=TODAY,
+    )
+
+    for user_id in {w.user_id for w in rows}:
+        expected, _breakdown = compute_company_streaks([w for w in rows if w.user_id == user_id])
+        assert totals[user_id] == expected
+
+
+def test_batch_scorers_handle_empty_input():
+    points, totals = score_education_batch([], [], [], [], [])
+    assert points.size == 0 and totals == {}
+    points, totals = score_work_batch([], [], [], [], [], today=TODAY)
+    assert points.size == 0 and totals == {}
+    assert compute_company_streaks_batch([], [], [], [], [], today=TODAY) == {}
@@ -0,0 +1,209 @@
+import asyncio
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core import shared_cache as shared_cache_module
+from app.core.redis_client import RedisClient
+from app.core.shared_cache import MemoryBackend, RedisBackend, SharedCache, invalidate_tags_on_commit
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Just enough of the Redis protocol for the cache backend."""
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:])
+        args = []
+        for _ in range(count):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def reply(self, value):
+        if value is None:
+            self.wfile.write(b"$-1\r\n")
+        elif value is True:
+            self.wfile.write(b"+OK\r\n")
+        elif isinstance(value, int):
+            self.wfile.write(b":%d\r\n" % value)
+        elif isinstance(value, bytes):
+            self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+        elif isinstance(value, list):
+            self.wfile.write(b"*%d\r\n" % len(value))
+            for item in value:
+                self.reply(item)
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            cmd, *rest = args
+            cmd = cmd.upper()
+            with self.server.lock:
+                now = time.monotonic()
+                for key in [k for k, (_, exp) in store.items() if exp and exp <= now]:
+                    del store[key]
+                if cmd == b"GET":
+                    entry = store.get(rest[0])
+                    self.reply(entry[0] if entry else None)
+                elif cmd == b"SET":
+                    key, value, *opts = rest
+                    opts = [o.upper() for o in opts]
+                    if b"NX" in opts and key in store:
+                        self.reply(None)
+                        continue
+                    expires = None
+                    if b"PX" in opts:
+                        expires = now + int(opts[opts.index(b"PX") + 1]) / 1000
+                    store[key] = (value, expires)
+                    self.reply(True)
+                elif cmd == b"DEL":
+                    self.reply(sum(1 for key in rest if store.pop(key, None) is not None))
+                elif cmd == b"SADD":
+                    members, expires = store.get(rest[0], (set(), None))
+                    members = set(members) | set(rest[1:])
+                    store[rest[0]] = (members, expires)
+                    self.reply(len(rest) - 1)
+                elif cmd == b"SMEMBERS":
+                    self.reply(sorted(store.get(rest[0], (set(), None))[0]))
+                elif cmd == b"RENAME":
+                    if rest[0] not in store:
+                        self.wfile.write(b"-ERR no such key\r\n")
+                        continue
+                    store[rest[1]] = store.pop(rest[0])
+                    self.reply(True)
+                elif cmd == b"PEXPIRE":
+                    if rest[0] in store:
+                        store[rest[0]] = (store[rest[0]][0], now + int(rest[1]) / 1000)
+                    self.reply(1)
+                else:
+                    self.reply(True)
+
+
+@pytest.fixture
+def redis_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeRedisHandler)
+    server.daemon_threads = True
+    server.store = {}
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def redis_url(redis_server):
+    return f"redis://127.0.0.1:{redis_server.server_address[1]}/0"
+
+
+def test_redis_client_round_trip(redis_url):
+    client = RedisClient(redis_url)
+    assert client.execute("SET", "k", "v", "PX", 1000) == "OK"
+    assert client.execute("GET", "k") == b"v"
+    assert client.execute("SET", "k", "w", "PX", 1000, "NX") is None
+    assert client.pipeline(("DEL", "k"), ("GET", "k")) == [1, None]
+
+
+def test_set_get_and_tag_invalidation(redis_url):
+    cache = SharedCache(RedisBackend(redis_url))
+
+    async def scenario():
+        await cache.set("profile:alice", {"id": 1}, ttl=60, tags=["user:1"])
+        await cache.set("profile:bob", {"id": 2}, ttl=60, tags=["user:2"])
+        assert await cache.get("profile:alice") == {"id": 1}
+        cache.invalidate_tags("user:1")
+        assert await cache.get("profile:alice") is None
+        assert await cache.get("profile:bob") == {"id": 2}
+
+    asyncio.run(scenario())
+
+
+def test_invalidation_claims_the_tag_set(redis_server, redis_url):
+    backend = RedisBackend(redis_url)
+    backend.set("a", b"1", 60, tags=["t"])
+    backend.invalidate_tags("t", "untagged")
+    backend.set("b", b"2", 60, tags=["t"])
+
+    assert backend.get("a") is None
+    # nothing left behind but the fresh set and the new entry
+    assert set(redis_server.store) == {b"b", b"tag:t"}
+    assert redis_server.store[b"tag:t"][0] == {b"b"}
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_concurrent_misses_compute_once(backend, redis_url):
+    if backend == "memory":
+        shared = MemoryBackend()
+        workers = [SharedCache(shared, poll_interval=0.01)]
+    else:
+        # two caches on one server stand in for two worker processes
+        workers = [SharedCache(RedisBackend(redis_url), poll_interval=0.01) for _ in range(2)]
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"value": 42}
+
+    async def scenario():
+        return await asyncio.gather(
+            *(workers[i % len(workers)].get_or_compute("board", compute, ttl=60) for i in range(20))
+        )
+
+    results = asyncio.run(scenario())
+    assert calls == 1
+    assert all(result == {"value": 42} for result in results)
+
+
+def test_unreachable_backend_degrades_to_computing():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    cache = SharedCache(RedisBackend(f"redis://127.0.0.1:{port}/0", timeout=0.2))
+
+    async def compute():
+        return [1, 2, 3]
+
+    assert asyncio.run(cache.get_or_compute("k", compute, ttl=60)) == [1, 2, 3]
+    assert cache.stats()["errors"] > 0
+
+
+def test_async_commit_invalidates_blocking_backend_off_the_event_loop(monkeypatch):
+    invalidated_on = []
+
+    class BlockingBackend(MemoryBackend):
+        blocking = True
+
+        def invalidate_tags(self, *tags):
+            invalidated_on.append(threading.get_ident())
+            super().invalidate_tags(*tags)
+
+    monkeypatch.setattr(shared_cache_module.shared_cache, "backend", BlockingBackend())
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def scenario():
+        async with AsyncSession(engine) as db:
+            invalidate_tags_on_commit(db, "user:1")
+            await db.commit()
+        for _ in range(100):
+            if invalidated_on:
+                break
+            await asyncio.sleep(0.01)
+        await engine.dispose()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert invalidated_on and invalidated_on[0] != loop_thread
+
@@ -0,0 +1,56 @@
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.uploads import read_upload
+
+MAX_BYTES = 1024
+
+
+def _client(tmp_path):
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        result = await read_upload(request, MAX_BYTES, directory=str(tmp_path))
+        with open(result.path, "rb") as in_file:
+            body = in_file.read()
+        os.remove(result.path)
+        return {"filename": result.filename, "content_type": result.content_type, "size": result.size, "body": body.decode()}
+
+    return TestClient(app)
+
+
+def test_streams_named_file_part(tmp_path):
+    response = _client(tmp_path).post(
+        "/upload",
+        data={"note": "hi"},
+        files={"file": ("a.txt", b"hello world", "text/plain")},
+    )
+    assert response.json() == {"filename": "a.txt", "content_type": "text/plain", "size": 11, "body": "hello world"}
+    assert os.listdir(tmp_path) == []
+
+
+def test_aborts_when_the_part_exceeds_the_limit(tmp_path):
+    def body():
+        yield b'--XX\r\nContent-Disposition: form-data; name="file"; filename="a.bin"\r\n\r\n'
+        for _ in range(100):
+            yield b"x" * 512
+
+    response = _client(tmp_path).post(
+        "/upload", content=body(), headers={"Content-Type": "multipart/form-data; boundary=XX"}
+    )
+    assert response.status_code == 413
+    assert os.listdir(tmp_path) == []
+
+
+def test_rejects_by_content_length_before_reading(tmp_path):
+    response = _client(tmp_path).post("/upload", files={"file": ("a.bin", b"x" * 100_000)})
+    assert response.status_code == 413
+
+
+def test_missing_field(tmp_path):
+    response = _client(tmp_path).post("/upload", files={"other": ("a.txt", b"x")})
+    assert response.status_code == 422
+    assert os.listdir(tmp_path) == []
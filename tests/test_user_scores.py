@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.post import Post
+from app.db.user_score import UserScore
+from app.services.carets import toggle_caret
+from app.services.score_ranks import top_combined
+from app.services.user_scores import (
+    _apply_recommendation_deltas,
+    ensure_user_score,
+    rebuild_user_scores,
+)
+from app.tools import datagen
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    datagen.load(engine, datagen.Scale(users=40))
+    session = sessionmaker(bind=engine)()
+    rebuild_user_scores(session)
+    yield session
+    session.close()
+
+
+def _stored(db, user_id):
+    score = db.get(UserScore, user_id, populate_existing=True)
+    return score.achievement_total, score.recommendation_total, score.caret_total
+
+
+def test_missing_row_is_created_with_real_totals(db):
+    expected = _stored(db, 1)
+    assert any(expected)
+    db.query(UserScore).filter(UserScore.user_id == 1).delete()
+    db.expunge_all()
+
+    ensure_user_score(db, 1)
+    assert _stored(db, 1) == expected
+
+
+def test_incremental_change_is_not_added_to_a_new_row(db):
+    post = db.query(Post).filter(Post.user_id != 2).first()
+    _, _, carets = _stored(db, post.user_id)
+    db.query(UserScore).filter(UserScore.user_id == post.user_id).delete()
+    db.expunge_all()
+
+    has_caret, _ = toggle_caret(db, db.get(Post, post.id), 2)
+    assert _stored(db, post.user_id)[2] == carets + (1 if has_caret else -1)
+
+
+def test_combined_board_skips_scores_without_a_user(db):
+    db.add(UserScore(user_id=9999, achievement_total=10**6, recommendation_total=10**6, caret_total=0))
+    db.flush()
+
+    top = top_combined(db, 5)
+    assert len(top) == 5
+    assert 9999 not in {row["user_id"] for row in top}
+
+
+def test_recommendation_delta_applies_to_the_current_value(db):
+    score = db.get(UserScore, 1)
+    recommendation = score.recommendation_total
+    # another transaction moves the total after this session loaded the row
+    db.execute(text("UPDATE user_scores SET recommendation_total = recommendation_total + 100 WHERE user_id = 1"))
+
+    _apply_recommendation_deltas(db, {1: 5})
+    assert _stored(db, 1)[1] == recommendation + 105
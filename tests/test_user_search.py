@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models import User
+from app.services import user_search
+from app.services.like_pattern import like_escape
+from app.services.user_search import (
+    SearchDocument,
+    TrigramIndex,
+    search_user_ids,
+    similarity,
+    trigrams,
+)
+
+
+def _index():
+    return TrigramIndex(
+        [
+            SearchDocument(1, "Satya Yannam", "satya", "ML engineer", "Boca Raton, FL"),
+            SearchDocument(2, "Sathish Kumar", "sathish", "Data analyst", "Miami, FL"),
+            SearchDocument(3, "Maria Lopez", "maria.l", None, "Boca Raton, FL"),
+            SearchDocument(4, "John Smith", "jsmith", "Backend dev", None),
+            SearchDocument(5, "Satyam Rao", "satyam", None, None),
+        ]
+    )
+
+
+def test_trigrams_match_pg_trgm():
+    # SELECT show_trgm('Cat!') -> {"  c"," ca","at ",cat}
+    assert trigrams("Cat!") == {"  c", " ca", "cat", "at "}
+    assert similarity("word", "word") == 1.0
+    assert similarity("word", "") == 0.0
+
+
+def test_prefix_query_matches_usernames_shortest_first():
+    assert _index().search("^sat", 10) == [1, 5, 2]
+    assert _index().search("^SATY", 10) == [1, 5]
+
+
+def test_substring_matches_any_field():
+    assert set(_index().search("boca", 10)) == {1, 3}
+    assert _index().search("backend", 10) == [4]
+
+
+def test_fuzzy_match_ranks_closest_first():
+    results = _index().search("satya yanam", 10)
+    assert results[0] == 1
+
+
+@pytest.mark.parametrize("q", ["", "   ", "^"])
+def test_blank_query_returns_nothing(q):
+    assert _index().search(q, 10) == []
+
+
+def test_limit():
+    assert len(_index().search("fl", 1)) == 1
+
+
+def test_like_escape_matches_wildcards_literally():
+    assert like_escape("50%_off/now") == "50/%/_off//now"
+
+
+def test_in_memory_index_is_reused_until_it_expires():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(full_name="Satya Yannam", email="satya@example.com", username="satya", status="APPROVED"))
+    db.commit()
+    assert search_user_ids(db, "satya") == [1]
+
+    db.add(User(full_name="Satyam Rao", email="satyam@example.com", username="satyam", status="APPROVED"))
+    db.commit()
+    assert search_user_ids(db, "^satyam") == []
+
+    user_search._indexes.clear()
+    assert search_user_ids(db, "^satyam") == [2]
+    db.close()